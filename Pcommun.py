@@ -3,9 +3,18 @@ import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 from datetime import datetime, timedelta
+import io
 import warnings
 warnings.filterwarnings('ignore')
 
+from pcf_bootstrap import PCFInsightBootstrap
+from pcf_cube import PCFAggregateCube, fingerprint
+from pcf_downsample import downsample_xy
+from pcf_elections import PCFElectionCalendar
+from pcf_figcache import PCFFigureCache
+from pcf_noise import PCFCorrelatedNoise, correlation_matrix
+from pcf_store import PCFYearStore
+
 class PCFFinanceAnalyzer:
     def __init__(self):
         self.parti = "Parti Communiste Français (PCF)"
@@ -18,6 +27,23 @@ class PCFFinanceAnalyzer:
         self.front_populaire_year = 1936
         self.liberation_year = 1945
         self.decline_start_year = 1978
+        self.years = np.arange(self.start_year, self.end_year + 1)
+        
+        # Régimes historiques (année de début: période politique)
+        self.regimes = {
+            1920: "Création et montée en puissance",
+            1936: "Front populaire",
+            1939: "Guerre et clandestinité",
+            1944: "Libération - apogée",
+            1947: "Guerre froide",
+            1956: "Début du déclin",
+            1968: "Union de la gauche",
+            1978: "Déclin accéléré",
+            1990: "Chute du mur de Berlin",
+            2002: "Stabilisation relative",
+            2012: "Nouvelles alliances",
+            2022: "Période récente",
+        }
         
         # Configuration spécifique au PCF
         self.config = {
@@ -30,891 +56,784 @@ class PCFFinanceAnalyzer:
             "sources_financement": ["cotisations", "financement_public", "presse", "municipalites", "syndicats"]
         }
         
-    def generate_financial_data(self):
+        # Calendrier électoral (municipales, législatives, présidentielles, européennes)
+        self.elections = PCFElectionCalendar.default()
+        
+        # Événements marquants appliqués aux séries simulées (période, facteurs ;
+        # "scrutins" restreint optionnellement la période aux années de ces scrutins)
+        self.events = {
+            "Création du PCF": {"annees": (1920, 1920),
+                                "facteurs": {'Adherents': 1.5, 'Sections_Locales': 2.0}},
+            "Front populaire": {"annees": (1936, 1936),
+                                "facteurs": {'Adherents': 1.8, 'Elus_Nationaux': 2.5, 'Revenus_Total': 1.6}},
+            "Libération": {"annees": (1945, 1945),
+                           "facteurs": {'Adherents': 2.2, 'Elus_Nationaux': 3.0, 'Mairies': 1.8,
+                                        'Revenus_Total': 1.9}},
+            "Guerre froide": {"annees": (1947, 1956),
+                              "facteurs": {'Depenses_International': 1.4, 'Investissement_Presse': 1.3}},
+            "Mai 68": {"annees": (1968, 1968),
+                       "facteurs": {'Adherents': 1.15, 'Investissement_Jeunesse': 1.4}},
+            "Programme commun": {"annees": (1972, 1977),
+                                 "facteurs": {'Revenus_Total': 1.2, 'Depenses_Campagnes': 1.5}},
+            "Défaite 1978": {"annees": (1978, 1978),
+                             "facteurs": {'Adherents': 0.85, 'Revenus_Total': 0.90}},
+            "Chute du mur de Berlin": {"annees": (1989, 1991),
+                                       "facteurs": {'Adherents': 0.70, 'Revenus_Total': 0.80,
+                                                    'Depenses_International': 0.60}},
+            "Gauche plurielle": {"annees": (1997, 2002),
+                                 "facteurs": {'Financement_Public': 1.4, 'Revenus_Total': 1.15}},
+            "Crise de L'Humanité": {"annees": (2000, 2010),
+                                    "facteurs": {'Revenus_Presse': 0.70, 'Investissement_Presse': 0.80}},
+            "NUPES": {"annees": (2022, 2022),
+                      "facteurs": {'Elus_Nationaux': 2.0, 'Depenses_Campagnes': 1.3, 'Revenus_Total': 1.1}},
+        }
+        
+        # Taux de croissance par régime (clé: année de début du régime)
+        self.regime_rates = {
+            'Adherents': {1920: 0.20, 1936: 0.35, 1939: -0.60, 1944: 0.50, 1947: 0.10, 1956: -0.05,
+                          1968: 0.08, 1978: -0.12, 1990: -0.15, 2002: -0.03, 2012: -0.08, 2022: -0.05},
+            'Revenus_Total': {1920: 0.15, 1936: 0.25, 1939: -0.40, 1944: 0.30, 1947: 0.08, 1956: -0.03,
+                              1968: -0.03, 1978: -0.10, 1990: -0.12, 2002: -0.04, 2012: -0.02, 2022: -0.01},
+        }
+        
+        # Écart-type du bruit multiplicatif de chaque série simulée
+        self.noise_sigmas = {
+            'Adherents': 0.12, 'Elus_Locaux': 0.10, 'Elus_Nationaux': 0.15,
+            'Revenus_Total': 0.10, 'Cotisations_Adherents': 0.08, 'Financement_Public': 0.09,
+            'Revenus_Presse': 0.15, 'Revenus_Municipaux': 0.12, 'Dons_Sympathisants': 0.14,
+            'Revenus_Formations': 0.10,
+            'Depenses_Total': 0.08, 'Depenses_Personnel': 0.06, 'Depenses_Campagnes': 0.20,
+            'Depenses_Communication': 0.12, 'Depenses_Fonctionnement': 0.05, 'Depenses_Presse': 0.13,
+            'Depenses_Formation': 0.09, 'Depenses_International': 0.16,
+            'Taux_Execution_Budget': 0.05, 'Ratio_Cotisations_Revenus': 0.06,
+            'Dependance_Financement_Public': 0.07, 'Solde_Financier': 0.12, 'Fonds_Propres': 0.10,
+            'Investissement_Communication': 0.14, 'Investissement_Formation': 0.11,
+            'Investissement_Municipal': 0.13, 'Investissement_Jeunesse': 0.15, 'Investissement_Presse': 0.16,
+        }
+        
+        # Corrélations du bruit entre séries (paires absentes : bruits indépendants)
+        self.noise_correlations = {
+            ('Adherents', 'Cotisations_Adherents'): 0.7,
+            ('Adherents', 'Revenus_Total'): 0.5,
+            ('Cotisations_Adherents', 'Revenus_Total'): 0.6,
+        }
+        self._noise_model = None
+        self._noise_block = None  # Bruit de toutes les séries tiré en une fois (voir _run_simulators)
+        self._batch_shape = ()  # Runs simulés simultanément (voir generate_batch)
+        self.store = None  # Dernier jeu de données généré (PCFYearStore)
+        
+        # Simulateurs par colonne, dans l'ordre de génération
+        self.simulators = {
+            # Données d'adhérents et structure
+            'Adherents': self._simulate_adherents,
+            'Sections_Locales': self._simulate_sections_locales,
+            'Elus_Locaux': self._simulate_elus_locaux,
+            'Elus_Nationaux': self._simulate_elus_nationaux,
+            'Mairies': self._simulate_mairies,
+            # Revenus du parti
+            'Revenus_Total': self._simulate_total_revenue,
+            'Cotisations_Adherents': self._simulate_membership_fees,
+            'Financement_Public': self._simulate_public_funding,
+            'Revenus_Presse': self._simulate_press_revenue,  # L'Humanité
+            'Revenus_Municipaux': self._simulate_municipal_revenue,
+            'Dons_Sympathisants': self._simulate_sympathizer_donations,
+            'Revenus_Formations': self._simulate_training_revenue,
+            # Dépenses du parti
+            'Depenses_Total': self._simulate_total_expenses,
+            'Depenses_Personnel': self._simulate_staff_expenses,
+            'Depenses_Campagnes': self._simulate_campaign_expenses,
+            'Depenses_Communication': self._simulate_communication_expenses,
+            'Depenses_Fonctionnement': self._simulate_operating_expenses,
+            'Depenses_Presse': self._simulate_press_expenses,  # Soutien à L'Humanité
+            'Depenses_Formation': self._simulate_training_expenses,
+            'Depenses_International': self._simulate_international_expenses,
+            # Indicateurs financiers
+            'Taux_Execution_Budget': self._simulate_budget_execution_rate,
+            'Ratio_Cotisations_Revenus': self._simulate_membership_ratio,
+            'Dependance_Financement_Public': self._simulate_public_funding_dependency,
+            'Solde_Financier': self._simulate_financial_balance,
+            'Fonds_Propres': self._simulate_own_funds,
+            # Investissements stratégiques
+            'Investissement_Communication': self._simulate_communication_investment,
+            'Investissement_Formation': self._simulate_training_investment,
+            'Investissement_Municipal': self._simulate_municipal_investment,
+            'Investissement_Jeunesse': self._simulate_youth_investment,
+            'Investissement_Presse': self._simulate_press_investment,
+        }
+        
+        # Colonnes dont le simulateur lit chaque paramètre de configuration (resimulation ciblée)
+        self.config_dependencies = {
+            "adherents_base": ['Adherents'],
+            "budget_base": ['Revenus_Total', 'Cotisations_Adherents', 'Financement_Public', 'Revenus_Presse',
+                            'Revenus_Municipaux', 'Dons_Sympathisants', 'Revenus_Formations',
+                            'Depenses_Total', 'Depenses_Personnel', 'Depenses_Campagnes',
+                            'Depenses_Communication', 'Depenses_Fonctionnement', 'Depenses_Presse',
+                            'Depenses_Formation', 'Depenses_International', 'Fonds_Propres',
+                            'Investissement_Communication', 'Investissement_Formation',
+                            'Investissement_Municipal', 'Investissement_Jeunesse', 'Investissement_Presse'],
+        }
+        
+        # Panneaux de l'analyse financière, dans l'ordre de la figure (4 x 2)
+        self.panels = {
+            "revenus_depenses": self._plot_revenue_expenses,          # 1. Évolution des revenus et dépenses
+            "structure_revenus": self._plot_revenue_structure,        # 2. Structure des revenus
+            "structure_depenses": self._plot_expenses_structure,      # 3. Structure des dépenses
+            "adherents": self._plot_membership_structure,             # 4. Adhérents et structure
+            "investissements": self._plot_strategic_investments,      # 5. Investissements stratégiques
+            "indicateurs": self._plot_financial_indicators,           # 6. Indicateurs financiers
+            "elus": self._plot_elected_officials,                     # 7. Évolution des élus
+            "situation_financiere": self._plot_financial_situation,   # 8. Situation financière
+        }
+        
+        # Sous-échantillonnage des courbes (None = 2 points par colonne de pixels)
+        self.max_plot_points = None
+        self.downsample_method = "minmax"
+        self._save_dpi = None  # Résolution d'enregistrement de la figure en cours (voir _plot_line)
+        
+        # Colonnes lues par chaque panneau (clés de cache et d'invalidation)
+        self.panel_columns = {
+            "revenus_depenses": ['Revenus_Total', 'Depenses_Total'],
+            "structure_revenus": ['Cotisations_Adherents', 'Financement_Public', 'Revenus_Presse',
+                                  'Revenus_Municipaux', 'Dons_Sympathisants', 'Revenus_Formations'],
+            "structure_depenses": ['Depenses_Personnel', 'Depenses_Campagnes', 'Depenses_Communication',
+                                   'Depenses_Fonctionnement', 'Depenses_Presse', 'Depenses_Formation',
+                                   'Depenses_International'],
+            "adherents": ['Adherents', 'Sections_Locales'],
+            "investissements": ['Investissement_Communication', 'Investissement_Formation',
+                                'Investissement_Municipal', 'Investissement_Presse'],
+            "indicateurs": ['Taux_Execution_Budget', 'Dependance_Financement_Public'],
+            "elus": ['Elus_Locaux', 'Elus_Nationaux'],
+            "situation_financiere": ['Solde_Financier', 'Fonds_Propres'],
+        }
+        
+    def generate_financial_data(self, verbose=True):
         """Génère des données financières pour le PCF"""
-        print(f"☭ Génération des données financières pour {self.parti}...")
+        if verbose:
+            print(f"☭ Génération des données financières pour {self.parti}...")
         
         # Créer une base de données annuelle
         dates = pd.date_range(start=f'{self.start_year}-01-01', 
                              end=f'{self.end_year}-12-31', freq='Y')
         
-        data = {'Annee': [date.year for date in dates]}
-        
-        # Données d'adhérents et structure
-        data['Adherents'] = self._simulate_adherents(dates)
-        data['Sections_Locales'] = self._simulate_sections_locales(dates)
-        data['Elus_Locaux'] = self._simulate_elus_locaux(dates)
-        data['Elus_Nationaux'] = self._simulate_elus_nationaux(dates)
-        data['Mairies'] = self._simulate_mairies(dates)
-        
-        # Revenus du parti
-        data['Revenus_Total'] = self._simulate_total_revenue(dates)
-        data['Cotisations_Adherents'] = self._simulate_membership_fees(dates)
-        data['Financement_Public'] = self._simulate_public_funding(dates)
-        data['Revenus_Presse'] = self._simulate_press_revenue(dates)  # L'Humanité
-        data['Revenus_Municipaux'] = self._simulate_municipal_revenue(dates)
-        data['Dons_Sympathisants'] = self._simulate_sympathizer_donations(dates)
-        data['Revenus_Formations'] = self._simulate_training_revenue(dates)
-        
-        # Dépenses du parti
-        data['Depenses_Total'] = self._simulate_total_expenses(dates)
-        data['Depenses_Personnel'] = self._simulate_staff_expenses(dates)
-        data['Depenses_Campagnes'] = self._simulate_campaign_expenses(dates)
-        data['Depenses_Communication'] = self._simulate_communication_expenses(dates)
-        data['Depenses_Fonctionnement'] = self._simulate_operating_expenses(dates)
-        data['Depenses_Presse'] = self._simulate_press_expenses(dates)  # Soutien à L'Humanité
-        data['Depenses_Formation'] = self._simulate_training_expenses(dates)
-        data['Depenses_International'] = self._simulate_international_expenses(dates)
-        
-        # Indicateurs financiers
-        data['Taux_Execution_Budget'] = self._simulate_budget_execution_rate(dates)
-        data['Ratio_Cotisations_Revenus'] = self._simulate_membership_ratio(dates)
-        data['Dependance_Financement_Public'] = self._simulate_public_funding_dependency(dates)
-        data['Solde_Financier'] = self._simulate_financial_balance(dates)
-        data['Fonds_Propres'] = self._simulate_own_funds(dates)
-        
-        # Investissements stratégiques
-        data['Investissement_Communication'] = self._simulate_communication_investment(dates)
-        data['Investissement_Formation'] = self._simulate_training_investment(dates)
-        data['Investissement_Municipal'] = self._simulate_municipal_investment(dates)
-        data['Investissement_Jeunesse'] = self._simulate_youth_investment(dates)
-        data['Investissement_Presse'] = self._simulate_press_investment(dates)
-        
-        df = pd.DataFrame(data)
+        simulated = self._run_simulators(dates)
+        values = np.column_stack([np.asarray(series, dtype=np.float64) for series in simulated.values()])
         
         # Ajouter des tendances spécifiques au PCF
-        self._add_party_trends(df)
+        self._apply_events(values)
+        
+        # Les données générées restent dans le stockage ; le DataFrame en est l'export
+        self.store = PCFYearStore(np.asarray(dates.year), values, list(simulated))
+        return self.store.to_frame()
+    
+    def generate_batch(self, n_runs=None):
+        """Génère des simulations vectorisées (runs, années, séries) en un seul appel
+        
+        Les paramètres (config, regime_rates, noise_sigmas) peuvent être des tableaux
+        (candidats, 1) : chaque candidat est alors simulé dans la même passe.
+        """
+        dates = pd.date_range(start=f'{self.start_year}-01-01', 
+                             end=f'{self.end_year}-12-31', freq='Y')
+        
+        simulated = self._run_simulators(dates, () if n_runs is None else (n_runs,))
+        series = [np.asarray(values, dtype=np.float64) for values in simulated.values()]
+        
+        values = np.stack(np.broadcast_arrays(*series), axis=-1)
+        self._apply_events(values)
+        return values
+    
+    def _run_simulators(self, dates, batch_shape=()):
+        """Exécute tous les simulateurs, le bruit de toutes les séries étant tiré en une fois"""
+        self._batch_shape = batch_shape
+        try:
+            noise_model = self.noise_model()
+            if noise_model is not None:
+                self._noise_block = noise_model.draw_columns(batch_shape + (len(dates),))
+            return {column: simulate(dates) for column, simulate in self.simulators.items()}
+        finally:
+            self._batch_shape = ()
+            self._noise_block = None
+    
+    def noise_model(self):
+        """Modèle de bruit corrélé, refactorisé seulement si sigmas ou corrélations changent"""
+        columns = [column for column in self.simulators if column in self.noise_sigmas]
+        sigmas = tuple(self.noise_sigmas[column] for column in columns)
+        if any(np.ndim(sigma) for sigma in sigmas):
+            return None  # Sigmas candidats (calibration) : tirages par série
+        
+        correlation = correlation_matrix(columns, self.noise_correlations)
+        key = (tuple(columns), sigmas, correlation.tobytes())
+        if self._noise_model is None or self._noise_model[0] != key:
+            self._noise_model = (key, PCFCorrelatedNoise(columns, self.noise_sigmas, correlation))
+        return self._noise_model[1]
+    
+    def _apply_events(self, values):
+        """Applique les événements marquants à un tableau (..., années, séries)"""
+        columns = self.series_columns
+        for event in self.events.values():
+            mask = self.event_mask(event, self.years)
+            for column, factor in event["facteurs"].items():
+                values[..., mask, columns.index(column)] *= factor
+    
+    def event_mask(self, event, years):
+        """Années touchées par un événement (période, éventuellement restreinte à des scrutins)"""
+        start, end = event["annees"]
+        mask = (years >= start) & (years <= end)
+        if "scrutins" in event:
+            kinds = [event["scrutins"]] if isinstance(event["scrutins"], str) else event["scrutins"]
+            masks = self.elections.masks(years)
+            mask &= np.logical_or.reduce([masks[kind] for kind in kinds])
+        return mask
+    
+    def iter_ensemble(self, n_runs, chunk_size=100, seed=None):
+        """Génère un ensemble de simulations par blocs (runs, années, séries)"""
+        if seed is not None:
+            np.random.seed(seed)
         
-        return df
+        for start in range(0, n_runs, chunk_size):
+            yield self.generate_batch(min(chunk_size, n_runs - start))
+    
+    def generate_ensemble(self, n_runs, seed=None):
+        """Génère un ensemble complet de simulations (runs, années, séries)"""
+        return np.concatenate(list(self.iter_ensemble(n_runs, seed=seed)))
+    
+    @property
+    def series_columns(self):
+        """Colonnes simulées, dans l'ordre des tableaux d'ensemble"""
+        return list(self.simulators)
+    
+    def _regime_rate(self, column, year):
+        """Taux du régime en cours (régime commencé strictement avant l'année)"""
+        rates = self.regime_rates[column]
+        starts = sorted(rates)
+        regime = np.maximum(np.searchsorted(starts, year, side='left') - 1, 0)
+        return np.select([regime == k for k in range(len(starts))], [rates[start] for start in starts])
+    
+    def _years(self, dates):
+        """Années et rangs d'une plage de dates"""
+        year = np.asarray(dates.year)
+        return year, np.arange(len(year))
+    
+    def _noise(self, column, n):
+        """Bruit multiplicatif d'une série (un tirage par run et par année)"""
+        if self._noise_block is not None and column in self._noise_block:
+            return self._noise_block[column]
+        sigma = self.noise_sigmas[column]
+        shape = np.broadcast_shapes(self._batch_shape + (n,), np.shape(sigma))
+        return np.random.normal(1, sigma, size=shape)
     
     def _simulate_adherents(self, dates):
         """Simule le nombre d'adhérents"""
         base_adherents = self.config["adherents_base"]
+        year, i = self._years(dates)
         
-        adherents = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            # Évolution historique des adhérents selon les périodes politiques
-            if 1920 <= year <= 1936:  # Création et montée en puissance
-                growth_rate = 0.20
-            elif 1936 <= year <= 1939:  # Front populaire
-                growth_rate = 0.35
-            elif 1939 <= year <= 1944:  # Guerre et clandestinité
-                growth_rate = -0.60
-            elif 1944 <= year <= 1947:  # Libération - apogée
-                growth_rate = 0.50
-            elif 1947 <= year <= 1956:  # Guerre froide
-                growth_rate = 0.10
-            elif 1956 <= year <= 1968:  # Début du déclin
-                growth_rate = -0.05
-            elif 1968 <= year <= 1978:  # Union de la gauche
-                growth_rate = 0.08
-            elif 1978 <= year <= 1990:  # Déclin accéléré
-                growth_rate = -0.12
-            elif 1990 <= year <= 2002:  # Chute du mur de Berlin
-                growth_rate = -0.15
-            elif 2002 <= year <= 2012:  # Stabilisation relative
-                growth_rate = -0.03
-            elif 2012 <= year <= 2022:  # Nouvelles alliances
-                growth_rate = -0.08
-            else:  # Période récente
-                growth_rate = -0.05
-                
-            # Ajustement pour la longue période historique
-            time_factor = min(1.0, (2025 - year) / 100)  # Réduit l'impact sur longue période
-            growth = 1 + growth_rate * time_factor * (i/10)
-            noise = np.random.normal(1, 0.12)
-            adherents.append(base_adherents * growth * noise)
+        # Évolution historique des adhérents selon les périodes politiques
+        growth_rate = self._regime_rate('Adherents', year)
         
-        return adherents
+        # Ajustement pour la longue période historique
+        time_factor = np.minimum(1.0, (2025 - year) / 100)  # Réduit l'impact sur longue période
+        growth = 1 + growth_rate * time_factor * (i/10)
+        noise = self._noise('Adherents', len(year))
+        return base_adherents * growth * noise
     
     def _simulate_sections_locales(self, dates):
         """Simule le nombre de sections locales"""
         base_sections = 5000  # Apogée dans les années 1950
+        year, i = self._years(dates)
         
-        sections = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            if year <= 1936:
-                growth_rate = 0.15
-            elif year <= 1947:
-                growth_rate = 0.25
-            elif year <= 1968:
-                growth_rate = 0.02
-            elif year <= 1978:
-                growth_rate = 0.05
-            elif year <= 1990:
-                growth_rate = -0.10
-            elif year <= 2000:
-                growth_rate = -0.15
-            elif year <= 2010:
-                growth_rate = -0.08
-            else:
-                growth_rate = -0.05
-                
-            time_factor = min(1.0, (2025 - year) / 100)
-            growth = 1 + growth_rate * time_factor * (i/8)
-            sections.append(base_sections * growth)
+        growth_rate = np.select(
+            [year <= 1936, year <= 1947, year <= 1968, year <= 1978,
+             year <= 1990, year <= 2000, year <= 2010],
+            [0.15, 0.25, 0.02, 0.05, -0.10, -0.15, -0.08],
+            default=-0.05)
         
-        return sections
+        time_factor = np.minimum(1.0, (2025 - year) / 100)
+        growth = 1 + growth_rate * time_factor * (i/8)
+        return base_sections * growth
     
     def _simulate_elus_locaux(self, dates):
         """Simule le nombre d'élus locaux"""
         base_elus = 20000  # Apogée années 1970-1980
-        
-        elus = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            # Élections municipales
-            if year in [1935, 1945, 1953, 1959, 1965, 1971, 1977, 1983, 1989, 1995, 2001, 2008, 2014, 2020]:
-                if year <= 1945:  # Libération
-                    multiplier = 2.0
-                elif year <= 1977:  # Apogée municipale
-                    multiplier = 1.8
-                elif year <= 1995:  # Déclin
-                    multiplier = 0.8
-                elif year <= 2014:  # Maintien
-                    multiplier = 0.6
-                else:  # Période récente
-                    multiplier = 0.5
-            else:
-                multiplier = 1.0
-                
-            if year <= 1978:
-                growth_rate = 0.08
-            elif year <= 1990:
-                growth_rate = -0.10
-            elif year <= 2000:
-                growth_rate = -0.12
-            elif year <= 2010:
-                growth_rate = -0.05
-            else:
-                growth_rate = -0.03
-                
-            time_factor = min(1.0, (2025 - year) / 100)
-            growth = 1 + growth_rate * time_factor * (i/6)
-            noise = np.random.normal(1, 0.10)
-            elus.append(base_elus * growth * multiplier * noise)
-        
-        return elus
+        year, i = self._years(dates)
+        
+        # Élections municipales
+        municipal = self.elections.masks(year)["municipales"]
+        multiplier = np.where(municipal, np.select(
+            [year <= 1945,   # Libération
+             year <= 1977,   # Apogée municipale
+             year <= 1995,   # Déclin
+             year <= 2014],  # Maintien
+            [2.0, 1.8, 0.8, 0.6],
+            default=0.5),    # Période récente
+            1.0)
+        
+        growth_rate = np.select(
+            [year <= 1978, year <= 1990, year <= 2000, year <= 2010],
+            [0.08, -0.10, -0.12, -0.05],
+            default=-0.03)
+        
+        time_factor = np.minimum(1.0, (2025 - year) / 100)
+        growth = 1 + growth_rate * time_factor * (i/6)
+        noise = self._noise('Elus_Locaux', len(year))
+        return base_elus * growth * multiplier * noise
     
     def _simulate_elus_nationaux(self, dates):
         """Simule le nombre d'élus nationaux"""
         base_elus = 150  # Apogée années 1940-1950
-        
-        elus = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            # Élections législatives
-            if year in [1924, 1928, 1932, 1936, 1945, 1946, 1951, 1956, 1958, 1962, 1967, 1968, 1973, 1978, 1981, 1986, 1988, 1993, 1997, 2002, 2007, 2012, 2017, 2022]:
-                if year == 1936:  # Front populaire
-                    multiplier = 2.5
-                elif 1945 <= year <= 1956:  # Apogée
-                    multiplier = 3.0
-                elif 1978 <= year <= 1988:  # Déclin
-                    multiplier = 0.6
-                elif year == 1997:  # Gauche plurielle
-                    multiplier = 1.2
-                elif year == 2022:  # NUPES
-                    multiplier = 1.5
-                else:
-                    multiplier = 1.0
-            else:
-                multiplier = 1.0
-                
-            if year <= 1956:
-                growth_rate = 0.10
-            elif year <= 1978:
-                growth_rate = -0.05
-            elif year <= 2000:
-                growth_rate = -0.15
-            else:
-                growth_rate = -0.08
-                
-            time_factor = min(1.0, (2025 - year) / 100)
-            growth = 1 + growth_rate * time_factor * (i/4)
-            noise = np.random.normal(1, 0.15)
-            elus.append(base_elus * growth * multiplier * noise)
-        
-        return elus
+        year, i = self._years(dates)
+        
+        # Élections législatives
+        legislative = self.elections.masks(year)["legislatives"]
+        multiplier = np.where(legislative, np.select(
+            [year == 1936,                      # Front populaire
+             (1945 <= year) & (year <= 1956),   # Apogée
+             (1978 <= year) & (year <= 1988),   # Déclin
+             year == 1997,                      # Gauche plurielle
+             year == 2022],                     # NUPES
+            [2.5, 3.0, 0.6, 1.2, 1.5],
+            default=1.0),
+            1.0)
+        
+        growth_rate = np.select(
+            [year <= 1956, year <= 1978, year <= 2000],
+            [0.10, -0.05, -0.15],
+            default=-0.08)
+        
+        time_factor = np.minimum(1.0, (2025 - year) / 100)
+        growth = 1 + growth_rate * time_factor * (i/4)
+        noise = self._noise('Elus_Nationaux', len(year))
+        return base_elus * growth * multiplier * noise
     
     def _simulate_mairies(self, dates):
         """Simule le nombre de mairies contrôlées"""
         base_mairies = 300  # Apogée années 1970-1980
+        year, i = self._years(dates)
         
-        mairies = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            if year <= 1945:
-                growth_rate = 0.20
-            elif year <= 1977:
-                growth_rate = 0.15
-            elif year <= 1995:
-                growth_rate = -0.10
-            elif year <= 2010:
-                growth_rate = -0.08
-            else:
-                growth_rate = -0.04
-                
-            time_factor = min(1.0, (2025 - year) / 100)
-            growth = 1 + growth_rate * time_factor * (i/5)
-            mairies.append(base_mairies * growth)
+        growth_rate = np.select(
+            [year <= 1945, year <= 1977, year <= 1995, year <= 2010],
+            [0.20, 0.15, -0.10, -0.08],
+            default=-0.04)
         
-        return mairies
+        time_factor = np.minimum(1.0, (2025 - year) / 100)
+        growth = 1 + growth_rate * time_factor * (i/5)
+        return base_mairies * growth
     
     def _simulate_total_revenue(self, dates):
         """Simule les revenus totaux"""
         base_revenue = self.config["budget_base"]
+        year, i = self._years(dates)
         
-        revenue = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            # Évolution historique des revenus
-            if 1920 <= year <= 1936:  # Croissance
-                growth_rate = 0.15
-            elif 1936 <= year <= 1939:  # Front populaire
-                growth_rate = 0.25
-            elif 1939 <= year <= 1944:  # Guerre
-                growth_rate = -0.40
-            elif 1944 <= year <= 1947:  # Libération
-                growth_rate = 0.30
-            elif 1947 <= year <= 1956:  # Guerre froide
-                growth_rate = 0.08
-            elif 1956 <= year <= 1978:  # Déclin progressif
-                growth_rate = -0.03
-            elif 1978 <= year <= 1990:  # Déclin accéléré
-                growth_rate = -0.10
-            elif 1990 <= year <= 2002:  # Chute du mur
-                growth_rate = -0.12
-            elif 2002 <= year <= 2012:  # Stabilisation
-                growth_rate = -0.04
-            elif 2012 <= year <= 2022:  # Nouvelles alliances
-                growth_rate = -0.02
-            else:  # Période récente
-                growth_rate = -0.01
-                
-            time_factor = min(1.0, (2025 - year) / 100)
-            growth = 1 + growth_rate * time_factor * (i/5)
-            noise = np.random.normal(1, 0.10)
-            revenue.append(base_revenue * growth * noise)
+        # Évolution historique des revenus
+        growth_rate = self._regime_rate('Revenus_Total', year)
         
-        return revenue
+        time_factor = np.minimum(1.0, (2025 - year) / 100)
+        growth = 1 + growth_rate * time_factor * (i/5)
+        noise = self._noise('Revenus_Total', len(year))
+        return base_revenue * growth * noise
     
     def _simulate_membership_fees(self, dates):
         """Simule les cotisations des adhérents"""
         base_fees = self.config["budget_base"] * 0.40  # Très dépendant des cotisations
+        year, i = self._years(dates)
         
-        fees = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            if year <= 1936:
-                growth_rate = 0.18
-            elif year <= 1947:
-                growth_rate = 0.25
-            elif year <= 1978:
-                growth_rate = -0.02
-            elif year <= 1990:
-                growth_rate = -0.12
-            elif year <= 2000:
-                growth_rate = -0.15
-            else:
-                growth_rate = -0.08
-                
-            time_factor = min(1.0, (2025 - year) / 100)
-            growth = 1 + growth_rate * time_factor * (i/6)
-            noise = np.random.normal(1, 0.08)
-            fees.append(base_fees * growth * noise)
+        growth_rate = np.select(
+            [year <= 1936, year <= 1947, year <= 1978, year <= 1990, year <= 2000],
+            [0.18, 0.25, -0.02, -0.12, -0.15],
+            default=-0.08)
         
-        return fees
+        time_factor = np.minimum(1.0, (2025 - year) / 100)
+        growth = 1 + growth_rate * time_factor * (i/6)
+        noise = self._noise('Cotisations_Adherents', len(year))
+        return base_fees * growth * noise
     
     def _simulate_public_funding(self, dates):
         """Simule le financement public"""
         base_funding = self.config["budget_base"] * 0.30
-        
-        funding = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            # Dépend des résultats électoraux
-            if 1945 <= year <= 1958:  # Forte représentation
-                multiplier = 1.6
-            elif 1978 <= year <= 1988:  # Déclin parlementaire
-                multiplier = 0.7
-            elif 1997 <= year <= 2002:  # Participation gouvernementale
-                multiplier = 1.3
-            elif year >= 2017:  # Faible représentation
-                multiplier = 0.5
-            else:
-                multiplier = 1.0
-                
-            time_factor = min(1.0, (2025 - year) / 100)
-            growth = 1 + 0.01 * time_factor * (i/4)
-            noise = np.random.normal(1, 0.09)
-            funding.append(base_funding * growth * multiplier * noise)
-        
-        return funding
+        year, i = self._years(dates)
+        
+        # Dépend des résultats électoraux
+        multiplier = np.select(
+            [(1945 <= year) & (year <= 1958),   # Forte représentation
+             (1978 <= year) & (year <= 1988),   # Déclin parlementaire
+             (1997 <= year) & (year <= 2002),   # Participation gouvernementale
+             year >= 2017],                     # Faible représentation
+            [1.6, 0.7, 1.3, 0.5],
+            default=1.0)
+        
+        time_factor = np.minimum(1.0, (2025 - year) / 100)
+        growth = 1 + 0.01 * time_factor * (i/4)
+        noise = self._noise('Financement_Public', len(year))
+        return base_funding * growth * multiplier * noise
     
     def _simulate_press_revenue(self, dates):
         """Simule les revenus de la presse (L'Humanité)"""
         base_revenue = self.config["budget_base"] * 0.15  # Important historique
-        
-        revenue = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            if year <= 1939:  # Apogée de L'Humanité
-                growth = 1 + 0.10 * max(0, (year - 1920)/20)
-            elif year <= 1944:  # Clandestinité
-                growth = 0.3
-            elif year <= 1970:  # Déclin progressif
-                growth = 1 - 0.05 * max(0, (year - 1945)/25)
-            else:  # Difficultés
-                growth = 1 - 0.08 * max(0, (year - 1970)/50)
-                
-            noise = np.random.normal(1, 0.15)
-            revenue.append(base_revenue * growth * noise)
-        
-        return revenue
+        year, i = self._years(dates)
+        
+        growth = np.select(
+            [year <= 1939,   # Apogée de L'Humanité
+             year <= 1944,   # Clandestinité
+             year <= 1970],  # Déclin progressif
+            [1 + 0.10 * np.maximum(0, (year - 1920)/20),
+             0.3,
+             1 - 0.05 * np.maximum(0, (year - 1945)/25)],
+            default=1 - 0.08 * np.maximum(0, (year - 1970)/50))  # Difficultés
+        
+        noise = self._noise('Revenus_Presse', len(year))
+        return base_revenue * growth * noise
     
     def _simulate_municipal_revenue(self, dates):
         """Simule les revenus des municipalités"""
         base_revenue = self.config["budget_base"] * 0.10
+        year, i = self._years(dates)
         
-        revenue = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            if year <= 1977:  # Apogée municipale
-                growth = 1 + 0.08 * max(0, (year - 1945)/32)
-            elif year <= 2000:  # Déclin
-                growth = 1 - 0.06 * max(0, (year - 1977)/23)
-            else:  # Maintien
-                growth = 1 - 0.02 * max(0, (year - 2000)/25)
-                
-            noise = np.random.normal(1, 0.12)
-            revenue.append(base_revenue * growth * noise)
+        growth = np.select(
+            [year <= 1977,   # Apogée municipale
+             year <= 2000],  # Déclin
+            [1 + 0.08 * np.maximum(0, (year - 1945)/32),
+             1 - 0.06 * np.maximum(0, (year - 1977)/23)],
+            default=1 - 0.02 * np.maximum(0, (year - 2000)/25))  # Maintien
         
-        return revenue
+        noise = self._noise('Revenus_Municipaux', len(year))
+        return base_revenue * growth * noise
     
     def _simulate_sympathizer_donations(self, dates):
         """Simule les dons des sympathisants"""
         base_donations = self.config["budget_base"] * 0.05
-        
-        donations = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            if year <= 1936:  # Montée en puissance
-                growth_rate = 0.15
-            elif year <= 1978:  # Période stable
-                growth_rate = 0.03
-            else:  # Déclin
-                growth_rate = -0.05
-                
-            time_factor = min(1.0, (2025 - year) / 100)
-            growth = 1 + growth_rate * time_factor * (i/5)
-            noise = np.random.normal(1, 0.14)
-            donations.append(base_donations * growth * noise)
-        
-        return donations
+        year, i = self._years(dates)
+        
+        growth_rate = np.select(
+            [year <= 1936,   # Montée en puissance
+             year <= 1978],  # Période stable
+            [0.15, 0.03],
+            default=-0.05)   # Déclin
+        
+        time_factor = np.minimum(1.0, (2025 - year) / 100)
+        growth = 1 + growth_rate * time_factor * (i/5)
+        noise = self._noise('Dons_Sympathisants', len(year))
+        return base_donations * growth * noise
     
     def _simulate_training_revenue(self, dates):
         """Simule les revenus des formations"""
         base_revenue = self.config["budget_base"] * 0.03
+        year, i = self._years(dates)
         
-        revenue = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            if year >= 1950:  # Développement des écoles du parti
-                growth = 1 + 0.04 * max(0, (year - 1950)/70)
-            else:
-                growth = 1
-                
-            noise = np.random.normal(1, 0.10)
-            revenue.append(base_revenue * growth * noise)
+        # Développement des écoles du parti
+        growth = np.where(year >= 1950, 1 + 0.04 * np.maximum(0, (year - 1950)/70), 1)
         
-        return revenue
+        noise = self._noise('Revenus_Formations', len(year))
+        return base_revenue * growth * noise
     
     def _simulate_total_expenses(self, dates):
         """Simule les dépenses totales"""
         base_expenses = self.config["budget_base"] * 0.90
+        year, i = self._years(dates)
         
-        expenses = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            if year in [1936, 1945, 1956, 1968, 1978, 1981, 1997, 2002, 2012, 2017, 2022]:  # Années électorales
-                multiplier = 1.3
-            else:
-                multiplier = 1.0
-                
-            time_factor = min(1.0, (2025 - year) / 100)
-            growth = 1 - 0.02 * time_factor * (i/4)  # Réduction progressive
-            noise = np.random.normal(1, 0.08)
-            expenses.append(base_expenses * growth * multiplier * noise)
+        # Années électorales
+        multiplier = np.where(self.elections.masks(year)["majeures"], 1.3, 1.0)
         
-        return expenses
+        time_factor = np.minimum(1.0, (2025 - year) / 100)
+        growth = 1 - 0.02 * time_factor * (i/4)  # Réduction progressive
+        noise = self._noise('Depenses_Total', len(year))
+        return base_expenses * growth * multiplier * noise
     
     def _simulate_staff_expenses(self, dates):
         """Simule les dépenses de personnel"""
         base_staff = self.config["budget_base"] * 0.35
-        
-        expenses = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            if year <= 1978:  # Structure importante
-                growth_rate = 0.05
-            elif year <= 1990:  # Rationalisation
-                growth_rate = -0.08
-            elif year <= 2000:  # Réduction
-                growth_rate = -0.12
-            else:  # Structure minimale
-                growth_rate = -0.04
-                
-            time_factor = min(1.0, (2025 - year) / 100)
-            growth = 1 + growth_rate * time_factor * (i/5)
-            noise = np.random.normal(1, 0.06)
-            expenses.append(base_staff * growth * noise)
-        
-        return expenses
+        year, i = self._years(dates)
+        
+        growth_rate = np.select(
+            [year <= 1978,   # Structure importante
+             year <= 1990,   # Rationalisation
+             year <= 2000],  # Réduction
+            [0.05, -0.08, -0.12],
+            default=-0.04)   # Structure minimale
+        
+        time_factor = np.minimum(1.0, (2025 - year) / 100)
+        growth = 1 + growth_rate * time_factor * (i/5)
+        noise = self._noise('Depenses_Personnel', len(year))
+        return base_staff * growth * noise
     
     def _simulate_campaign_expenses(self, dates):
         """Simule les dépenses de campagne"""
         base_campaign = self.config["budget_base"] * 0.20
-        
-        expenses = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            if year in [1936, 1945, 1956, 1968, 1978, 1981, 1997, 2002, 2012, 2017, 2022]:
-                if year == 1936:  # Front populaire
-                    multiplier = 2.5
-                elif year == 1945:  # Libération
-                    multiplier = 2.2
-                elif year == 1997:  # Gauche plurielle
-                    multiplier = 1.8
-                elif year == 2022:  # NUPES
-                    multiplier = 1.6
-                else:
-                    multiplier = 1.5
-            else:
-                multiplier = 0.6
-                
-            time_factor = min(1.0, (2025 - year) / 100)
-            growth = 1 - 0.01 * time_factor * (i/3)
-            noise = np.random.normal(1, 0.20)
-            expenses.append(base_campaign * growth * multiplier * noise)
-        
-        return expenses
+        year, i = self._years(dates)
+        
+        election = self.elections.masks(year)["majeures"]
+        multiplier = np.where(election, np.select(
+            [year == 1936,   # Front populaire
+             year == 1945,   # Libération
+             year == 1997,   # Gauche plurielle
+             year == 2022],  # NUPES
+            [2.5, 2.2, 1.8, 1.6],
+            default=1.5),
+            0.6)
+        
+        time_factor = np.minimum(1.0, (2025 - year) / 100)
+        growth = 1 - 0.01 * time_factor * (i/3)
+        noise = self._noise('Depenses_Campagnes', len(year))
+        return base_campaign * growth * multiplier * noise
     
     def _simulate_communication_expenses(self, dates):
         """Simule les dépenses de communication"""
         base_communication = self.config["budget_base"] * 0.10
+        year, i = self._years(dates)
         
-        expenses = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            if year >= 1980:  # Modernisation progressive
-                growth = 1 + 0.05 * max(0, (year - 1980)/40)
-            else:
-                growth = 1
-                
-            noise = np.random.normal(1, 0.12)
-            expenses.append(base_communication * growth * noise)
+        # Modernisation progressive
+        growth = np.where(year >= 1980, 1 + 0.05 * np.maximum(0, (year - 1980)/40), 1)
         
-        return expenses
+        noise = self._noise('Depenses_Communication', len(year))
+        return base_communication * growth * noise
     
     def _simulate_operating_expenses(self, dates):
         """Simule les dépenses de fonctionnement"""
         base_operating = self.config["budget_base"] * 0.15
+        year, i = self._years(dates)
         
-        expenses = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            time_factor = min(1.0, (2025 - year) / 100)
-            growth = 1 - 0.01 * time_factor * (i/4)
-            noise = np.random.normal(1, 0.05)
-            expenses.append(base_operating * growth * noise)
-        
-        return expenses
+        time_factor = np.minimum(1.0, (2025 - year) / 100)
+        growth = 1 - 0.01 * time_factor * (i/4)
+        noise = self._noise('Depenses_Fonctionnement', len(year))
+        return base_operating * growth * noise
     
     def _simulate_press_expenses(self, dates):
         """Simule les dépenses pour la presse"""
         base_press = self.config["budget_base"] * 0.08
+        year, i = self._years(dates)
         
-        expenses = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            if year <= 1970:  # Soutien important à L'Humanité
-                growth = 1 + 0.04 * max(0, (year - 1920)/50)
-            else:  # Réduction progressive
-                growth = 1 - 0.03 * max(0, (year - 1970)/50)
-                
-            noise = np.random.normal(1, 0.13)
-            expenses.append(base_press * growth * noise)
+        growth = np.where(year <= 1970,
+                          1 + 0.04 * np.maximum(0, (year - 1920)/50),   # Soutien important à L'Humanité
+                          1 - 0.03 * np.maximum(0, (year - 1970)/50))   # Réduction progressive
         
-        return expenses
+        noise = self._noise('Depenses_Presse', len(year))
+        return base_press * growth * noise
     
     def _simulate_training_expenses(self, dates):
         """Simule les dépenses de formation"""
         base_training = self.config["budget_base"] * 0.06
+        year, i = self._years(dates)
         
-        expenses = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            if year >= 1950:  # Écoles du parti
-                growth = 1 + 0.03 * max(0, (year - 1950)/70)
-            else:
-                growth = 1
-                
-            noise = np.random.normal(1, 0.09)
-            expenses.append(base_training * growth * noise)
+        # Écoles du parti
+        growth = np.where(year >= 1950, 1 + 0.03 * np.maximum(0, (year - 1950)/70), 1)
         
-        return expenses
+        noise = self._noise('Depenses_Formation', len(year))
+        return base_training * growth * noise
     
     def _simulate_international_expenses(self, dates):
         """Simule les dépenses internationales"""
         base_international = self.config["budget_base"] * 0.04
+        year, i = self._years(dates)
         
-        expenses = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            if year <= 1991:  # Forte dimension internationale (Komintern, etc.)
-                growth = 1 + 0.05 * max(0, (year - 1920)/71)
-            else:  # Réduction après chute URSS
-                growth = 1 - 0.06 * max(0, (year - 1991)/30)
-                
-            noise = np.random.normal(1, 0.16)
-            expenses.append(base_international * growth * noise)
+        growth = np.where(year <= 1991,
+                          1 + 0.05 * np.maximum(0, (year - 1920)/71),   # Forte dimension internationale (Komintern, etc.)
+                          1 - 0.06 * np.maximum(0, (year - 1991)/30))   # Réduction après chute URSS
         
-        return expenses
+        noise = self._noise('Depenses_International', len(year))
+        return base_international * growth * noise
     
     def _simulate_budget_execution_rate(self, dates):
         """Simule le taux d'exécution du budget"""
-        rates = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            if year <= 1945:
-                base_rate = 0.75  # Gestion moins professionnelle
-            elif year <= 1978:
-                base_rate = 0.82
-            elif year <= 2000:
-                base_rate = 0.78  # Difficultés financières
-            else:
-                base_rate = 0.85  # Professionnalisation
-                
-            noise = np.random.normal(1, 0.05)
-            rates.append(base_rate * noise)
+        year, i = self._years(dates)
+        
+        base_rate = np.select(
+            [year <= 1945,   # Gestion moins professionnelle
+             year <= 1978,
+             year <= 2000],  # Difficultés financières
+            [0.75, 0.82, 0.78],
+            default=0.85)    # Professionnalisation
         
-        return rates
+        noise = self._noise('Taux_Execution_Budget', len(year))
+        return base_rate * noise
     
     def _simulate_membership_ratio(self, dates):
         """Simule le ratio cotisations/revenus"""
-        ratios = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            if year <= 1956:
-                base_ratio = 0.50  # Très dépendant des cotisations
-            elif year <= 1978:
-                base_ratio = 0.45
-            elif year <= 2000:
-                base_ratio = 0.38
-            else:
-                base_ratio = 0.32  # Diversification
-                
-            noise = np.random.normal(1, 0.06)
-            ratios.append(base_ratio * noise)
+        year, i = self._years(dates)
+        
+        base_ratio = np.select(
+            [year <= 1956,   # Très dépendant des cotisations
+             year <= 1978,
+             year <= 2000],
+            [0.50, 0.45, 0.38],
+            default=0.32)    # Diversification
         
-        return ratios
+        noise = self._noise('Ratio_Cotisations_Revenus', len(year))
+        return base_ratio * noise
     
     def _simulate_public_funding_dependency(self, dates):
         """Simule la dépendance au financement public"""
-        dependencies = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            if year <= 1956:
-                base_dependency = 0.20  # Peu dépendant (forte base militante)
-            elif year <= 1978:
-                base_dependency = 0.28
-            elif year <= 2000:
-                base_dependency = 0.35  # Plus dépendant
-            else:
-                base_dependency = 0.42  # Très dépendant
-                
-            noise = np.random.normal(1, 0.07)
-            dependencies.append(base_dependency * noise)
+        year, i = self._years(dates)
         
-        return dependencies
+        base_dependency = np.select(
+            [year <= 1956,   # Peu dépendant (forte base militante)
+             year <= 1978,
+             year <= 2000],  # Plus dépendant
+            [0.20, 0.28, 0.35],
+            default=0.42)    # Très dépendant
+        
+        noise = self._noise('Dependance_Financement_Public', len(year))
+        return base_dependency * noise
     
     def _simulate_financial_balance(self, dates):
         """Simule le solde financier"""
-        balances = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            if year in [1936, 1945, 1956, 1968, 1978, 1981, 1997, 2002, 2012, 2017, 2022]:
-                base_balance = -0.10  # Déficits électoraux
-            elif year in [1929, 1939, 1947, 1962, 1973, 1986, 1993, 2008, 2020]:
-                base_balance = -0.08  # Crises
-            else:
-                base_balance = 0.02  # Équilibre prudent
-                
-            noise = np.random.normal(1, 0.12)
-            balances.append(base_balance * noise)
+        year, i = self._years(dates)
+        
+        base_balance = np.select(
+            [self.elections.masks(year)["majeures"],                                # Déficits électoraux
+             np.isin(year, [1929, 1939, 1947, 1962, 1973, 1986, 1993, 2008, 2020])],  # Crises
+            [-0.10, -0.08],
+            default=0.02)  # Équilibre prudent
         
-        return balances
+        noise = self._noise('Solde_Financier', len(year))
+        return base_balance * noise
     
     def _simulate_own_funds(self, dates):
         """Simule les fonds propres"""
         base_funds = self.config["budget_base"] * 0.8
-        
-        funds = []
-        current_funds = base_funds
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            if year in [1945, 1978, 1997]:  # Périodes fastes
-                change_rate = 0.15
-            elif year in [1939, 1968, 1991, 2008]:  # Crises
-                change_rate = -0.20
-            else:
-                change_rate = 0.02
-                
-            current_funds *= (1 + change_rate)
-            noise = np.random.normal(1, 0.10)
-            funds.append(current_funds * noise)
-        
-        return funds
+        year, i = self._years(dates)
+        
+        change_rate = np.select(
+            [np.isin(year, [1945, 1978, 1997]),         # Périodes fastes
+             np.isin(year, [1939, 1968, 1991, 2008])],  # Crises
+            [0.15, -0.20],
+            default=0.02)
+        
+        # Capitalisation année après année à partir de la base
+        current_funds = base_funds * np.cumprod(1 + change_rate)
+        noise = self._noise('Fonds_Propres', len(year))
+        return current_funds * noise
     
     def _simulate_communication_investment(self, dates):
         """Simule l'investissement en communication"""
         base_investment = self.config["budget_base"] * 0.06
+        year, i = self._years(dates)
         
-        investment = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            if year >= 1990:
-                growth = 1 + 0.07 * max(0, (year - 1990)/30)
-            else:
-                growth = 1
-                
-            noise = np.random.normal(1, 0.14)
-            investment.append(base_investment * growth * noise)
+        growth = np.where(year >= 1990, 1 + 0.07 * np.maximum(0, (year - 1990)/30), 1)
         
-        return investment
+        noise = self._noise('Investissement_Communication', len(year))
+        return base_investment * growth * noise
     
     def _simulate_training_investment(self, dates):
         """Simule l'investissement en formation"""
         base_investment = self.config["budget_base"] * 0.05
+        year, i = self._years(dates)
         
-        investment = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            if year >= 1950:
-                growth = 1 + 0.04 * max(0, (year - 1950)/70)
-            else:
-                growth = 1
-                
-            noise = np.random.normal(1, 0.11)
-            investment.append(base_investment * growth * noise)
+        growth = np.where(year >= 1950, 1 + 0.04 * np.maximum(0, (year - 1950)/70), 1)
         
-        return investment
+        noise = self._noise('Investissement_Formation', len(year))
+        return base_investment * growth * noise
     
     def _simulate_municipal_investment(self, dates):
         """Simule l'investissement municipal"""
         base_investment = self.config["budget_base"] * 0.07
+        year, i = self._years(dates)
         
-        investment = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            if year <= 1977:
-                growth = 1 + 0.06 * max(0, (year - 1945)/32)
-            elif year <= 2000:
-                growth = 1 - 0.04 * max(0, (year - 1977)/23)
-            else:
-                growth = 1 - 0.01 * max(0, (year - 2000)/25)
-                
-            noise = np.random.normal(1, 0.13)
-            investment.append(base_investment * growth * noise)
+        growth = np.select(
+            [year <= 1977, year <= 2000],
+            [1 + 0.06 * np.maximum(0, (year - 1945)/32),
+             1 - 0.04 * np.maximum(0, (year - 1977)/23)],
+            default=1 - 0.01 * np.maximum(0, (year - 2000)/25))
         
-        return investment
+        noise = self._noise('Investissement_Municipal', len(year))
+        return base_investment * growth * noise
     
     def _simulate_youth_investment(self, dates):
         """Simule l'investissement jeunesse"""
         base_investment = self.config["budget_base"] * 0.04
+        year, i = self._years(dates)
         
-        investment = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            if year >= 1960:
-                growth = 1 + 0.05 * max(0, (year - 1960)/60)
-            else:
-                growth = 1
-                
-            noise = np.random.normal(1, 0.15)
-            investment.append(base_investment * growth * noise)
+        growth = np.where(year >= 1960, 1 + 0.05 * np.maximum(0, (year - 1960)/60), 1)
         
-        return investment
+        noise = self._noise('Investissement_Jeunesse', len(year))
+        return base_investment * growth * noise
     
     def _simulate_press_investment(self, dates):
         """Simule l'investissement dans la presse"""
         base_investment = self.config["budget_base"] * 0.05
+        year, i = self._years(dates)
         
-        investment = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            if year <= 1970:
-                growth = 1 + 0.05 * max(0, (year - 1920)/50)
-            else:
-                growth = 1 - 0.03 * max(0, (year - 1970)/50)
-                
-            noise = np.random.normal(1, 0.16)
-            investment.append(base_investment * growth * noise)
+        growth = np.where(year <= 1970,
+                          1 + 0.05 * np.maximum(0, (year - 1920)/50),
+                          1 - 0.03 * np.maximum(0, (year - 1970)/50))
         
-        return investment
-    
-    def _add_party_trends(self, df):
-        """Ajoute des tendances réalistes pour le PCF"""
-        for i, row in df.iterrows():
-            year = row['Annee']
-            
-            # Création du PCF (1920)
-            if year == 1920:
-                df.loc[i, 'Adherents'] *= 1.5
-                df.loc[i, 'Sections_Locales'] *= 2.0
-            
-            # Front populaire (1936)
-            if year == 1936:
-                df.loc[i, 'Adherents'] *= 1.8
-                df.loc[i, 'Elus_Nationaux'] *= 2.5
-                df.loc[i, 'Revenus_Total'] *= 1.6
-            
-            # Libération (1945)
-            if year == 1945:
-                df.loc[i, 'Adherents'] *= 2.2
-                df.loc[i, 'Elus_Nationaux'] *= 3.0
-                df.loc[i, 'Mairies'] *= 1.8
-                df.loc[i, 'Revenus_Total'] *= 1.9
-            
-            # Guerre froide (1947-1956)
-            if 1947 <= year <= 1956:
-                df.loc[i, 'Depenses_International'] *= 1.4
-                df.loc[i, 'Investissement_Presse'] *= 1.3
-            
-            # Mai 68
-            if year == 1968:
-                df.loc[i, 'Adherents'] *= 1.15
-                df.loc[i, 'Investissement_Jeunesse'] *= 1.4
-            
-            # Programme commun (1972-1977)
-            if 1972 <= year <= 1977:
-                df.loc[i, 'Revenus_Total'] *= 1.2
-                df.loc[i, 'Depenses_Campagnes'] *= 1.5
-            
-            # Défaite 1978 (tournant)
-            if year == 1978:
-                df.loc[i, 'Adherents'] *= 0.85
-                df.loc[i, 'Revenus_Total'] *= 0.90
-            
-            # Chute du mur de Berlin (1989-1991)
-            if 1989 <= year <= 1991:
-                df.loc[i, 'Adherents'] *= 0.70
-                df.loc[i, 'Revenus_Total'] *= 0.80
-                df.loc[i, 'Depenses_International'] *= 0.60
-            
-            # Gauche plurielle (1997-2002)
-            if 1997 <= year <= 2002:
-                df.loc[i, 'Financement_Public'] *= 1.4
-                df.loc[i, 'Revenus_Total'] *= 1.15
-            
-            # Crise de L'Humanité (années 2000)
-            if 2000 <= year <= 2010:
-                df.loc[i, 'Revenus_Presse'] *= 0.70
-                df.loc[i, 'Investissement_Presse'] *= 0.80
-            
-            # NUPES (2022)
-            if year == 2022:
-                df.loc[i, 'Elus_Nationaux'] *= 2.0
-                df.loc[i, 'Depenses_Campagnes'] *= 1.3
-                df.loc[i, 'Revenus_Total'] *= 1.1
+        noise = self._noise('Investissement_Presse', len(year))
+        return base_investment * growth * noise
     
-    def create_financial_analysis(self, df):
-        """Crée une analyse complète des finances du PCF"""
+    def create_financial_analysis(self, df, figure_cache=None):
+        """Crée une analyse complète des finances du PCF (DataFrame ou PCFYearStore)"""
         # Filtrer pour la période récente (à partir de 1945 pour plus de lisibilité)
-        df_recent = df[df['Annee'] >= 1945].copy()
+        df_recent = PCFYearStore.from_frame(df).slice(1945)
+        output_file = 'PCF_financial_analysis.png'
+        title = f'Analyse des Finances du {self.parti} (1945-{self.end_year})'
+        
+        # Reprendre la figure en cache si ses données d'entrée n'ont pas changé
+        if figure_cache is not None:
+            cache_key = figure_cache.figure_key(self, df_recent, dpi=300, style='seaborn-v0_8', title=title,
+                                                figsize=(20, 24))
+            image = figure_cache.get(cache_key)
+            if image is not None:
+                with open(output_file, 'wb') as f:
+                    f.write(image)
+                print(f"♻️ Figure inchangée, reprise depuis le cache: {output_file}")
+                
+                # Affichage identique à un rendu complet
+                plt.figure(figsize=(20, 24))
+                plt.imshow(plt.imread(io.BytesIO(image), format='png'))
+                plt.axis('off')
+                plt.show()
+                
+                self._generate_financial_insights(df)
+                return
         
         plt.style.use('seaborn-v0_8')
         fig = plt.figure(figsize=(20, 24))
         
-        # 1. Évolution des revenus et dépenses
-        ax1 = plt.subplot(4, 2, 1)
-        self._plot_revenue_expenses(df_recent, ax1)
-        
-        # 2. Structure des revenus
-        ax2 = plt.subplot(4, 2, 2)
-        self._plot_revenue_structure(df_recent, ax2)
-        
-        # 3. Structure des dépenses
-        ax3 = plt.subplot(4, 2, 3)
-        self._plot_expenses_structure(df_recent, ax3)
-        
-        # 4. Adhérents et structure
-        ax4 = plt.subplot(4, 2, 4)
-        self._plot_membership_structure(df_recent, ax4)
-        
-        # 5. Investissements stratégiques
-        ax5 = plt.subplot(4, 2, 5)
-        self._plot_strategic_investments(df_recent, ax5)
-        
-        # 6. Indicateurs financiers
-        ax6 = plt.subplot(4, 2, 6)
-        self._plot_financial_indicators(df_recent, ax6)
-        
-        # 7. Évolution des élus
-        ax7 = plt.subplot(4, 2, 7)
-        self._plot_elected_officials(df_recent, ax7)
+        self._save_dpi = 300
+        try:
+            for position, plot_panel in enumerate(self.panels.values(), start=1):
+                ax = plt.subplot(4, 2, position)
+                plot_panel(df_recent, ax)
+        finally:
+            self._save_dpi = None
         
-        # 8. Situation financière
-        ax8 = plt.subplot(4, 2, 8)
-        self._plot_financial_situation(df_recent, ax8)
-        
-        plt.suptitle(f'Analyse des Finances du {self.parti} (1945-{self.end_year})', 
-                    fontsize=16, fontweight='bold')
+        plt.suptitle(title, fontsize=16, fontweight='bold')
         plt.tight_layout()
-        plt.savefig(f'PCF_financial_analysis.png', dpi=300, bbox_inches='tight')
+        plt.savefig(output_file, dpi=300, bbox_inches='tight')
+        if figure_cache is not None:
+            with open(output_file, 'rb') as f:
+                figure_cache.put(cache_key, f.read())
         plt.show()
         
         # Générer les insights
         self._generate_financial_insights(df)
     
+    def render_panel(self, df, name, dpi=100, figsize=(10, 6)):
+        """Rend un seul panneau de l'analyse en PNG (octets)"""
+        plt.style.use('seaborn-v0_8')
+        fig, ax = plt.subplots(figsize=figsize)
+        self._save_dpi = dpi
+        try:
+            self.panels[name](df, ax)
+        finally:
+            self._save_dpi = None
+        fig.tight_layout()
+        
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format='png', dpi=dpi, bbox_inches='tight')
+        plt.close(fig)
+        return buffer.getvalue()
+    
+    def _plot_line(self, ax, x, y, **kwargs):
+        """Trace une courbe sous-échantillonnée à la résolution de l'axe dans l'image enregistrée"""
+        # Largeur de l'axe en pixels à la résolution d'enregistrement (et non d'affichage)
+        scale = (self._save_dpi or ax.figure.dpi) / ax.figure.dpi
+        max_points = self.max_plot_points or 2 * int(ax.get_window_extent().width * scale)
+        x, y = downsample_xy(x, y, max_points, method=self.downsample_method)
+        return ax.plot(x, y, **kwargs)
+    
     def _plot_revenue_expenses(self, df, ax):
         """Plot de l'évolution des revenus et dépenses"""
-        ax.plot(df['Annee'], df['Revenus_Total'], label='Revenus Totaux', 
-               linewidth=2, color='#D50000', alpha=0.8)
-        ax.plot(df['Annee'], df['Depenses_Total'], label='Dépenses Totales', 
-               linewidth=2, color='#FF5252', alpha=0.8)
+        self._plot_line(ax, df['Annee'], df['Revenus_Total'], label='Revenus Totaux', 
+                       linewidth=2, color='#D50000', alpha=0.8)
+        self._plot_line(ax, df['Annee'], df['Depenses_Total'], label='Dépenses Totales', 
+                       linewidth=2, color='#FF5252', alpha=0.8)
         
         ax.set_title('Évolution des Revenus et Dépenses (M€)', 
                     fontsize=12, fontweight='bold')
@@ -923,12 +842,13 @@ class PCFFinanceAnalyzer:
         ax.grid(True, alpha=0.3)
         
         # Ajouter des annotations pour les événements clés
+        store = PCFYearStore.from_frame(df)
         key_events = {1945: 'Libération', 1956: 'Guerre froide', 1968: 'Mai 68', 
                      1978: 'Défaite', 1997: 'Gauche plurielle', 2022: 'NUPES'}
         
         for year, event in key_events.items():
-            if year in df['Annee'].values:
-                y_val = df[df['Annee'] == year]['Revenus_Total'].values[0]
+            if year in store:
+                y_val = store.at(year, 'Revenus_Total')
                 ax.annotate(event, (year, y_val), xytext=(10, 10), 
                            textcoords='offset points', fontsize=8, 
                            arrowprops=dict(arrowstyle='->', alpha=0.6))
@@ -987,8 +907,8 @@ class PCFFinanceAnalyzer:
         
         # Sections locales en second axe
         ax2 = ax.twinx()
-        ax2.plot(df['Annee'], df['Sections_Locales']/10, label='Sections Locales (dizaines)', 
-                linewidth=2, color='#FF5252')
+        self._plot_line(ax2, df['Annee'], df['Sections_Locales']/10, label='Sections Locales (dizaines)', 
+                        linewidth=2, color='#FF5252')
         ax2.set_ylabel('Sections Locales (dizaines)', color='#FF5252')
         ax2.tick_params(axis='y', labelcolor='#FF5252')
         
@@ -999,14 +919,14 @@ class PCFFinanceAnalyzer:
     
     def _plot_strategic_investments(self, df, ax):
         """Plot des investissements stratégiques"""
-        ax.plot(df['Annee'], df['Investissement_Communication'], label='Communication', 
-               linewidth=2, color='#D50000', alpha=0.8)
-        ax.plot(df['Annee'], df['Investissement_Formation'], label='Formation', 
-               linewidth=2, color='#FF5252', alpha=0.8)
-        ax.plot(df['Annee'], df['Investissement_Municipal'], label='Municipal', 
-               linewidth=2, color='#FF8A80', alpha=0.8)
-        ax.plot(df['Annee'], df['Investissement_Presse'], label='Presse', 
-               linewidth=2, color='#C51162', alpha=0.8)
+        self._plot_line(ax, df['Annee'], df['Investissement_Communication'], label='Communication', 
+                       linewidth=2, color='#D50000', alpha=0.8)
+        self._plot_line(ax, df['Annee'], df['Investissement_Formation'], label='Formation', 
+                       linewidth=2, color='#FF5252', alpha=0.8)
+        self._plot_line(ax, df['Annee'], df['Investissement_Municipal'], label='Municipal', 
+                       linewidth=2, color='#FF8A80', alpha=0.8)
+        self._plot_line(ax, df['Annee'], df['Investissement_Presse'], label='Presse', 
+                       linewidth=2, color='#C51162', alpha=0.8)
         
         ax.set_title('Investissements Stratégiques (M€)', fontsize=12, fontweight='bold')
         ax.set_ylabel('Montants (M€)')
@@ -1026,8 +946,8 @@ class PCFFinanceAnalyzer:
         
         # Dépendance financement public en second axe
         ax2 = ax.twinx()
-        ax2.plot(df['Annee'], df['Dependance_Financement_Public']*100, label='Dépendance Financement Public (%)', 
-                linewidth=3, color='#FF5252')
+        self._plot_line(ax2, df['Annee'], df['Dependance_Financement_Public']*100, label='Dépendance Financement Public (%)', 
+                        linewidth=3, color='#FF5252')
         ax2.set_ylabel('Dépendance Financement Public (%)', color='#FF5252')
         ax2.tick_params(axis='y', labelcolor='#FF5252')
         
@@ -1038,8 +958,8 @@ class PCFFinanceAnalyzer:
     
     def _plot_elected_officials(self, df, ax):
         """Plot de l'évolution des élus"""
-        ax.plot(df['Annee'], df['Elus_Locaux']/1000, label='Élus Locaux (milliers)', 
-               linewidth=2, color='#D50000', alpha=0.8)
+        self._plot_line(ax, df['Annee'], df['Elus_Locaux']/1000, label='Élus Locaux (milliers)', 
+                       linewidth=2, color='#D50000', alpha=0.8)
         
         ax.set_title('Évolution des Élus', fontsize=12, fontweight='bold')
         ax.set_ylabel('Élus Locaux (milliers)', color='#D50000')
@@ -1048,8 +968,8 @@ class PCFFinanceAnalyzer:
         
         # Élus nationaux en second axe
         ax2 = ax.twinx()
-        ax2.plot(df['Annee'], df['Elus_Nationaux'], label='Élus Nationaux', 
-                linewidth=2, color='#FF5252', alpha=0.8)
+        self._plot_line(ax2, df['Annee'], df['Elus_Nationaux'], label='Élus Nationaux', 
+                        linewidth=2, color='#FF5252', alpha=0.8)
         ax2.set_ylabel('Élus Nationaux', color='#FF5252')
         ax2.tick_params(axis='y', labelcolor='#FF5252')
         
@@ -1062,7 +982,7 @@ class PCFFinanceAnalyzer:
         """Plot de la situation financière"""
         # Solde financier
         ax.bar(df['Annee'], df['Solde_Financier']*100, label='Solde Financier (% du budget)', 
-              color=df['Solde_Financier'].apply(lambda x: '#4CAF50' if x > 0 else '#D50000'), alpha=0.7)
+              color=np.where(df['Solde_Financier'] > 0, '#4CAF50', '#D50000'), alpha=0.7)
         
         ax.set_title('Situation Financière', fontsize=12, fontweight='bold')
         ax.set_ylabel('Solde Financier (% du budget)', color='#D50000')
@@ -1071,8 +991,8 @@ class PCFFinanceAnalyzer:
         
         # Fonds propres en second axe
         ax2 = ax.twinx()
-        ax2.plot(df['Annee'], df['Fonds_Propres'], label='Fonds Propres (M€)', 
-                linewidth=3, color='#FF8A80')
+        self._plot_line(ax2, df['Annee'], df['Fonds_Propres'], label='Fonds Propres (M€)', 
+                        linewidth=3, color='#FF8A80')
         ax2.set_ylabel('Fonds Propres (M€)', color='#FF8A80')
         ax2.tick_params(axis='y', labelcolor='#FF8A80')
         
@@ -1081,55 +1001,93 @@ class PCFFinanceAnalyzer:
         lines2, labels2 = ax2.get_legend_handles_labels()
         ax.legend(lines1 + lines2, labels1 + labels2, loc='upper right')
     
+    def aggregate_cube(self, df):
+        """Cube d'agrégats du jeu de données (reconstruit seulement si les données changent)
+        
+        Un PCFYearStore (instantané des données générées) est reconnu par identité, en O(1) ;
+        un DataFrame, modifiable sur place, l'est par l'empreinte de son contenu.
+        """
+        key = df if isinstance(df, PCFYearStore) else fingerprint(df)
+        cached = getattr(self, '_aggregate_cube', None)
+        if cached is None or not (cached[0] is key if isinstance(df, PCFYearStore) else cached[0] == key):
+            cached = (key, PCFAggregateCube(df, self.regimes, self.elections["legislatives"]))
+            self._aggregate_cube = cached
+        return cached[1]
+    
+    def compute_financial_insights(self, df):
+        """Calcule les indicateurs chiffrés des insights (sans affichage)"""
+        # Période récente (à partir de 1945), lue dans le cube d'agrégats
+        cube = self.aggregate_cube(df)
+        first, last = cube.first_year(1945), int(cube.years[-1])
+        return self.insight_statistics(mean=lambda column: cube.range_mean(first, last, column),
+                                       first=lambda column: cube.value(first, column),
+                                       last=lambda column: cube.value(last, column))
+    
+    def insight_statistics(self, mean, first, last):
+        """Formules des insights à partir des moyennes et des valeurs de début et de fin de période
+        
+        mean, first et last renvoient un scalaire ou un tableau de rééchantillons par colonne.
+        """
+        mean_revenue = mean('Revenus_Total')
+        
+        return {
+            # Statistiques de base
+            'revenus_moyens': mean_revenue,
+            'depenses_moyennes': mean('Depenses_Total'),
+            'adherents_moyens': mean('Adherents'),
+            'taux_execution_moyen': mean('Taux_Execution_Budget') * 100,
+            # Évolution historique
+            'evolution_revenus': ((last('Revenus_Total') / first('Revenus_Total')) - 1) * 100,
+            'evolution_adherents': ((last('Adherents') / first('Adherents')) - 1) * 100,
+            # Structure financière
+            'part_cotisations': (mean('Cotisations_Adherents') / mean_revenue) * 100,
+            'part_financement_public': (mean('Financement_Public') / mean_revenue) * 100,
+            'part_presse': (mean('Revenus_Presse') / mean_revenue) * 100,
+            # Performance et efficacité
+            'solde_moyen': mean('Solde_Financier') * 100,
+            'fonds_propres_finaux': last('Fonds_Propres'),
+            'dependance_financement_public': last('Dependance_Financement_Public') * 100,
+        }
+    
     def _generate_financial_insights(self, df):
         """Génère des insights analytiques pour le PCF"""
         print(f"☭ INSIGHTS ANALYTIQUES - {self.parti} ({self.start_year}-{self.end_year})")
         print("=" * 70)
         
-        # Filtrer pour la période récente
-        df_recent = df[df['Annee'] >= 1945]
+        insights = self.compute_financial_insights(df)
+        bootstrap = PCFInsightBootstrap(self)
+        intervals = bootstrap.intervals(df)
+        
+        def ci(key, fmt):
+            """Intervalle de confiance bootstrap d'un insight (sensibilité aux bornes pour les évolutions)"""
+            low, high = intervals[key]
+            if key in bootstrap.ENDPOINT_INSIGHTS:
+                return f" [sensibilité aux bornes, fenêtre de {bootstrap.window} ans: {low:{fmt}} – {high:{fmt}}]"
+            return f" [IC {bootstrap.level:.0%}: {low:{fmt}} – {high:{fmt}}]"
         
         # 1. Statistiques de base
         print("\n1. 📈 STATISTIQUES GÉNÉRALES:")
-        avg_revenue = df_recent['Revenus_Total'].mean()
-        avg_expenses = df_recent['Depenses_Total'].mean()
-        avg_adherents = df_recent['Adherents'].mean()
-        avg_execution = df_recent['Taux_Execution_Budget'].mean() * 100
-        
-        print(f"Revenus moyens annuels: {avg_revenue:.2f} M€")
-        print(f"Dépenses moyennes annuelles: {avg_expenses:.2f} M€")
-        print(f"Adhérents moyens: {avg_adherents:,.0f} personnes")
-        print(f"Taux d'exécution budgétaire moyen: {avg_execution:.1f}%")
+        print(f"Revenus moyens annuels: {insights['revenus_moyens']:.2f} M€{ci('revenus_moyens', '.2f')}")
+        print(f"Dépenses moyennes annuelles: {insights['depenses_moyennes']:.2f} M€{ci('depenses_moyennes', '.2f')}")
+        print(f"Adhérents moyens: {insights['adherents_moyens']:,.0f} personnes{ci('adherents_moyens', ',.0f')}")
+        print(f"Taux d'exécution budgétaire moyen: {insights['taux_execution_moyen']:.1f}%{ci('taux_execution_moyen', '.1f')}")
         
         # 2. Évolution historique
         print("\n2. 📊 ÉVOLUTION HISTORIQUE:")
-        revenue_growth = ((df_recent['Revenus_Total'].iloc[-1] / 
-                          df_recent['Revenus_Total'].iloc[0]) - 1) * 100
-        adherents_growth = ((df_recent['Adherents'].iloc[-1] / 
-                           df_recent['Adherents'].iloc[0]) - 1) * 100
-        
-        print(f"Évolution des revenus (1945-{self.end_year}): {revenue_growth:.1f}%")
-        print(f"Évolution des adhérents (1945-{self.end_year}): {adherents_growth:.1f}%")
+        print(f"Évolution des revenus (1945-{self.end_year}): {insights['evolution_revenus']:.1f}%{ci('evolution_revenus', '.1f')}")
+        print(f"Évolution des adhérents (1945-{self.end_year}): {insights['evolution_adherents']:.1f}%{ci('evolution_adherents', '.1f')}")
         
         # 3. Structure financière
         print("\n3. 📋 STRUCTURE FINANCIÈRE:")
-        membership_share = (df_recent['Cotisations_Adherents'].mean() / df_recent['Revenus_Total'].mean()) * 100
-        public_funding_share = (df_recent['Financement_Public'].mean() / df_recent['Revenus_Total'].mean()) * 100
-        press_share = (df_recent['Revenus_Presse'].mean() / df_recent['Revenus_Total'].mean()) * 100
-        
-        print(f"Part des cotisations dans les revenus: {membership_share:.1f}%")
-        print(f"Part du financement public: {public_funding_share:.1f}%")
-        print(f"Part des revenus de la presse: {press_share:.1f}%")
+        print(f"Part des cotisations dans les revenus: {insights['part_cotisations']:.1f}%{ci('part_cotisations', '.1f')}")
+        print(f"Part du financement public: {insights['part_financement_public']:.1f}%{ci('part_financement_public', '.1f')}")
+        print(f"Part des revenus de la presse: {insights['part_presse']:.1f}%{ci('part_presse', '.1f')}")
         
         # 4. Performance et efficacité
         print("\n4. 🎯 PERFORMANCE FINANCIÈRE:")
-        avg_balance = df_recent['Solde_Financier'].mean() * 100
-        last_funds = df_recent['Fonds_Propres'].iloc[-1]
-        dependency_public = df_recent['Dependance_Financement_Public'].iloc[-1] * 100
-        
-        print(f"Solde financier moyen: {avg_balance:.1f}% du budget")
-        print(f"Fonds propres finaux: {last_funds:.1f} M€")
-        print(f"Dépendance au financement public: {dependency_public:.1f}%")
+        print(f"Solde financier moyen: {insights['solde_moyen']:.1f}% du budget{ci('solde_moyen', '.1f')}")
+        print(f"Fonds propres finaux: {insights['fonds_propres_finaux']:.1f} M€{ci('fonds_propres_finaux', '.1f')}")
+        print(f"Dépendance au financement public: {insights['dependance_financement_public']:.1f}%{ci('dependance_financement_public', '.1f')}")
         
         # 5. Spécificités du PCF
         print(f"\n5. 🌟 SPÉCIFICITÉS DU PCF:")
@@ -1179,13 +1137,13 @@ def main():
     print(f"💾 Données sauvegardées: {output_file}")
     
     # Aperçu des données (période récente)
-    df_recent = financial_data[financial_data['Annee'] >= 2000]
+    store = analyzer.store
     print("\n👀 Aperçu des données (2000-2025):")
-    print(df_recent[['Annee', 'Adherents', 'Revenus_Total', 'Depenses_Total', 'Taux_Execution_Budget']].head())
+    print(store.slice(2000, 2004).to_frame(['Adherents', 'Revenus_Total', 'Depenses_Total', 'Taux_Execution_Budget']))
     
     # Créer l'analyse
     print("\n📈 Création de l'analyse financière...")
-    analyzer.create_financial_analysis(financial_data)
+    analyzer.create_financial_analysis(store, figure_cache=PCFFigureCache())
     
     print(f"\n✅ Analyse des finances du {analyzer.parti} terminée!")
     print(f"📊 Période: {analyzer.start_year}-{analyzer.end_year}")
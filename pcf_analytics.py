@@ -0,0 +1,112 @@
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+YEAR_AXIS = -2  # Tableaux (..., années, séries) : runs éventuels en tête
+
+
+def _pad_front(values, window):
+    """Aligne un résultat glissant sur les années (NaN pour les window-1 premières)"""
+    pad_shape = list(values.shape)
+    pad_shape[YEAR_AXIS] = window - 1
+    return np.concatenate([np.full(pad_shape, np.nan), values], axis=YEAR_AXIS)
+
+
+def _window_sums(values, window):
+    """Sommes glissantes par différence de sommes cumulées"""
+    cumsum = np.cumsum(values, axis=YEAR_AXIS)
+    zero_shape = list(values.shape)
+    zero_shape[YEAR_AXIS] = 1
+    cumsum = np.concatenate([np.zeros(zero_shape), cumsum], axis=YEAR_AXIS)
+    return cumsum[..., window:, :] - cumsum[..., :-window, :]
+
+
+def rolling_mean(values, window):
+    """Moyenne mobile sur toutes les séries et tous les runs"""
+    values = np.asarray(values, dtype=np.float64)
+    return _pad_front(_window_sums(values, window) / window, window)
+
+
+def rolling_std(values, window):
+    """Écart-type glissant (sommes cumulées de x et x², centrées pour la stabilité)"""
+    values = np.asarray(values, dtype=np.float64)
+    centered = values - np.nanmean(values, axis=YEAR_AXIS, keepdims=True)
+    sums = _window_sums(centered, window)
+    squares = _window_sums(centered ** 2, window)
+    variance = np.maximum(squares - sums ** 2 / window, 0) / (window - 1)
+    return _pad_front(np.sqrt(variance), window)
+
+
+def rolling_min(values, window):
+    """Minimum glissant (vue à pas de fenêtre, sans copie)"""
+    windows = sliding_window_view(np.asarray(values, dtype=np.float64), window, axis=YEAR_AXIS)
+    return _pad_front(windows.min(axis=-1), window)
+
+
+def rolling_max(values, window):
+    """Maximum glissant (vue à pas de fenêtre, sans copie)"""
+    windows = sliding_window_view(np.asarray(values, dtype=np.float64), window, axis=YEAR_AXIS)
+    return _pad_front(windows.max(axis=-1), window)
+
+
+def yoy_growth(values):
+    """Croissance annuelle (t / t-1 - 1), NaN la première année"""
+    values = np.asarray(values, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        growth = values[..., 1:, :] / values[..., :-1, :] - 1
+    return _pad_front(growth, 2)
+
+
+def rolling_volatility(values, window):
+    """Volatilité glissante : écart-type de la croissance annuelle"""
+    growth = yoy_growth(values)[..., 1:, :]
+    growth = np.where(np.isfinite(growth), growth, 0.0)
+    return _pad_front(rolling_std(growth, window)[..., window - 1:, :], window + 1)
+
+
+class PCFRollingAnalytics:
+    """Statistiques glissantes de toutes les colonnes, pour un jeu ou un ensemble"""
+
+    STATISTICS = ('moyenne_mobile', 'volatilite', 'min_glissant', 'max_glissant', 'croissance_annuelle')
+
+    def __init__(self, years, columns, values, window=5):
+        self.years = np.asarray(years)
+        self.columns = list(columns)
+        self.window = window
+
+        self.results = {
+            'moyenne_mobile': rolling_mean(values, window),
+            'volatilite': rolling_volatility(values, window),
+            'min_glissant': rolling_min(values, window),
+            'max_glissant': rolling_max(values, window),
+            'croissance_annuelle': yoy_growth(values),
+        }
+
+    @classmethod
+    def from_frame(cls, df, window=5):
+        """Calcule les statistiques d'un DataFrame au format generate_financial_data"""
+        columns = [col for col in df.columns if col != 'Annee']
+        return cls(df['Annee'].to_numpy(), columns, df[columns].to_numpy(dtype=np.float64), window)
+
+    @classmethod
+    def from_ensemble(cls, analyzer, values, window=5):
+        """Calcule les statistiques d'un ensemble (runs, années, séries)"""
+        return cls(analyzer.years, analyzer.series_columns, values, window)
+
+    def __getitem__(self, statistic):
+        return self.results[statistic]
+
+    def series(self, statistic, column):
+        """Statistique d'une colonne, alignée sur Annee"""
+        return self.results[statistic][..., self.columns.index(column)]
+
+    def frame(self, statistic, run=None):
+        """Statistique au format DataFrame (utilisable par les panneaux existants)"""
+        values = self.results[statistic]
+        if values.ndim == 3:
+            if run is None:
+                raise ValueError("Préciser le run pour un ensemble")
+            values = values[run]
+        df = pd.DataFrame(values, columns=self.columns)
+        df.insert(0, 'Annee', self.years)
+        return df
@@ -0,0 +1,137 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from pcf_store import PCFYearStore
+
+_worker_analyzer = None
+
+
+def _init_worker():
+    """Initialise un analyseur par processus (formules des insights)"""
+    global _worker_analyzer
+    from Pcommun import PCFFinanceAnalyzer
+    _worker_analyzer = PCFFinanceAnalyzer()
+
+
+def _evaluate(analyzer, counts, values, columns, first_idx, last_idx):
+    """Insights de chaque rééchantillon : moyennes par produit matriciel (effectifs x valeurs)"""
+    index = {col: j for j, col in enumerate(columns)}
+    means = counts @ values / values.shape[0]
+    statistics = analyzer.insight_statistics(mean=lambda column: means[:, index[column]],
+                                             first=lambda column: values[first_idx, index[column]],
+                                             last=lambda column: values[last_idx, index[column]])
+    return {key: np.asarray(value, dtype=np.float64) for key, value in statistics.items()}
+
+
+def _evaluate_chunk(args):
+    return _evaluate(_worker_analyzer, *args)
+
+
+class PCFInsightBootstrap:
+    """Intervalles de confiance bootstrap (par blocs) de tous les insights
+
+    Les indices de rééchantillonnage sont tirés une seule fois : blocs mobiles
+    d'années consécutives pour les moyennes et les parts, tirage dans une fenêtre
+    de quelques années autour des bornes pour les évolutions et valeurs finales.
+    Chaque rééchantillon est réduit à un vecteur d'effectifs par année, si bien
+    que toutes les moyennes s'obtiennent en un produit matriciel.
+
+    Les insights lus aux bornes de la période (évolutions, valeurs finales) n'ont
+    pas d'intervalle de confiance : leur plage n'est qu'une sensibilité au choix
+    des années de début et de fin.
+    """
+
+    # Insights calculés à partir des valeurs de début et de fin de période
+    ENDPOINT_INSIGHTS = ('evolution_revenus', 'evolution_adherents',
+                         'fonds_propres_finaux', 'dependance_financement_public')
+
+    def __init__(self, analyzer, n_resamples=10000, block_length=5, window=2, level=0.95,
+                 start_year=1945, seed=0, n_jobs=1):
+        self.analyzer = analyzer
+        self.n_resamples = n_resamples
+        self.block_length = block_length
+        self.window = window
+        self.level = level
+        self.start_year = start_year
+        self.seed = seed
+        self.n_jobs = n_jobs or os.cpu_count()
+        self._resamples = {}
+
+    def resamples(self, n):
+        """Effectifs (rééchantillons, années) et indices des bornes, tirés une fois par longueur"""
+        if n not in self._resamples:
+            rng = np.random.RandomState(self.seed)
+            B, L = self.n_resamples, min(self.block_length, n)
+
+            # Blocs mobiles : débuts aléatoires, blocs concaténés puis tronqués à n années
+            starts = rng.randint(0, n - L + 1, size=(B, -(-n // L)))
+            idx = (starts[:, :, None] + np.arange(L)).reshape(B, -1)[:, :n]
+            counts = np.bincount((idx + n * np.arange(B)[:, None]).ravel(), minlength=B * n)
+
+            first_idx = rng.randint(0, min(self.window, n - 1) + 1, size=B)
+            last_idx = n - 1 - rng.randint(0, min(self.window, n - 1) + 1, size=B)
+            self._resamples[n] = (counts.reshape(B, n).astype(np.float64), first_idx, last_idx)
+        return self._resamples[n]
+
+    def distribution(self, df):
+        """Distribution bootstrap de chaque insight (clé → tableau de rééchantillons)"""
+        store = PCFYearStore.from_frame(df).slice(self.start_year)
+        values = np.ascontiguousarray(store.values)
+        counts, first_idx, last_idx = self.resamples(len(store))
+
+        if self.n_jobs <= 1:
+            return _evaluate(self.analyzer, counts, values, store.columns, first_idx, last_idx)
+
+        chunks = np.array_split(np.arange(self.n_resamples), self.n_jobs)
+        tasks = [(counts[rows], values, store.columns, first_idx[rows], last_idx[rows]) for rows in chunks]
+        with ProcessPoolExecutor(max_workers=self.n_jobs, initializer=_init_worker) as executor:
+            parts = list(executor.map(_evaluate_chunk, tasks))
+        return {key: np.concatenate([part[key] for part in parts]) for key in parts[0]}
+
+    def intervals(self, df):
+        """Intervalles percentiles (bas, haut) de chaque insight"""
+        return self._bounds(self.distribution(df))
+
+    def _bounds(self, distribution):
+        alpha = (1 - self.level) / 2
+        bounds = np.nanquantile(np.stack(list(distribution.values())), [alpha, 1 - alpha], axis=1)
+        return {key: (bounds[0, k], bounds[1, k]) for k, key in enumerate(distribution)}
+
+    def frame(self, df):
+        """Insights, intervalles et erreurs-types au format tableau"""
+        insights = self.analyzer.compute_financial_insights(df)
+        distribution = self.distribution(df)
+        intervals = self._bounds(distribution)
+        return pd.DataFrame([{'Insight': key, 'Valeur': insights[key],
+                              'Intervalle': 'sensibilite_bornes' if key in self.ENDPOINT_INSIGHTS else 'IC',
+                              'Bas': intervals[key][0], 'Haut': intervals[key][1],
+                              'Erreur_Type': (np.nan if key in self.ENDPOINT_INSIGHTS
+                                              else np.nanstd(distribution[key]))}
+                             for key in insights])
+
+
+def main():
+    """Intervalles de confiance des insights du PCF"""
+    import time
+    from Pcommun import PCFFinanceAnalyzer
+
+    analyzer = PCFFinanceAnalyzer()
+    df = analyzer.generate_financial_data()
+    bootstrap = PCFInsightBootstrap(analyzer)
+
+    t0 = time.perf_counter()
+    table = bootstrap.frame(df)
+    elapsed = time.perf_counter() - t0
+
+    output_file = 'PCF_insights_bootstrap.csv'
+    table.to_csv(output_file, index=False)
+    print(f"🎲 {bootstrap.n_resamples} rééchantillons (blocs de {bootstrap.block_length} ans) en {elapsed:.2f} s")
+    print(f"💾 Intervalles sauvegardés: {output_file}")
+    print(table.round(2).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+import numpy as np
+import pandas as pd
+
+from Pcommun import PCFFinanceAnalyzer
+
+
+def _prefix(values):
+    """Sommes cumulées précédées d'un zéro, le long du dernier axe"""
+    return np.concatenate([np.zeros(values.shape[:-1] + (1,)), np.cumsum(values, axis=-1)], axis=-1)
+
+
+class PCFChangePointDetector:
+    """Détection de ruptures par segmentation binaire vectorisée (sommes cumulées)
+
+    Toutes les séries (runs x colonnes) sont segmentées simultanément : à chaque
+    niveau, le gain de chaque coupure candidate est obtenu en O(1) par sommes
+    préfixées, d'où un coût O(n log n) par série.
+    """
+
+    def __init__(self, model="linear", penalty=3.0, min_size=3, tolerance=2, log_positive=True):
+        self.model = model            # "mean" (rupture de niveau) ou "linear" (niveau et pente)
+        self.penalty = penalty        # Multiplicateur de sigma² log(n)
+        self.min_size = min_size      # Longueur minimale d'un segment (années)
+        self.tolerance = tolerance    # Écart toléré avec la table des régimes (années)
+        self.log_positive = log_positive
+
+    def _prepare(self, y):
+        """Passage en log des séries strictement positives (bruit multiplicatif)"""
+        y = np.asarray(y, dtype=np.float64)
+        if self.log_positive:
+            positive = (y > 0).all(axis=1)
+            y = y.copy()
+            y[positive] = np.log(y[positive])
+        return y
+
+    def _noise_variance(self, y):
+        """Variance du bruit par série, estimée par MAD des différences premières"""
+        diff = np.diff(y, axis=1)
+        mad = np.median(np.abs(diff - np.median(diff, axis=1, keepdims=True)), axis=1)
+        sigma = 1.4826 * mad / np.sqrt(2)
+        return np.maximum(sigma ** 2, 1e-12)
+
+    def _cost(self, sums, a, b, rows):
+        """Coût (somme des carrés résiduels) des segments [a, b)"""
+        p_y, p_yy, p_t, p_tt, p_ty = sums
+        n = (b - a).astype(np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            s_y = p_y[rows, b] - p_y[rows, a]
+            rss = p_yy[rows, b] - p_yy[rows, a] - s_y ** 2 / n
+            if self.model == "linear":
+                s_t = p_t[b] - p_t[a]
+                s_tt = p_tt[b] - p_tt[a]
+                s_ty = p_ty[rows, b] - p_ty[rows, a]
+                var_t = s_tt - s_t ** 2 / n
+                rss = rss - np.where(var_t > 0, (s_ty - s_t * s_y / n) ** 2 / var_t, 0.0)
+        return np.where(n > 0, np.maximum(rss, 0.0), 0.0)
+
+    def detect(self, y):
+        """Renvoie un masque (séries, n) des débuts de segment détectés (hors indice 0)"""
+        y = self._prepare(y)
+        n_series, n = y.shape
+        t = np.arange(n, dtype=np.float64)
+        sums = (_prefix(y), _prefix(y ** 2), _prefix(t), _prefix(t ** 2), _prefix(y * t))
+        penalty = self.penalty * self._noise_variance(y) * np.log(n)
+
+        rows = np.repeat(np.arange(n_series)[:, None], n, axis=1)
+        index = np.broadcast_to(np.arange(n), (n_series, n))
+        is_start = np.zeros((n_series, n), dtype=bool)
+        is_start[:, 0] = True
+
+        while True:
+            # Bornes du segment contenant chaque position
+            start = np.maximum.accumulate(np.where(is_start, index, 0), axis=1)
+            next_start = np.where(is_start, index, n)
+            suffix_min = np.minimum.accumulate(next_start[:, ::-1], axis=1)[:, ::-1]
+            end = np.concatenate([suffix_min[:, 1:], np.full((n_series, 1), n)], axis=1)
+
+            # Gain de chaque coupure candidate
+            valid = (~is_start) & (index - start >= self.min_size) & (end - index >= self.min_size)
+            gain = (self._cost(sums, start, end, rows) - self._cost(sums, start, index, rows)
+                    - self._cost(sums, index, end, rows))
+            gain = np.where(valid, gain, -np.inf)
+
+            # Meilleure coupure par segment (segments contigus dans l'ordre aplati)
+            flat_gain = gain.ravel()
+            segment_starts = np.flatnonzero(is_start.ravel())
+            segment_max = np.maximum.reduceat(flat_gain, segment_starts)
+            segment_id = np.cumsum(is_start.ravel()) - 1
+            accepted = ((flat_gain == segment_max[segment_id]) &
+                        (flat_gain > np.repeat(penalty, n)))
+
+            positions = np.flatnonzero(accepted)
+            if len(positions) == 0:
+                break
+            first = np.r_[True, segment_id[positions][1:] != segment_id[positions][:-1]]
+            is_start.ravel()[positions[first]] = True
+
+        is_start[:, 0] = False
+        return is_start
+
+    def detect_ensemble(self, values):
+        """Ruptures d'un tableau (runs, années, séries) → masque de même forme"""
+        n_runs, n_years, n_series = values.shape
+        flat = values.transpose(0, 2, 1).reshape(-1, n_years)
+        return self.detect(flat).reshape(n_runs, n_series, n_years).transpose(0, 2, 1)
+
+    def report(self, breaks, years, columns, regimes):
+        """Confronte les ruptures détectées (runs, années, séries) à la table des régimes"""
+        years = np.asarray(years)
+        boundaries = np.array(sorted(year for year in regimes if year > years[0]))
+        run_idx, year_idx, col_idx = np.nonzero(breaks)
+        break_years = years[year_idx]
+
+        nearest = boundaries[np.abs(break_years[:, None] - boundaries[None, :]).argmin(axis=1)]
+        detected = pd.DataFrame({
+            'Run': run_idx,
+            'Colonne': np.asarray(columns)[col_idx],
+            'Annee_Rupture': break_years,
+            'Regime_Proche': nearest,
+            'Ecart': break_years - nearest,
+        })
+        detected['Regime_Confirme'] = detected['Ecart'].abs() <= self.tolerance
+
+        # Taux de détection de chaque frontière configurée, par colonne
+        n_runs = breaks.shape[0]
+        near = np.abs(years[:, None] - boundaries[None, :]) <= self.tolerance  # (années, frontières)
+        hits = np.einsum('ryc,yb->rcb', breaks.astype(np.int64), near.astype(np.int64)) > 0
+        rate = hits.sum(axis=0) / n_runs
+        validation = pd.DataFrame(rate, index=list(columns),
+                                  columns=[f"{year} {regimes[year]}" for year in boundaries])
+
+        return detected, validation
+
+
+def main():
+    """Validation des régimes du PCF par détection de ruptures"""
+    analyzer = PCFFinanceAnalyzer()
+    detector = PCFChangePointDetector()
+    columns = ['Adherents', 'Revenus_Total', 'Fonds_Propres', 'Cotisations_Adherents',
+               'Elus_Locaux', 'Sections_Locales', 'Depenses_Personnel']
+    n_runs = 200
+
+    print(f"🔍 Détection de ruptures sur {n_runs} simulations...")
+    values = analyzer.generate_ensemble(n_runs)
+    selected = [analyzer.series_columns.index(col) for col in columns]
+    breaks = detector.detect_ensemble(values[:, :, selected])
+    detected, validation = detector.report(breaks, analyzer.years, columns, analyzer.regimes)
+
+    output_file = 'PCF_detected_breaks.csv'
+    detected.to_csv(output_file, index=False)
+    print(f"💾 Ruptures sauvegardées: {output_file}")
+
+    print(f"\n📐 Taux de détection des frontières de régime (±{detector.tolerance} ans):")
+    print((validation * 100).round(0).T.to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+import copy
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from scipy.optimize import differential_evolution
+
+from Pcommun import PCFFinanceAnalyzer
+
+_worker_analyzer = None
+
+
+def _init_worker(tables):
+    """Initialise un analyseur par processus avec les tables de paramètres de départ"""
+    global _worker_analyzer
+    _worker_analyzer = PCFFinanceAnalyzer()
+    _apply_tables(_worker_analyzer, tables)
+
+
+def _apply_tables(analyzer, tables):
+    """Remplace config, regime_rates, noise_sigmas et events d'un analyseur"""
+    for name, table in tables.items():
+        setattr(analyzer, name, copy.deepcopy(table))
+
+
+def _set_parameter(analyzer, parameter, value):
+    """Affecte une valeur (scalaire ou tableau de candidats) à un paramètre"""
+    kind = parameter[0]
+    if kind == 'config':
+        analyzer.config[parameter[1]] = value
+    elif kind == 'regime':
+        analyzer.regime_rates[parameter[1]][parameter[2]] = value
+    elif kind == 'sigma':
+        analyzer.noise_sigmas[parameter[1]] = value
+    else:
+        raise ValueError(f"Type de paramètre inconnu: {kind}")
+
+
+def _negative_log_likelihood(analyzer, parameters, population, observed, year_index, column_index):
+    """Vraisemblance (bruit multiplicatif gaussien) de chaque candidat, en une génération groupée"""
+    tables = {name: copy.deepcopy(getattr(analyzer, name)) for name in ('config', 'regime_rates', 'noise_sigmas')}
+    try:
+        sigmas = {column: analyzer.noise_sigmas[column] for column in analyzer.noise_sigmas}
+        for column in analyzer.noise_sigmas:
+            analyzer.noise_sigmas[column] = 0.0  # Trajectoires attendues, sans bruit
+
+        for d, parameter in enumerate(parameters):
+            if parameter[0] == 'sigma':
+                sigmas[parameter[1]] = population[:, d]
+            else:
+                _set_parameter(analyzer, parameter, population[:, d][:, None])
+
+        expected = analyzer.generate_batch()
+        expected = np.broadcast_to(expected, (len(population),) + expected.shape[-2:])
+    finally:
+        _apply_tables(analyzer, tables)
+
+    nll = np.zeros(len(population))
+    for j, (column, c) in enumerate(column_index.items()):
+        mu = expected[:, year_index, c]
+        obs = observed[:, j]
+        valid = ~np.isnan(obs)
+        sigma = np.broadcast_to(np.asarray(sigmas[column], dtype=np.float64), (len(population),))[:, None]
+        scale = np.maximum(sigma * np.abs(mu[:, valid]), 1e-12)
+        residual = obs[valid] - mu[:, valid]
+        nll += (np.log(scale) + residual ** 2 / (2 * scale ** 2)).sum(axis=1)
+    return nll
+
+
+def _evaluate_chunk(args):
+    """Évalue un sous-ensemble de la population dans un processus"""
+    return _negative_log_likelihood(_worker_analyzer, *args)
+
+
+class PCFCalibrator:
+    """Calibration des paramètres des simulateurs sur des séries observées"""
+
+    def __init__(self, observed, analyzer=None, parameters=None, columns=None,
+                 popsize=15, maxiter=200, n_jobs=None, seed=0):
+        self.analyzer = analyzer or PCFFinanceAnalyzer()
+        self.observed = observed
+        self.popsize = popsize
+        self.maxiter = maxiter
+        self.n_jobs = n_jobs or os.cpu_count()
+        self.seed = seed
+
+        # Colonnes observées et alignement sur l'axe des années simulées
+        series = self.analyzer.series_columns
+        self.columns = columns or [col for col in observed.columns
+                                   if col in series and observed[col].notna().any()]
+        years = observed['Annee'].to_numpy()
+        keep = np.isin(years, self.analyzer.years)
+        self._year_index = np.searchsorted(self.analyzer.years, years[keep])
+        self._observed = observed.loc[keep, self.columns].to_numpy(dtype=np.float64)
+        self._column_index = {col: series.index(col) for col in self.columns}
+
+        self.parameters = parameters or self.default_parameters()
+        self.bounds = [self._bounds(parameter) for parameter in self.parameters]
+
+    def default_parameters(self):
+        """Bases de config lues par les colonnes observées, leurs taux de régime et sigmas"""
+        parameters = [('config', key) for key in ('budget_base', 'adherents_base')
+                      if set(self.analyzer.config_dependencies.get(key, ())) & set(self.columns)]
+        years = self.analyzer.years[self._year_index]
+        for column in self.analyzer.regime_rates:
+            if column in self.columns:
+                # Seuls les régimes actifs sur une année observée sont identifiables
+                # (même convention que _regime_rate : un régime s'applique après son année de début)
+                starts = sorted(self.analyzer.regime_rates[column])
+                observed_years = years[~np.isnan(self._observed[:, self.columns.index(column)])]
+                active = np.unique(np.maximum(np.searchsorted(starts, observed_years, side='left') - 1, 0))
+                parameters += [('regime', column, starts[k]) for k in active]
+        parameters += [('sigma', column) for column in self.columns if column in self.analyzer.noise_sigmas]
+        return parameters
+
+    def _bounds(self, parameter):
+        """Bornes de recherche d'un paramètre"""
+        if parameter[0] == 'config':
+            value = self.analyzer.config[parameter[1]]
+            return (0.2 * value, 5 * value)
+        if parameter[0] == 'regime':
+            return (-1.0, 1.0)
+        return (0.005, 0.5)
+
+    def _tables(self):
+        return {name: getattr(self.analyzer, name)
+                for name in ('config', 'regime_rates', 'noise_sigmas', 'events')}
+
+    def _objective(self, executor):
+        """Objectif vectorisé : reçoit la population (paramètres, candidats)"""
+        def objective(x):
+            population = np.atleast_2d(x.T)
+            args = (self.parameters, population, self._observed, self._year_index, self._column_index)
+            if executor is None:
+                return _negative_log_likelihood(self.analyzer, *args)
+
+            chunks = np.array_split(population, min(self.n_jobs, len(population)))
+            tasks = [(self.parameters, chunk, self._observed, self._year_index, self._column_index)
+                     for chunk in chunks]
+            return np.concatenate(list(executor.map(_evaluate_chunk, tasks)))
+        return objective
+
+    def fit(self):
+        """Calibre les paramètres et renvoie les tables ajustées"""
+        executor = None
+        if self.n_jobs > 1:
+            executor = ProcessPoolExecutor(max_workers=self.n_jobs, initializer=_init_worker,
+                                           initargs=(self._tables(),))
+        try:
+            result = differential_evolution(self._objective(executor), self.bounds,
+                                            popsize=self.popsize, maxiter=self.maxiter,
+                                            seed=self.seed, vectorized=True, updating='deferred',
+                                            polish=False)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        self.result = result
+        fitted = {name: copy.deepcopy(getattr(self.analyzer, name))
+                  for name in ('config', 'regime_rates', 'noise_sigmas')}
+        fitted_analyzer = PCFFinanceAnalyzer()
+        _apply_tables(fitted_analyzer, fitted)
+        for parameter, value in zip(self.parameters, result.x):
+            _set_parameter(fitted_analyzer, parameter, float(value))
+        return {name: getattr(fitted_analyzer, name) for name in fitted}
+
+    def summary(self, fitted):
+        """Tableau des paramètres initiaux et ajustés"""
+        fitted_analyzer = PCFFinanceAnalyzer()
+        _apply_tables(fitted_analyzer, fitted)
+        return pd.DataFrame([{'Parametre': '/'.join(str(part) for part in parameter),
+                              'Initial': self._read(self.analyzer, parameter),
+                              'Ajuste': self._read(fitted_analyzer, parameter)}
+                             for parameter in self.parameters])
+
+    @staticmethod
+    def _read(analyzer, parameter):
+        if parameter[0] == 'config':
+            return analyzer.config[parameter[1]]
+        if parameter[0] == 'regime':
+            return analyzer.regime_rates[parameter[1]][parameter[2]]
+        return analyzer.noise_sigmas[parameter[1]]
+
+
+def main():
+    """Calibration des simulateurs sur les comptes observés"""
+    import sys
+    from pcf_ingest import PCFAccountsLoader
+
+    paths = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    units = [arg.split('=', 1)[1] for arg in sys.argv[1:] if arg.startswith('--unite=')]
+    if not paths:
+        print("Usage: python pcf_calibrate.py [--unite=k€] comptes_2015.xlsx [comptes_2016.csv ...]")
+        return
+
+    observed = PCFAccountsLoader(unit=units[0] if units else 'M€').load_many(paths)
+    calibrator = PCFCalibrator(observed)
+
+    print(f"🎯 Calibration de {len(calibrator.parameters)} paramètres sur {', '.join(calibrator.columns)}...")
+    fitted = calibrator.fit()
+    print(f"✅ Vraisemblance finale: {calibrator.result.fun:.2f} ({calibrator.result.nfev} évaluations)")
+    print(calibrator.summary(fitted).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from Pcommun import PCFFinanceAnalyzer
+
+
+def _sorted_samples(values):
+    """Échantillons (runs, années, colonnes) → lignes triées contiguës (années x colonnes, runs)"""
+    return np.sort(np.ascontiguousarray(values.transpose(1, 2, 0)).reshape(-1, len(values)), axis=1)
+
+
+def ks_statistic(a, b):
+    """Statistique de Kolmogorov-Smirnov par ligne (échantillons triés sur le dernier axe)"""
+    n_a, n_b = a.shape[-1], b.shape[-1]
+    pooled = np.concatenate([a, b], axis=-1)
+    order = np.argsort(pooled, axis=-1, kind='stable')  # Fusion de deux suites déjà triées
+    gap = np.abs(np.cumsum(np.where(order < n_a, 1.0 / n_a, -1.0 / n_b), axis=-1))
+
+    # Écart évalué à la fin de chaque groupe d'ex aequo seulement
+    ordered = np.take_along_axis(pooled, order, axis=-1)
+    last_of_tie = np.concatenate([ordered[:, 1:] != ordered[:, :-1], np.ones((len(ordered), 1), dtype=bool)], axis=-1)
+    return np.where(last_of_tie, gap, 0.0).max(axis=-1)
+
+
+def _sorted_quantiles(s, levels):
+    """Quantiles (interpolation linéaire) de lignes déjà triées"""
+    position = levels * (s.shape[-1] - 1)
+    lo = np.floor(position).astype(np.int64)
+    hi = np.minimum(lo + 1, s.shape[-1] - 1)
+    return s[:, lo] * (1 - (position - lo)) + s[:, hi] * (position - lo)
+
+
+def wasserstein_distance(a, b, n_quantiles=99):
+    """Distance de Wasserstein-1 par ligne (échantillons triés), sur une grille de quantiles"""
+    levels = np.linspace(0.005, 0.995, n_quantiles)
+    return np.abs(_sorted_quantiles(a, levels) - _sorted_quantiles(b, levels)).mean(axis=-1)
+
+
+class PCFDatasetComparer:
+    """Comparaison de deux jeux de données ou ensembles (CSV ou .npy projeté en mémoire)
+
+    Les deux sources sont alignées par indices sur leurs années et colonnes
+    communes (sans fusion pandas), puis comparées par passes vectorisées sur des
+    blocs de colonnes : écarts absolus et relatifs des moyennes, et, pour les
+    ensembles, décalage des distributions (KS, Wasserstein, rapport d'écarts-types).
+    """
+
+    def __init__(self, analyzer=None, column_block=8):
+        self.analyzer = analyzer or PCFFinanceAnalyzer()
+        self.column_block = column_block
+
+    def load(self, path):
+        """Charge une source : (années, colonnes, valeurs (runs, années, colonnes))"""
+        if path.endswith('.npy'):
+            values = np.load(path, mmap_mode='r')
+            meta_path = os.path.splitext(path)[0] + '.json'
+            if os.path.exists(meta_path):
+                with open(meta_path, encoding='utf-8') as f:
+                    meta = json.load(f)
+                years, columns = np.asarray(meta['annees']), meta['colonnes']
+            else:
+                years, columns = self.analyzer.years, self.analyzer.series_columns
+            if values.ndim == 2:
+                values = values[None]
+            return years, list(columns), values
+
+        df = pd.read_csv(path)
+        columns = [col for col in df.columns if col != 'Annee']
+        return df['Annee'].to_numpy(), columns, df[columns].to_numpy(dtype=np.float64)[None]
+
+    def compare(self, source_a, source_b):
+        """Compare deux sources (chemins ou triplets déjà chargés)"""
+        years_a, columns_a, values_a = self.load(source_a) if isinstance(source_a, str) else source_a
+        years_b, columns_b, values_b = self.load(source_b) if isinstance(source_b, str) else source_b
+
+        years, ia, ib = np.intersect1d(years_a, years_b, return_indices=True)
+        columns = [col for col in columns_a if col in columns_b]
+        ca = np.array([columns_a.index(col) for col in columns])
+        cb = np.array([columns_b.index(col) for col in columns])
+        ensemble = len(values_a) > 1 and len(values_b) > 1
+
+        stats = {name: np.full((len(years), len(columns)), np.nan)
+                 for name in ('Moyenne_A', 'Moyenne_B', 'KS', 'Wasserstein', 'Rapport_Ecarts_Types')}
+        for start in range(0, len(columns), self.column_block):
+            block = slice(start, start + self.column_block)
+            # Lecture par blocs de colonnes : seules ces colonnes quittent le disque
+            a = np.asarray(values_a[..., ca[block]][:, ia], dtype=np.float64)
+            b = np.asarray(values_b[..., cb[block]][:, ib], dtype=np.float64)
+            stats['Moyenne_A'][:, block] = a.mean(axis=0)
+            stats['Moyenne_B'][:, block] = b.mean(axis=0)
+            if ensemble:
+                shape = a.shape[1:]
+                sorted_a, sorted_b = _sorted_samples(a), _sorted_samples(b)
+                stats['KS'][:, block] = ks_statistic(sorted_a, sorted_b).reshape(shape)
+                stats['Wasserstein'][:, block] = wasserstein_distance(sorted_a, sorted_b).reshape(shape)
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    stats['Rapport_Ecarts_Types'][:, block] = b.std(axis=0, ddof=1) / a.std(axis=0, ddof=1)
+
+        stats['Ecart'] = stats['Moyenne_B'] - stats['Moyenne_A']
+        with np.errstate(divide='ignore', invalid='ignore'):
+            stats['Ecart_Relatif'] = np.where(stats['Moyenne_A'] != 0,
+                                              stats['Ecart'] / np.abs(stats['Moyenne_A']), np.nan)
+        return PCFComparison(years, columns, stats, self.analyzer)
+
+
+class PCFComparison:
+    """Résultat d'une comparaison (années, colonnes) et rapports associés"""
+
+    def __init__(self, years, columns, stats, analyzer):
+        self.years = years
+        self.columns = columns
+        self.stats = stats
+        self.analyzer = analyzer
+
+    def frame(self):
+        """Écarts par colonne et par année, au format long"""
+        df = pd.DataFrame({name: values.ravel() for name, values in self.stats.items()})
+        df.insert(0, 'Colonne', np.tile(self.columns, len(self.years)))
+        df.insert(0, 'Annee', np.repeat(self.years, len(self.columns)))
+        return df
+
+    def summary(self):
+        """Rapport compact par colonne : écart maximal, année, écart relatif moyen, décalage maximal"""
+        delta = np.abs(self.stats['Ecart'])
+        worst = np.nanargmax(np.where(np.isnan(delta), -np.inf, delta), axis=0)
+        with np.errstate(invalid='ignore'):
+            summary = pd.DataFrame({
+                'Colonne': self.columns,
+                'Ecart_Max': delta[worst, np.arange(len(self.columns))],
+                'Annee_Ecart_Max': self.years[worst],
+                'Ecart_Relatif_Moyen': np.nanmean(np.abs(self.stats['Ecart_Relatif']), axis=0),
+                'KS_Max': np.nanmax(self.stats['KS'], axis=0) if not np.isnan(self.stats['KS']).all() else np.nan,
+            })
+        return summary.sort_values('Ecart_Relatif_Moyen', ascending=False).reset_index(drop=True)
+
+    def _mean_frame(self, name):
+        df = pd.DataFrame(self.stats[name], columns=self.columns)
+        df.insert(0, 'Annee', self.years)
+        return df
+
+    def insights_shift(self):
+        """Déplacement des insights entre les deux trajectoires moyennes"""
+        series = set(self.analyzer.series_columns)
+        if not series.issubset(self.columns):
+            return pd.DataFrame(columns=['Insight', 'A', 'B', 'Ecart'])
+        a = self.analyzer.compute_financial_insights(self._mean_frame('Moyenne_A'))
+        b = self.analyzer.compute_financial_insights(self._mean_frame('Moyenne_B'))
+        return pd.DataFrame([{'Insight': key, 'A': a[key], 'B': b[key], 'Ecart': b[key] - a[key]} for key in a])
+
+    def plot_panels(self, output_file, top=6):
+        """Panneaux de différence des colonnes les plus modifiées"""
+        import matplotlib.pyplot as plt
+
+        columns = self.summary()['Colonne'].head(top).tolist()
+        plt.style.use('seaborn-v0_8')
+        fig, axes = plt.subplots(-(-len(columns) // 2), 2, figsize=(16, 4 * -(-len(columns) // 2)), squeeze=False)
+        for ax, column in zip(axes.ravel(), columns):
+            j = self.columns.index(column)
+            self.analyzer._plot_line(ax, self.years, self.stats['Moyenne_A'][:, j], label='A',
+                                     linewidth=2, color='#D50000')
+            self.analyzer._plot_line(ax, self.years, self.stats['Moyenne_B'][:, j], label='B',
+                                     linewidth=2, color='#FF8A80')
+            ax.fill_between(self.years, self.stats['Moyenne_A'][:, j], self.stats['Moyenne_B'][:, j],
+                            color='#FF5252', alpha=0.2)
+            ax.set_title(column, fontsize=12, fontweight='bold')
+            ax.legend()
+            ax.grid(True, alpha=0.3)
+        for ax in axes.ravel()[len(columns):]:
+            ax.set_visible(False)
+        fig.tight_layout()
+        fig.savefig(output_file, dpi=150, bbox_inches='tight')
+        plt.close(fig)
+
+
+def main():
+    """Comparaison de deux jeux de données ou ensembles du PCF"""
+    import sys
+    import time
+
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    if len(args) != 2:
+        print("Usage: python pcf_compare.py A.csv|A.npy B.csv|B.npy [--panneaux]")
+        return
+
+    t0 = time.perf_counter()
+    comparison = PCFDatasetComparer().compare(*args)
+    print(f"🔍 Comparaison de {len(comparison.columns)} colonnes sur {len(comparison.years)} années "
+          f"en {time.perf_counter() - t0:.2f} s")
+
+    output_file = 'PCF_comparaison.csv'
+    comparison.frame().to_csv(output_file, index=False)
+    print(f"💾 Écarts détaillés sauvegardés: {output_file}")
+
+    print("\n📊 Colonnes les plus modifiées:")
+    print(comparison.summary().head(10).round(3).to_string(index=False))
+
+    shift = comparison.insights_shift()
+    if len(shift):
+        print("\n💡 Déplacement des insights:")
+        print(shift.round(2).to_string(index=False))
+
+    if '--panneaux' in sys.argv:
+        comparison.plot_panels('PCF_comparaison_panneaux.png')
+        print("🖼️ Panneaux de différence sauvegardés: PCF_comparaison_panneaux.png")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+from pcf_store import PCFYearStore
+
+
+def fingerprint(df):
+    """Empreinte du contenu d'un jeu de données (invalide le cube si les données changent)"""
+    digest = hashlib.sha1(repr(list(df.columns)).encode())
+    digest.update(np.ascontiguousarray(df.to_numpy(dtype=np.float64)).tobytes())
+    return digest.hexdigest()
+
+
+class PCFAggregateCube:
+    """Agrégats précalculés par décennie, régime et cycle électoral
+
+    Les clés de groupe sont monotones dans le temps : chaque niveau est réduit en
+    une passe (reduceat) sur toutes les colonnes, puis les requêtes sont de simples
+    lectures d'indices. Des sommes préfixées donnent aussi les moyennes sur
+    n'importe quelle plage d'années en O(1).
+    """
+
+    STATISTICS = ('somme', 'moyenne', 'min', 'max', 'effectif')
+    PRE_CYCLE = -1    # Clé des années antérieures au premier cycle électoral
+
+    def __init__(self, df, regimes, legislative_years):
+        if isinstance(df, PCFYearStore):
+            self.years, self.columns = df.years, list(df.columns)
+            self.values = np.asarray(df.values, dtype=np.float64)
+        else:
+            self.years = df['Annee'].to_numpy()
+            self.columns = [col for col in df.columns if col != 'Annee']
+            self.values = df[self.columns].to_numpy(dtype=np.float64)
+        self._column_index = {col: j for j, col in enumerate(self.columns)}
+        self._year_offset = int(self.years[0])
+        self._contiguous = bool((np.diff(self.years) == 1).all())
+
+        # Sommes préfixées pour les plages d'années arbitraires
+        self._prefix = np.vstack([np.zeros(len(self.columns)), np.cumsum(self.values, axis=0)])
+
+        # Clés de groupe dérivées de la table des régimes et du calendrier électoral :
+        # un régime s'applique après son année de début (même convention que les simulateurs),
+        # les années antérieures aux premières législatives ont la clé PRE_CYCLE
+        regime_starts = np.array(sorted(regimes))
+        cycle_starts = np.array(sorted(legislative_years))
+        cycle = np.searchsorted(cycle_starts, self.years, side='right') - 1
+        keys = {
+            'decennie': self.years // 10 * 10,
+            'regime': regime_starts[np.maximum(np.searchsorted(regime_starts, self.years, side='left') - 1, 0)],
+            'cycle_electoral': np.where(cycle >= 0, cycle_starts[np.maximum(cycle, 0)], self.PRE_CYCLE),
+        }
+        self.labels = {'regime': dict(regimes),
+                       'cycle_electoral': {self.PRE_CYCLE: "Avant les premières législatives"}}
+
+        self.levels = {level: self._reduce(group_keys) for level, group_keys in keys.items()}
+
+    def _reduce(self, group_keys):
+        """Réduction groupée de toutes les colonnes en une passe"""
+        starts = np.flatnonzero(np.r_[True, group_keys[1:] != group_keys[:-1]])
+        counts = np.diff(np.r_[starts, len(group_keys)])
+        sums = np.add.reduceat(self.values, starts, axis=0)
+        return {
+            'cles': group_keys[starts],
+            'index': {int(key): g for g, key in enumerate(group_keys[starts])},
+            'somme': sums,
+            'moyenne': sums / counts[:, None],
+            'min': np.minimum.reduceat(self.values, starts, axis=0),
+            'max': np.maximum.reduceat(self.values, starts, axis=0),
+            'effectif': counts,
+        }
+
+    def query(self, level, key, column, statistic='moyenne'):
+        """Agrégat d'une colonne pour un groupe (lecture O(1))"""
+        cube = self.levels[level]
+        g = cube['index'][int(key)]
+        if statistic == 'effectif':
+            return int(cube['effectif'][g])
+        return cube[statistic][g, self._column_index[column]]
+
+    def _rows(self, start, end):
+        """Lignes [début, fin[ couvrant les années [start, end] (KeyError hors des années du cube)"""
+        first, last = int(self.years[0]), int(self.years[-1])
+        if not first <= start <= end <= last:
+            raise KeyError(f"Plage {start}-{end} hors des années du cube ({first}-{last})")
+        if self._contiguous:
+            return int(start) - self._year_offset, int(end) - self._year_offset + 1
+        return (int(np.searchsorted(self.years, start, side='left')),
+                int(np.searchsorted(self.years, end, side='right')))
+
+    def value(self, year, column):
+        """Valeur d'une colonne pour une année (lecture O(1))"""
+        row, _ = self._rows(year, year)
+        if self.years[row] != year:
+            raise KeyError(f"Année absente du cube: {year}")
+        return self.values[row, self._column_index[column]]
+
+    def range_sum(self, start, end, column):
+        """Somme d'une colonne sur [start, end] par sommes préfixées"""
+        lo, hi = self._rows(start, end)
+        j = self._column_index[column]
+        return self._prefix[hi, j] - self._prefix[lo, j]
+
+    def range_mean(self, start, end, column):
+        """Moyenne d'une colonne sur [start, end] en O(1)"""
+        lo, hi = self._rows(start, end)
+        return self.range_sum(start, end, column) / (hi - lo)
+
+    def first_year(self, start):
+        """Première année disponible à partir de start"""
+        lo = int(np.searchsorted(self.years, start, side='left'))
+        if lo == len(self.years):
+            raise KeyError(f"Aucune année du cube à partir de {start}")
+        return int(self.years[lo])
+
+    def frame(self, level, statistic='moyenne'):
+        """Agrégats d'un niveau au format DataFrame"""
+        cube = self.levels[level]
+        if statistic == 'effectif':
+            return pd.DataFrame({level.capitalize(): cube['cles'], 'Effectif': cube['effectif']})
+        df = pd.DataFrame(cube[statistic], columns=self.columns)
+        df.insert(0, level.capitalize(), cube['cles'])
+        if level in self.labels:
+            df.insert(1, 'Libelle', [self.labels[level].get(int(key), '') for key in cube['cles']])
+        return df
+
+
+def main():
+    """Agrégats du PCF par décennie, régime et cycle électoral"""
+    from Pcommun import PCFFinanceAnalyzer
+
+    analyzer = PCFFinanceAnalyzer()
+    df = analyzer.generate_financial_data()
+    cube = analyzer.aggregate_cube(df)
+
+    for level in cube.levels:
+        output_file = f'PCF_aggregats_{level}.csv'
+        cube.frame(level).to_csv(output_file, index=False)
+        print(f"💾 Agrégats par {level.replace('_', ' ')} sauvegardés: {output_file}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+import numpy as np
+import pandas as pd
+
+from pcf_store import PCFYearStore
+
+# Colonnes exprimées en montants (les effectifs et ratios ne sont pas déflatés)
+MONETARY_PREFIXES = ('Revenus_', 'Depenses_', 'Investissement_')
+MONETARY_COLUMNS = {'Cotisations_Adherents', 'Financement_Public', 'Dons_Sympathisants', 'Fonds_Propres'}
+
+# Inflation annuelle approximative par période (clé: année de début), à défaut d'une table INSEE
+DEFAULT_INFLATION = {1920: 0.06, 1927: 0.01, 1931: -0.04, 1936: 0.15, 1939: 0.20, 1945: 0.50,
+                     1949: 0.10, 1952: 0.03, 1957: 0.08, 1960: 0.04, 1969: 0.06, 1973: 0.11,
+                     1981: 0.12, 1984: 0.05, 1986: 0.03, 1991: 0.02, 2022: 0.05, 2024: 0.02}
+
+
+def monetary_columns(columns):
+    """Colonnes monétaires parmi une liste de colonnes"""
+    return [col for col in columns if col.startswith(MONETARY_PREFIXES) or col in MONETARY_COLUMNS]
+
+
+class PCFDeflator:
+    """Passage en euros constants de toutes les colonnes monétaires
+
+    La table d'indices (Annee, Indice[, Conversion]) est chargée une fois ; les
+    facteurs sont alignés sur l'axe des années et mis en cache par plage
+    d'années, puis appliqués à toutes les colonnes monétaires en une seule
+    opération diffusée. Conversion convertit l'unité d'origine en euros
+    (anciens francs, francs) ; elle vaut 1 pour des montants déjà en euros.
+    """
+
+    def __init__(self, table, base_year=2025):
+        table = table.sort_values('Annee')
+        self.table_years = table['Annee'].to_numpy()
+        self.index = table['Indice'].to_numpy(dtype=np.float64)
+        self.conversion = (table['Conversion'].to_numpy(dtype=np.float64) if 'Conversion' in table
+                           else np.ones(len(table)))
+        if base_year not in set(self.table_years.tolist()):
+            raise ValueError(f"Année de base absente de la table d'indices: {base_year}")
+        self.base_year = base_year
+        self._base_index = self.index[np.searchsorted(self.table_years, base_year)]
+        self._factors = {}
+
+    @classmethod
+    def from_csv(cls, path, base_year=2025):
+        """Charge une table d'indices (Annee, Indice[, Conversion])"""
+        return cls(pd.read_csv(path), base_year)
+
+    @classmethod
+    def default(cls, start_year=1920, end_year=2025, base_year=2025):
+        """Table approximative construite à partir de l'inflation par période"""
+        years = np.arange(start_year, end_year + 1)
+        starts = np.array(sorted(DEFAULT_INFLATION))
+        rates = np.array([DEFAULT_INFLATION[start] for start in starts])
+        inflation = rates[np.maximum(np.searchsorted(starts, years, side='right') - 1, 0)]
+        index = 100 * np.cumprod(np.r_[1.0, 1 + inflation[1:]])
+        return cls(pd.DataFrame({'Annee': years, 'Indice': index}), base_year)
+
+    def factors(self, years):
+        """Facteurs euros constants par année (mis en cache par plage d'années)"""
+        years = np.asarray(years)
+        key = (int(years[0]), int(years[-1]), len(years))
+        if key not in self._factors:
+            missing = np.setdiff1d(years, self.table_years)
+            if len(missing):
+                raise ValueError(f"Années absentes de la table d'indices: {missing.tolist()}")
+            rows = np.searchsorted(self.table_years, years)
+            factors = self.conversion[rows] * self._base_index / self.index[rows]
+            factors.flags.writeable = False
+            self._factors[key] = factors
+        return self._factors[key]
+
+    def scale(self, years, columns):
+        """Matrice de facteurs (années, colonnes) : 1 pour les colonnes non monétaires"""
+        monetary = np.isin(columns, monetary_columns(columns))
+        return np.where(monetary[None, :], self.factors(years)[:, None], 1.0)
+
+    def deflate(self, values, years, columns):
+        """Tableau (..., années, colonnes) en euros constants, en une opération diffusée"""
+        return values * self.scale(years, columns)
+
+    def frame(self, df):
+        """DataFrame en euros constants"""
+        store = PCFYearStore.from_frame(df)
+        return PCFYearStore(store.years, self.deflate(store.values, store.years, store.columns),
+                            store.columns).to_frame()
+
+    def view(self, data):
+        """Vue paresseuse en euros constants d'un DataFrame ou d'un stockage"""
+        return PCFRealView(PCFYearStore.from_frame(data), self)
+
+
+class PCFRealView:
+    """Vue en euros constants : chaque colonne est déflatée à la lecture, sans copie des données brutes"""
+
+    def __init__(self, store, deflator):
+        self.store = store
+        self.deflator = deflator
+        self.years = store.years
+        self.columns = store.columns
+        self._monetary = set(monetary_columns(store.columns))
+
+    def __len__(self):
+        return len(self.store)
+
+    def __contains__(self, year):
+        return year in self.store
+
+    def __getitem__(self, column):
+        values = self.store[column]
+        if column in self._monetary:
+            return values * self.deflator.factors(self.years)
+        return values
+
+    def at(self, year, column):
+        value = self.store.at(year, column)
+        if column in self._monetary:
+            return value * self.deflator.factors(self.years)[self.store.row(year)]
+        return value
+
+    def slice(self, start=None, end=None):
+        """Plage d'années (vue sur le stockage brut)"""
+        return PCFRealView(self.store.slice(start, end), self.deflator)
+
+    def materialize(self):
+        """Stockage en euros constants (une seule opération diffusée)"""
+        return PCFYearStore(self.years, self.deflator.deflate(self.store.values, self.years, self.columns),
+                            self.columns)
+
+    def to_frame(self, columns=None):
+        return self.materialize().to_frame(columns)
+
+
+def main():
+    """Finances du PCF en euros constants"""
+    import sys
+    from Pcommun import PCFFinanceAnalyzer
+
+    analyzer = PCFFinanceAnalyzer()
+    if len(sys.argv) > 1:
+        deflator = PCFDeflator.from_csv(sys.argv[1], base_year=analyzer.end_year)
+    else:
+        deflator = PCFDeflator.default(analyzer.start_year, analyzer.end_year, base_year=analyzer.end_year)
+        print("⚠️ Table d'indices approximative (passer un CSV Annee, Indice[, Conversion] en argument)")
+
+    df = analyzer.generate_financial_data()
+    real = deflator.frame(df)
+
+    output_file = f'PCF_financial_data_{analyzer.start_year}_{analyzer.end_year}_euros_constants.csv'
+    real.to_csv(output_file, index=False)
+    print(f"💾 Données en euros constants {deflator.base_year} sauvegardées: {output_file}")
+
+    nominal = analyzer.compute_financial_insights(df)
+    constant = analyzer.compute_financial_insights(real)
+    print(f"\n📊 Évolution des revenus (1945-{analyzer.end_year}): {nominal['evolution_revenus']:.1f}% (courants) "
+          f"→ {constant['evolution_revenus']:.1f}% (constants)")
+    print(f"📊 Revenus moyens: {nominal['revenus_moyens']:.2f} M€ courants "
+          f"→ {constant['revenus_moyens']:.2f} M€ {deflator.base_year}")
+
+
+if __name__ == "__main__":
+    main()
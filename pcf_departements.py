@@ -0,0 +1,196 @@
+import numpy as np
+import pandas as pd
+
+from Pcommun import PCFFinanceAnalyzer
+from pcf_stats import PCFEnsembleAccumulator
+
+# Départements par région (ordre contigu : chaque région est un segment de l'axe des départements)
+DEPARTEMENTS_PAR_REGION = {
+    "Auvergne-Rhône-Alpes": ['01', '03', '07', '15', '26', '38', '42', '43', '63', '69', '73', '74'],
+    "Bourgogne-Franche-Comté": ['21', '25', '39', '58', '70', '71', '89', '90'],
+    "Bretagne": ['22', '29', '35', '56'],
+    "Centre-Val de Loire": ['18', '28', '36', '37', '41', '45'],
+    "Corse": ['2A', '2B'],
+    "Grand Est": ['08', '10', '51', '52', '54', '55', '57', '67', '68', '88'],
+    "Hauts-de-France": ['02', '59', '60', '62', '80'],
+    "Île-de-France": ['75', '77', '78', '91', '92', '93', '94', '95'],
+    "Normandie": ['14', '27', '50', '61', '76'],
+    "Nouvelle-Aquitaine": ['16', '17', '19', '23', '24', '33', '40', '47', '64', '79', '86', '87'],
+    "Occitanie": ['09', '11', '12', '30', '31', '32', '34', '46', '48', '65', '66', '81', '82'],
+    "Pays de la Loire": ['44', '49', '53', '72', '85'],
+    "Provence-Alpes-Côte d'Azur": ['04', '05', '06', '13', '83', '84'],
+    "Outre-mer": ['971', '972', '973', '974', '976'],
+}
+
+# Bastions historiques (banlieue rouge, bassin minier, Centre, Limousin, Midi)
+BASTIONS = {'92', '93', '94', '95', '59', '62', '03', '18', '19', '23', '87', '24', '13', '76', '30', '974'}
+
+
+class PCFDepartementPanel:
+    """Résultat départemental d'une simulation (départements, années, séries)
+
+    Les sommes préfixées sur les axes départements et années sont calculées une
+    fois : tout total par département, région (segment contigu) et plage
+    d'années se lit ensuite en O(1), sans resimuler.
+    """
+
+    def __init__(self, values, model):
+        self.values = values
+        self.model = model
+        self.years = model.years
+        self.columns = model.COLUMNS
+        self._column_index = {col: j for j, col in enumerate(self.columns)}
+
+        prefix = np.zeros((values.shape[0] + 1, values.shape[1] + 1, values.shape[2]))
+        prefix[1:, 1:] = values.cumsum(axis=0).cumsum(axis=1)
+        self._prefix = prefix
+
+    def _year_rows(self, start, end):
+        """Lignes [début, fin[ des années [start, end] (KeyError hors des années simulées)"""
+        first, last = int(self.years[0]), int(self.years[-1])
+        start = first if start is None else int(start)
+        end = last if end is None else int(end)
+        if not first <= start <= end <= last:
+            raise KeyError(f"Plage {start}-{end} hors des années simulées ({first}-{last})")
+        return start - first, end - first + 1
+
+    def total(self, column, start=None, end=None, region=None, departement=None):
+        """Total d'une série sur une plage d'années, pour un département, une région ou la France"""
+        lo, hi = self.model.segment(region, departement)
+        y0, y1 = self._year_rows(start, end)
+        p = self._prefix[..., self._column_index[column]]
+        return p[hi, y1] - p[lo, y1] - p[hi, y0] + p[lo, y0]
+
+    def national(self):
+        """Totaux nationaux (années, séries) par réduction sur les départements"""
+        return self.values.sum(axis=0)
+
+    def frame(self, level='departement', year=None):
+        """Tableau des valeurs par département, région ou pour la France (toutes années ou une seule)"""
+        if level == 'departement':
+            values, keys = self.values, self.model.departements
+        elif level == 'region':
+            values, keys = self.model.rollup(self.values, level), self.model.regions
+        elif level == 'national':
+            values, keys = self.national()[None], ['France']
+        else:
+            raise ValueError(f"Niveau d'agrégation inconnu: {level}")
+        if year is not None:
+            row, _ = self._year_rows(year, year)
+            df = pd.DataFrame(values[:, row, :], columns=self.columns)
+            df.insert(0, level.capitalize(), keys)
+            return df
+
+        n_keys, n_years = values.shape[:2]
+        df = pd.DataFrame(values.reshape(n_keys * n_years, -1), columns=self.columns)
+        df.insert(0, 'Annee', np.tile(self.years, n_keys))
+        df.insert(0, level.capitalize(), np.repeat(keys, n_years))
+        return df
+
+
+class PCFDepartementModel:
+    """Simulation hiérarchique départements → régions → France
+
+    Les totaux nationaux de l'analyseur sont répartis entre départements selon des
+    parts structurelles (bastions plus résistants au déclin après 1978) perturbées
+    d'un bruit log-normal, puis renormalisées : la somme des départements
+    reproduit exactement les colonnes nationales existantes.
+    """
+
+    COLUMNS = ['Sections_Locales', 'Mairies', 'Elus_Locaux', 'Revenus_Municipaux']
+
+    def __init__(self, analyzer=None, sigma=0.15, bastion_weight=3.0, resilience=0.01,
+                 concentration=50.0, seed=0):
+        self.analyzer = analyzer or PCFFinanceAnalyzer()
+        self.years = self.analyzer.years
+        self.sigma = sigma
+
+        self.regions = list(DEPARTEMENTS_PAR_REGION)
+        self.departements = [dep for region in self.regions for dep in DEPARTEMENTS_PAR_REGION[region]]
+        sizes = [len(DEPARTEMENTS_PAR_REGION[region]) for region in self.regions]
+        self.region_bounds = np.concatenate([[0], np.cumsum(sizes)])
+        self._departement_index = {dep: d for d, dep in enumerate(self.departements)}
+        self._region_index = {region: r for r, region in enumerate(self.regions)}
+        self._columns = [self.analyzer.series_columns.index(col) for col in self.COLUMNS]
+
+        # Parts structurelles (départements, années), tirées une fois avec une graine propre
+        rng = np.random.RandomState(seed)
+        bastion = np.array([dep in BASTIONS for dep in self.departements])
+        alpha = concentration * np.where(bastion, bastion_weight, 1.0) / len(self.departements)
+        logits = (np.log(rng.dirichlet(alpha))[:, None] +
+                  resilience * bastion[:, None] * np.maximum(0, self.years - 1978)[None, :])
+        shares = np.exp(logits - logits.max(axis=0))
+        self.shares = shares / shares.sum(axis=0)
+
+    def segment(self, region=None, departement=None):
+        """Bornes [lo, hi[ sur l'axe des départements"""
+        if departement is not None:
+            d = self._departement_index[departement]
+            return d, d + 1
+        if region is not None:
+            r = self._region_index[region]
+            return self.region_bounds[r], self.region_bounds[r + 1]
+        return 0, len(self.departements)
+
+    def disaggregate(self, national):
+        """Répartit des totaux (..., années, séries) en (..., départements, années, séries)"""
+        national = np.asarray(national)
+        shape = national.shape[:-2] + (len(self.departements),) + national.shape[-2:]
+        weights = self.shares[:, :, None] * np.random.lognormal(0.0, self.sigma, size=shape)
+        weights /= weights.sum(axis=-3, keepdims=True)
+        return national[..., None, :, :] * weights
+
+    def rollup(self, values, level='region'):
+        """Agrège (..., départements, années, séries) par région ou au niveau national"""
+        if level == 'region':
+            return np.add.reduceat(values, self.region_bounds[:-1], axis=-3)
+        if level == 'national':
+            return values.sum(axis=-3)
+        raise ValueError(f"Niveau d'agrégation inconnu: {level}")
+
+    def simulate(self, df):
+        """Répartition départementale d'un jeu de données national"""
+        national = df[self.COLUMNS].to_numpy(dtype=np.float64)
+        return PCFDepartementPanel(self.disaggregate(national), self)
+
+    def iter_ensemble(self, n_runs, chunk_size=50, seed=None, dtype=np.float32):
+        """Ensemble départemental par blocs (runs, départements, années, séries) à mémoire bornée"""
+        for chunk in self.analyzer.iter_ensemble(n_runs, chunk_size=chunk_size, seed=seed):
+            yield self.disaggregate(chunk[..., self._columns]).astype(dtype, copy=False)
+
+    def summarize_ensemble(self, n_runs, chunk_size=50, seed=None, quantiles=(0.05, 0.5, 0.95)):
+        """Statistiques d'ensemble par département, en flux (sans conserver les réalisations)"""
+        columns = [f"{dep}:{col}" for dep in self.departements for col in self.COLUMNS]
+        accumulator = PCFEnsembleAccumulator(self.years, columns, quantiles)
+        for chunk in self.iter_ensemble(n_runs, chunk_size=chunk_size, seed=seed):
+            # (runs, départements, années, séries) → (runs, années, départements x séries)
+            accumulator.update(chunk.transpose(0, 2, 1, 3).reshape(len(chunk), len(self.years), -1))
+        return accumulator
+
+
+def main():
+    """Simulation départementale des finances et de l'implantation du PCF"""
+    model = PCFDepartementModel()
+    df = model.analyzer.generate_financial_data()
+    panel = model.simulate(df)
+
+    gap = np.abs(panel.national() - df[model.COLUMNS].to_numpy()).max()
+    print(f"🗺️ {len(model.departements)} départements, {len(model.regions)} régions "
+          f"(écart maximal au national: {gap:.2e})")
+
+    output_file = f'PCF_departements_{model.analyzer.start_year}_{model.analyzer.end_year}.csv'
+    panel.frame().to_csv(output_file, index=False)
+    print(f"💾 Données départementales sauvegardées: {output_file}")
+
+    for year in (1977, 2020):
+        top = panel.frame(year=year).nlargest(5, 'Elus_Locaux')
+        print(f"\n🏛️ Premiers départements par élus locaux en {year}:")
+        print(top[['Departement', 'Elus_Locaux', 'Mairies']].round(0).to_string(index=False))
+
+    share = panel.total('Revenus_Municipaux', 2000, 2025, region="Île-de-France") / \
+        panel.total('Revenus_Municipaux', 2000, 2025)
+    print(f"\n📍 Part de l'Île-de-France dans les revenus municipaux (2000-2025): {share:.1%}")
+
+
+if __name__ == "__main__":
+    main()
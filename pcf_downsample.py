@@ -0,0 +1,70 @@
+import numpy as np
+
+
+def minmax_indices(y, n_bins):
+    """Indices min/max par bloc (une colonne de pixels par bloc), extrémités incluses"""
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n_bins <= 0 or n <= 2 * n_bins:
+        return np.arange(n)
+
+    # Blocs de taille égale, complétés avec la dernière valeur
+    size = int(np.ceil(n / n_bins))
+    padded = np.concatenate([y, np.full(size * n_bins - n, y[-1])]).reshape(n_bins, size)
+    offsets = np.arange(n_bins) * size
+
+    indices = np.concatenate([[0, n - 1],
+                              offsets + np.argmin(padded, axis=1),
+                              offsets + np.argmax(padded, axis=1)])
+    return np.unique(np.minimum(indices, n - 1))
+
+
+def lttb_indices(x, y, n_out):
+    """Indices retenus par Largest-Triangle-Three-Buckets"""
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # Bornes des seaux intérieurs (le premier et le dernier point sont conservés)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    selected = np.empty(n_out, dtype=int)
+    selected[0], selected[-1] = 0, n - 1
+
+    # Moyenne du seau suivant, précalculée pour tous les seaux
+    cum_x = np.concatenate([[0.0], np.cumsum(x)])
+    cum_y = np.concatenate([[0.0], np.cumsum(y)])
+    next_start = np.append(edges[1:-1], n - 1)
+    next_end = np.append(edges[2:], n)
+    counts = next_end - next_start
+    avg_x = (cum_x[next_end] - cum_x[next_start]) / counts
+    avg_y = (cum_y[next_end] - cum_y[next_start]) / counts
+
+    previous = 0
+    for bucket in range(n_out - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        bx, by = x[start:end], y[start:end]
+        area = np.abs((x[previous] - avg_x[bucket]) * (by - y[previous]) -
+                      (x[previous] - bx) * (avg_y[bucket] - y[previous]))
+        previous = start + int(np.argmax(area))
+        selected[bucket + 1] = previous
+
+    return selected
+
+
+def downsample_xy(x, y, max_points, method="minmax"):
+    """Réduit une courbe à au plus ~max_points sommets en préservant sa forme"""
+    x = np.asarray(x)
+    y = np.asarray(y)
+    if max_points is None or len(y) <= max_points:
+        return x, y
+
+    if method == "minmax":
+        indices = minmax_indices(y, max(1, max_points // 2 - 1))
+    elif method == "lttb":
+        indices = lttb_indices(x, y, max_points)
+    else:
+        raise ValueError(f"Méthode de sous-échantillonnage inconnue: {method}")
+
+    return x[indices], y[indices]
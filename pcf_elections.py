@@ -0,0 +1,108 @@
+import numpy as np
+import pandas as pd
+
+
+class PCFElectionCalendar:
+    """Calendrier électoral typé, compilé en masques et indices par axe d'années
+
+    Chaque scrutin est un enregistrement (année, type, majeur). Le calendrier est
+    compilé une seule fois par axe d'années en masques booléens et en tableaux
+    d'indices, que les simulateurs et le moteur d'événements lisent par sélection
+    vectorisée.
+    """
+
+    TYPES = ('municipales', 'legislatives', 'presidentielles', 'europeennes')
+
+    # Scrutins par type ; les législatives majeures pèsent sur les dépenses et le solde du PCF
+    DEFAULT = {
+        'municipales': [1935, 1945, 1953, 1959, 1965, 1971, 1977, 1983, 1989, 1995, 2001, 2008, 2014, 2020],
+        'legislatives': [1924, 1928, 1932, 1936, 1945, 1946, 1951, 1956, 1958, 1962, 1967, 1968, 1973,
+                         1978, 1981, 1986, 1988, 1993, 1997, 2002, 2007, 2012, 2017, 2022],
+        'presidentielles': [1965, 1969, 1974, 1981, 1988, 1995, 2002, 2007, 2012, 2017, 2022],
+        'europeennes': [1979, 1984, 1989, 1994, 1999, 2004, 2009, 2014, 2019, 2024],
+    }
+    DEFAULT_MAJOR = [1936, 1945, 1956, 1968, 1978, 1981, 1997, 2002, 2012, 2017, 2022]
+
+    def __init__(self, records):
+        records = list(records)
+        unknown = sorted({kind for _, kind, _ in records} - set(self.TYPES))
+        if unknown:
+            raise ValueError(f"Types de scrutin inconnus: {', '.join(unknown)}")
+
+        self.years = np.array([year for year, _, _ in records], dtype=np.int64)
+        self.types = np.array([self.TYPES.index(kind) for _, kind, _ in records], dtype=np.int8)
+        self.major = np.array([bool(major) for _, _, major in records], dtype=bool)
+        self._compiled = {}
+
+    @classmethod
+    def default(cls):
+        """Calendrier historique des scrutins (1920-2025)"""
+        major = set(cls.DEFAULT_MAJOR)
+        return cls((year, kind, kind == 'legislatives' and year in major)
+                   for kind, years in cls.DEFAULT.items() for year in years)
+
+    @classmethod
+    def from_frame(cls, df):
+        """Charge un calendrier depuis un tableau Annee, Type[, Majeur]"""
+        major = df['Majeur'].map(cls._parse_major) if 'Majeur' in df else np.zeros(len(df), dtype=bool)
+        return cls(zip(df['Annee'].astype(int), df['Type'].str.strip().str.lower(), major))
+
+    @staticmethod
+    def _parse_major(value):
+        """Indicateur Majeur d'un tableau (booléen, 0/1 ou texte vrai/faux, oui/non)"""
+        if pd.isna(value):
+            return False
+        if isinstance(value, (bool, np.bool_, int, float, np.integer, np.floating)) and value in (0, 1):
+            return bool(value)
+        text = str(value).strip().lower()
+        if text in ('true', 'vrai', '1', 'oui'):
+            return True
+        if text in ('false', 'faux', '0', 'non', ''):
+            return False
+        raise ValueError(f"Valeur Majeur invalide: {value!r}")
+
+    @classmethod
+    def from_csv(cls, path):
+        """Charge un calendrier depuis un CSV (colonnes Annee, Type, Majeur)"""
+        return cls.from_frame(pd.read_csv(path))
+
+    def to_frame(self):
+        """Calendrier au format tableau, trié par année"""
+        df = pd.DataFrame({'Annee': self.years,
+                           'Type': np.asarray(self.TYPES)[self.types],
+                           'Majeur': self.major})
+        return df.sort_values(['Annee', 'Type'], kind='stable').reset_index(drop=True)
+
+    def __getitem__(self, kind):
+        """Années des scrutins d'un type ('majeures' pour les scrutins majeurs)"""
+        if kind == 'majeures':
+            return sorted(set(self.years[self.major].tolist()))
+        return sorted(set(self.years[self.types == self.TYPES.index(kind)].tolist()))
+
+    def _compile(self, years):
+        """Masques et indices pour un axe d'années (mis en cache par axe)"""
+        years = np.asarray(years)
+        key = (int(years[0]), len(years)) if len(years) and (np.diff(years) == 1).all() else years.tobytes()
+        if key not in self._compiled:
+            masks = {kind: np.isin(years, self.years[self.types == code])
+                     for code, kind in enumerate(self.TYPES)}
+            masks['majeures'] = np.isin(years, self.years[self.major])
+            masks['scrutins'] = np.isin(years, self.years)
+            for mask in masks.values():
+                mask.flags.writeable = False
+            self._compiled[key] = (masks, {kind: np.flatnonzero(mask) for kind, mask in masks.items()})
+        return self._compiled[key]
+
+    def masks(self, years):
+        """Masques booléens (années,) par type de scrutin, plus 'majeures' et 'scrutins'"""
+        return self._compile(years)[0]
+
+    def indices(self, years):
+        """Indices des années de scrutin sur l'axe, par type"""
+        return self._compile(years)[1]
+
+    def last(self, years, kind):
+        """Année du dernier scrutin d'un type à la date de chaque année (-1 avant le premier scrutin)"""
+        starts = np.asarray(self[kind])
+        last = np.searchsorted(starts, years, side='right') - 1
+        return np.where(last >= 0, starts[np.maximum(last, 0)], -1)
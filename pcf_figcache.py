@@ -0,0 +1,111 @@
+import hashlib
+import os
+
+import numpy as np
+import matplotlib
+
+import pcf_downsample
+
+
+class PCFFigureCache:
+    """Cache disque LRU des figures et panneaux rendus"""
+
+    def __init__(self, cache_dir=".pcf_cache/figures", max_bytes=200 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def _hash_function(digest, func):
+        """Intègre le nom et le bytecode d'une fonction de tracé (invalide si le code change)"""
+        func = getattr(func, '__func__', func)
+        digest.update(func.__qualname__.encode())
+        digest.update(func.__code__.co_code)
+        digest.update(repr(func.__code__.co_consts).encode())
+
+    @staticmethod
+    def _hash_data(digest, df, columns):
+        """Intègre les années et les colonnes lues"""
+        years = np.asarray(df['Annee'])
+        digest.update(f"{years[0]}-{years[-1]}-{len(years)}".encode() if len(years) else b"vide")
+        for col in columns:
+            digest.update(col.encode())
+            digest.update(np.ascontiguousarray(df[col], dtype=np.float64).tobytes())
+
+    def panel_key(self, analyzer, df, name, dpi, style='seaborn-v0_8', figsize=(10, 6)):
+        """Clé d'un panneau : colonnes lues, plage d'années, fonctions de tracé et de
+        sous-échantillonnage, réglages de sous-échantillonnage, dpi, taille et style"""
+        digest = hashlib.sha1(b"panel")
+        self._hash_data(digest, df, analyzer.panel_columns[name])
+        self._hash_function(digest, analyzer.panels[name])
+        for helper in (analyzer._plot_line, pcf_downsample.downsample_xy,
+                       pcf_downsample.minmax_indices, pcf_downsample.lttb_indices):
+            self._hash_function(digest, helper)
+        digest.update(f"{analyzer.max_plot_points}|{analyzer.downsample_method}".encode())
+        digest.update(f"{dpi}|{style}|{tuple(figsize)}|{matplotlib.__version__}".encode())
+        return digest.hexdigest()
+
+    def figure_key(self, analyzer, df, dpi, style='seaborn-v0_8', title='', figsize=(20, 24)):
+        """Clé de la figure complète : clés combinées de tous ses panneaux"""
+        digest = hashlib.sha1(b"figure")
+        for name in analyzer.panels:
+            digest.update(self.panel_key(analyzer, df, name, dpi, style, figsize).encode())
+        digest.update(title.encode())
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.png")
+
+    def get(self, key):
+        """Renvoie l'image en cache (et la marque comme récente), ou None"""
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                image = f.read()
+        except FileNotFoundError:
+            return None
+        os.utime(path)
+        return image
+
+    def put(self, key, image):
+        """Enregistre une image puis évince les moins récentes au-delà du budget"""
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(image)
+        os.replace(tmp_path, path)
+        self._evict()
+
+    def _evict(self):
+        """Éviction LRU selon la date de dernier accès"""
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith('.png'):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def render_panel(self, analyzer, df, name, dpi=100, figsize=(10, 6)):
+        """Rend un panneau via le cache"""
+        key = self.panel_key(analyzer, df, name, dpi, figsize=figsize)
+        image = self.get(key)
+        if image is None:
+            image = analyzer.render_panel(df, name, dpi=dpi, figsize=figsize)
+            self.put(key, image)
+        return image
+
+    def clear(self):
+        """Vide le cache"""
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith('.png'):
+                os.remove(entry.path)
@@ -0,0 +1,157 @@
+import os
+import hashlib
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from statsmodels.tsa.arima.model import ARIMA
+from statsmodels.tsa.exponential_smoothing.ets import ETSModel
+import warnings
+warnings.filterwarnings('ignore')
+
+from Pcommun import PCFFinanceAnalyzer
+
+
+def _build_model(series, model):
+    """Construit le modèle de série temporelle demandé"""
+    series = pd.Series(series)
+    if model == "ets":
+        return ETSModel(series, error="add", trend="add", damped_trend=True)
+    if model == "arima":
+        return ARIMA(series, order=(1, 1, 1), trend="t")
+    raise ValueError(f"Modèle de prévision inconnu: {model}")
+
+
+def _fit_and_forecast(task):
+    """Ajuste (ou réutilise) un modèle et projette une série (exécuté dans un processus)"""
+    key, series, model, horizon, alpha, params = task
+
+    fitted_model = _build_model(series, model)
+    if params is None:
+        results = fitted_model.fit(disp=False) if model == "ets" else fitted_model.fit()
+    else:
+        # Paramètres en cache : simple filtrage, sans optimisation
+        results = fitted_model.smooth(params)
+
+    n = len(series)
+    if model == "ets":
+        frame = results.get_prediction(start=n, end=n + horizon - 1).summary_frame(alpha=alpha)
+        lower, upper = frame['pi_lower'], frame['pi_upper']
+    else:
+        frame = results.get_forecast(horizon).summary_frame(alpha=alpha)
+        lower, upper = frame['mean_ci_lower'], frame['mean_ci_upper']
+
+    return (key, np.asarray(results.params), np.asarray(frame['mean']),
+            np.asarray(lower), np.asarray(upper))
+
+
+class PCFForecaster:
+    def __init__(self, horizon=10, model="ets", alpha=0.05, n_jobs=None,
+                 cache_dir=".pcf_cache/forecast"):
+        self.horizon = horizon
+        self.model = model
+        self.alpha = alpha  # Intervalle de prévision à 1 - alpha
+        self.n_jobs = n_jobs or os.cpu_count()
+        self.cache_dir = cache_dir
+        self._params_cache = {}
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _cache_key(self, series):
+        """Clé de cache : hash de la série et du modèle"""
+        digest = hashlib.sha1(np.ascontiguousarray(series, dtype=np.float64).tobytes())
+        digest.update(self.model.encode())
+        return digest.hexdigest()
+
+    def _load_params(self, key):
+        """Charge les paramètres ajustés depuis la mémoire ou le disque"""
+        if key in self._params_cache:
+            return self._params_cache[key]
+
+        path = os.path.join(self.cache_dir, f"{key}.npy")
+        if os.path.exists(path):
+            self._params_cache[key] = np.load(path)
+            return self._params_cache[key]
+        return None
+
+    def _store_params(self, key, params):
+        """Enregistre les paramètres ajustés en mémoire et sur disque"""
+        if key not in self._params_cache:
+            self._params_cache[key] = params
+            np.save(os.path.join(self.cache_dir, f"{key}.npy"), params)
+
+    def _run_tasks(self, series_list):
+        """Ajuste toutes les séries en parallèle et renvoie (moyenne, basse, haute)"""
+        tasks = []
+        for series in series_list:
+            key = self._cache_key(series)
+            tasks.append((key, series, self.model, self.horizon, self.alpha, self._load_params(key)))
+
+        if self.n_jobs > 1 and len(tasks) > 1:
+            chunksize = max(1, len(tasks) // (self.n_jobs * 4))
+            with ProcessPoolExecutor(max_workers=self.n_jobs) as executor:
+                results = list(executor.map(_fit_and_forecast, tasks, chunksize=chunksize))
+        else:
+            results = [_fit_and_forecast(task) for task in tasks]
+
+        mean = np.empty((len(tasks), self.horizon))
+        lower = np.empty_like(mean)
+        upper = np.empty_like(mean)
+        for i, (key, params, m, lo, hi) in enumerate(results):
+            self._store_params(key, params)
+            mean[i], lower[i], upper[i] = m, lo, hi
+
+        return mean, lower, upper
+
+    def forecast_years(self, last_year):
+        """Années projetées après la dernière année observée"""
+        return np.arange(last_year + 1, last_year + 1 + self.horizon)
+
+    def forecast_frame(self, df, columns=None):
+        """Projette chaque colonne d'un jeu de données (simulé ou observé)"""
+        columns = columns or [col for col in df.columns if col != 'Annee']
+        series_list = [df[col].to_numpy(dtype=np.float64) for col in columns]
+        mean, lower, upper = self._run_tasks(series_list)
+
+        years = self.forecast_years(int(df['Annee'].iloc[-1]))
+        frames = []
+        for i, col in enumerate(columns):
+            frames.append(pd.DataFrame({
+                'Annee': years,
+                'Colonne': col,
+                'Prevision': mean[i],
+                'Borne_Basse': lower[i],
+                'Borne_Haute': upper[i],
+            }))
+
+        return pd.concat(frames, ignore_index=True)
+
+    def forecast_ensemble(self, values):
+        """Projette un ensemble (runs, années, séries) et renvoie des tableaux (runs, horizon, séries)"""
+        n_runs, n_years, n_series = values.shape
+        series_list = list(values.transpose(0, 2, 1).reshape(-1, n_years))
+        mean, lower, upper = self._run_tasks(series_list)
+
+        shape = (n_runs, n_series, self.horizon)
+        return tuple(arr.reshape(shape).transpose(0, 2, 1) for arr in (mean, lower, upper))
+
+
+def main():
+    """Projection des finances du PCF au-delà de la période simulée"""
+    analyzer = PCFFinanceAnalyzer()
+    forecaster = PCFForecaster(horizon=10)
+
+    financial_data = analyzer.generate_financial_data()
+
+    print(f"🔮 Projection à {forecaster.horizon} ans ({analyzer.end_year + 1}-{analyzer.end_year + forecaster.horizon})...")
+    forecast = forecaster.forecast_frame(financial_data)
+
+    output_file = f'PCF_forecast_{analyzer.end_year + 1}_{analyzer.end_year + forecaster.horizon}.csv'
+    forecast.to_csv(output_file, index=False)
+    print(f"💾 Prévisions sauvegardées: {output_file}")
+
+    print("\n👀 Aperçu des prévisions (Revenus_Total):")
+    print(forecast[forecast['Colonne'] == 'Revenus_Total'])
+
+
+if __name__ == "__main__":
+    main()
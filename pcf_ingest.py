@@ -0,0 +1,246 @@
+import hashlib
+import os
+import re
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+from Pcommun import PCFFinanceAnalyzer
+from pcf_deflate import monetary_columns
+
+
+# Unités monétaires des comptes publiés → facteur vers les M€ du schéma
+UNIT_SCALES = {'eur': 1e-6, 'euro': 1e-6, 'euros': 1e-6,
+               'k': 1e-3, 'keur': 1e-3, 'milliers_d_euros': 1e-3,
+               'm': 1.0, 'meur': 1.0, 'millions_d_euros': 1.0}
+
+
+def _normalize_header(header):
+    """Normalise un intitulé de colonne (accents, casse, séparateurs)"""
+    text = unicodedata.normalize('NFKD', str(header)).encode('ascii', 'ignore').decode()
+    return re.sub(r'[^a-z0-9]+', '_', text.lower()).strip('_')
+
+
+class PCFAccountsLoader:
+    """Ingestion des comptes publiés (CSV/XLSX/XLS) au schéma de generate_financial_data"""
+
+    # Intitulés usuels des comptes publiés → colonnes du schéma
+    DEFAULT_ALIASES = {
+        'annee': 'Annee', 'exercice': 'Annee', 'year': 'Annee',
+        'total_produits': 'Revenus_Total', 'revenus_totaux': 'Revenus_Total',
+        'total_charges': 'Depenses_Total', 'depenses_totales': 'Depenses_Total',
+        'cotisations': 'Cotisations_Adherents', 'cotisations_des_adherents': 'Cotisations_Adherents',
+        'contributions_des_elus': 'Revenus_Municipaux',
+        'aide_publique': 'Financement_Public', 'financement_public_direct': 'Financement_Public',
+        'dons': 'Dons_Sympathisants', 'dons_des_personnes_physiques': 'Dons_Sympathisants',
+        'charges_de_personnel': 'Depenses_Personnel', 'salaires_et_charges': 'Depenses_Personnel',
+        'depenses_electorales': 'Depenses_Campagnes', 'propagande_et_communication': 'Depenses_Communication',
+        'resultat': 'Resultat', 'resultat_de_l_exercice': 'Resultat', 'fonds_propres': 'Fonds_Propres', 'capitaux_propres': 'Fonds_Propres',
+        'nombre_d_adherents': 'Adherents', 'adherents': 'Adherents',
+        'unite': 'Unite', 'unit': 'Unite',
+    }
+
+    # Colonnes pouvant être négatives ou exprimées en ratio
+    SIGNED_COLUMNS = {'Solde_Financier'}
+    RATIO_COLUMNS = {'Taux_Execution_Budget', 'Ratio_Cotisations_Revenus', 'Dependance_Financement_Public'}
+
+    def __init__(self, analyzer=None, aliases=None, unit='M€', chunk_size=50000, cache_dir=".pcf_cache/ingest"):
+        self.analyzer = analyzer or PCFFinanceAnalyzer()
+        self.schema = ['Annee'] + self.analyzer.series_columns
+        self.monetary = monetary_columns(self.schema)
+        self.unit = unit    # Unité des montants, sauf colonne Unite dans le fichier
+        self._unit_scale(unit)
+        self.chunk_size = chunk_size
+        self.cache_dir = cache_dir
+
+        self.aliases = {_normalize_header(col): col for col in self.schema}
+        self.aliases.update(self.DEFAULT_ALIASES)
+        self.aliases.update({_normalize_header(k): v for k, v in (aliases or {}).items()})
+        self.warnings = []
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def _unit_scale(unit):
+        """Facteur de conversion d'une unité monétaire vers les M€"""
+        scale = UNIT_SCALES.get(_normalize_header(str(unit).replace('€', 'eur')))
+        if scale is None:
+            raise ValueError(f"Unité monétaire inconnue: {unit} (€, k€ ou M€)")
+        return scale
+
+    def _cache_path(self, path, unit):
+        """Chemin du cache binaire : hash du contenu, date de modification, alias et unité"""
+        digest = hashlib.sha1()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        digest.update(str(os.stat(path).st_mtime_ns).encode())
+        digest.update(repr(sorted(self.aliases.items())).encode())
+        digest.update(str(unit).encode())
+        return os.path.join(self.cache_dir, f"{digest.hexdigest()}.pkl")
+
+    def _map_columns(self, columns):
+        """Associe les intitulés sources aux colonnes du schéma"""
+        mapping = {}
+        for col in columns:
+            target = self.aliases.get(_normalize_header(col))
+            if target is not None and target not in mapping.values():
+                mapping[col] = target
+        return mapping
+
+    def _iter_chunks(self, path):
+        """Lit un fichier par blocs de lignes"""
+        extension = os.path.splitext(path)[1].lower()
+        if extension in ('.csv', '.txt'):
+            # Séparateur français (;) ou anglo-saxon (,), détecté sur l'en-tête
+            with open(path, encoding='utf-8-sig', errors='replace') as f:
+                header = f.readline()
+            sep = ';' if header.count(';') > header.count(',') else ','
+            yield from pd.read_csv(path, sep=sep, chunksize=self.chunk_size, encoding='utf-8-sig')
+        elif extension in ('.xlsx', '.xlsm'):
+            from openpyxl import load_workbook
+            workbook = load_workbook(path, read_only=True, data_only=True)
+            try:
+                rows = workbook.active.iter_rows(values_only=True)
+                header = next(rows)
+                block = []
+                for row in rows:
+                    block.append(row)
+                    if len(block) == self.chunk_size:
+                        yield pd.DataFrame(block, columns=header)
+                        block = []
+                if block:
+                    yield pd.DataFrame(block, columns=header)
+            finally:
+                workbook.close()
+        elif extension == '.xls':
+            yield pd.read_excel(path, engine='xlrd')
+        else:
+            raise ValueError(f"Format non pris en charge: {path}")
+
+    @staticmethod
+    def _to_numeric(values):
+        if values.dtype == object:
+            # Formats français : espaces de milliers, virgule décimale
+            values = (values.astype(str).str.replace(r'[\s €]', '', regex=True)
+                      .str.replace(',', '.', regex=False))
+        return pd.to_numeric(values, errors='coerce')
+
+    def _convert_chunk(self, chunk, unit):
+        """Renomme et convertit un bloc en colonnes numériques du schéma (montants en M€)"""
+        mapping = self._map_columns(chunk.columns)
+        if 'Annee' not in mapping.values():
+            raise ValueError("Colonne d'année introuvable (Annee/Exercice/Year)")
+
+        chunk = chunk[list(mapping)].rename(columns=mapping)
+        converted = pd.DataFrame(index=chunk.index)
+        for col in self.schema:
+            converted[col] = self._to_numeric(chunk[col]) if col in chunk else np.nan
+
+        # Unité par ligne (colonne Unite) ou unité du fichier
+        if 'Unite' in chunk:
+            scale = chunk['Unite'].fillna(unit).map(self._unit_scale).to_numpy(dtype=np.float64)
+        else:
+            scale = self._unit_scale(unit)
+        converted[self.monetary] = converted[self.monetary].mul(scale, axis=0)
+
+        # Résultat en montant : converti en part du budget (Solde_Financier est un ratio)
+        if 'Resultat' in chunk and converted['Solde_Financier'].isna().all():
+            result = self._to_numeric(chunk['Resultat']) * scale
+            converted['Solde_Financier'] = result / converted['Revenus_Total']
+        return converted
+
+    def validate(self, df, source=''):
+        """Contrôles vectorisés ; lève ValueError sur les erreurs bloquantes"""
+        years = df['Annee'].to_numpy()
+        if np.isnan(years).any() or (years != np.round(years)).any():
+            raise ValueError(f"{source}: années manquantes ou non entières")
+        duplicated = df['Annee'].duplicated(keep=False).to_numpy()
+        if duplicated.any():
+            raise ValueError(f"{source}: années en double: {sorted(set(years[duplicated].astype(int)))}")
+
+        warnings = []
+        values = df.drop(columns='Annee')
+        unsigned = [col for col in values.columns if col not in self.SIGNED_COLUMNS]
+        negative = (values[unsigned] < 0).sum()
+        for col, count in negative[negative > 0].items():
+            warnings.append(f"{source}: {count} valeur(s) négative(s) dans {col}")
+
+        ratios = [col for col in values.columns if col in self.RATIO_COLUMNS]
+        out_of_range = ((values[ratios] < 0) | (values[ratios] > 1.5)).sum()
+        for col, count in out_of_range[out_of_range > 0].items():
+            warnings.append(f"{source}: {count} ratio(s) hors de [0, 1.5] dans {col}")
+
+        components = ['Cotisations_Adherents', 'Financement_Public', 'Revenus_Presse',
+                      'Revenus_Municipaux', 'Dons_Sympathisants', 'Revenus_Formations']
+        component_sum = values[components].sum(axis=1, min_count=1)
+        exceeded = (component_sum > values['Revenus_Total'] * 1.05).sum()
+        if exceeded:
+            warnings.append(f"{source}: {exceeded} année(s) où les composantes dépassent Revenus_Total")
+
+        balance = (values['Solde_Financier'].abs() > 1.5).sum()
+        if balance:
+            warnings.append(f"{source}: {balance} Solde_Financier hors de [-1.5, 1.5] "
+                            f"(montant au lieu d'une part du budget ?)")
+
+        self.warnings.extend(warnings)
+        return warnings
+
+    def load(self, path, unit=None):
+        """Charge un fichier (via le cache binaire si le fichier n'a pas changé)
+
+        unit : unité des montants du fichier (€, k€, M€), par défaut celle du chargeur.
+        """
+        unit = unit or self.unit
+        cache_path = self._cache_path(path, unit)
+        if os.path.exists(cache_path):
+            cached = pd.read_pickle(cache_path)
+            self.warnings.extend(cached['avertissements'])
+            return cached['donnees']
+
+        df = pd.concat([self._convert_chunk(chunk, unit) for chunk in self._iter_chunks(path)],
+                       ignore_index=True)
+        df = df.dropna(how='all')
+        warnings = self.validate(df, source=os.path.basename(path))
+
+        df['Annee'] = df['Annee'].astype(int)
+        df = df.sort_values('Annee').reset_index(drop=True)
+        pd.to_pickle({'donnees': df, 'avertissements': warnings}, cache_path)
+        return df
+
+    def load_many(self, paths, units=None):
+        """Charge plusieurs fichiers et les fusionne par année (le premier fichier prime)
+
+        units : unité par chemin de fichier, pour des comptes publiés en unités différentes.
+        """
+        merged = None
+        for path in paths:
+            df = self.load(path, (units or {}).get(path)).set_index('Annee')
+            merged = df if merged is None else merged.combine_first(df)
+        return merged.reset_index()[self.schema]
+
+
+def main():
+    """Ingestion des comptes publiés du PCF"""
+    import sys
+
+    paths = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    units = [arg.split('=', 1)[1] for arg in sys.argv[1:] if arg.startswith('--unite=')]
+    if not paths:
+        print("Usage: python pcf_ingest.py [--unite=k€] comptes_2015.xlsx [comptes_2016.csv ...]")
+        return
+
+    loader = PCFAccountsLoader(unit=units[0] if units else 'M€')
+    observed = loader.load_many(paths)
+
+    output_file = 'PCF_observed_accounts.csv'
+    observed.to_csv(output_file, index=False)
+    print(f"📥 {len(paths)} fichier(s) ingéré(s), {len(observed)} exercice(s)")
+    print(f"💾 Données observées sauvegardées: {output_file}")
+    for warning in loader.warnings:
+        print(f"⚠️ {warning}")
+
+
+if __name__ == "__main__":
+    main()
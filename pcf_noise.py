@@ -0,0 +1,56 @@
+import numpy as np
+
+
+def correlation_matrix(columns, correlations=None):
+    """Matrice de corrélation des séries, depuis une table de paires ou une matrice complète"""
+    k = len(columns)
+    if correlations is None:
+        return np.eye(k)
+    if not isinstance(correlations, dict):
+        matrix = np.asarray(correlations, dtype=np.float64)
+        if matrix.shape != (k, k):
+            raise ValueError(f"Matrice de corrélation {matrix.shape} attendue ({k}, {k})")
+        return matrix
+
+    index = {col: j for j, col in enumerate(columns)}
+    matrix = np.eye(k)
+    for (a, b), rho in correlations.items():
+        if a not in index or b not in index:
+            raise ValueError(f"Corrélation entre séries non bruitées: {a}, {b}")
+        matrix[index[a], index[b]] = matrix[index[b], index[a]] = rho
+    return matrix
+
+
+class PCFCorrelatedNoise:
+    """Bruit multiplicatif corrélé de toutes les séries, tiré en une seule fois
+
+    La matrice de corrélation est factorisée (Cholesky) à la construction ; chaque
+    tirage est ensuite un seul appel au générateur suivi d'un produit matriciel
+    groupé sur toutes les séries, années et runs.
+    """
+
+    def __init__(self, columns, sigmas, correlations=None):
+        self.columns = list(columns)
+        self.sigma = np.array([sigmas[col] for col in self.columns], dtype=np.float64)
+        self.correlation = correlation_matrix(self.columns, correlations)
+
+        if not np.allclose(self.correlation, self.correlation.T):
+            raise ValueError("La matrice de corrélation doit être symétrique")
+        try:
+            self.cholesky = np.linalg.cholesky(self.correlation)
+        except np.linalg.LinAlgError:
+            raise ValueError("La matrice de corrélation n'est pas définie positive")
+
+        # Facteur mis à l'échelle : bruit = 1 + z @ scaled (séries en dernier axe)
+        self._scaled = self.cholesky.T * self.sigma
+
+    def draw(self, shape, random_state=None):
+        """Bruit (*shape, séries) centré sur 1 (générateur global à défaut de random_state)"""
+        rng = np.random if random_state is None else random_state
+        z = rng.standard_normal(tuple(shape) + (len(self.columns),))
+        return 1 + z @ self._scaled
+
+    def draw_columns(self, shape, random_state=None):
+        """Bruit par colonne : vues (*shape) du tirage groupé"""
+        block = self.draw(shape, random_state)
+        return {col: block[..., j] for j, col in enumerate(self.columns)}
@@ -0,0 +1,230 @@
+import json
+import os
+import queue
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import matplotlib
+matplotlib.use('Agg')
+import numpy as np
+
+from Pcommun import PCFFinanceAnalyzer
+from pcf_figcache import PCFFigureCache
+from pcf_stats import PCFEnsembleAccumulator
+from pcf_tiles import PCFTileExporter
+
+_DONE = object()  # Marque de fin de flux entre étages
+
+_worker_analyzer = None
+_worker_cache = None
+
+
+def _init_worker():
+    """Initialise un analyseur par processus de rendu"""
+    global _worker_analyzer, _worker_cache
+    _worker_analyzer = PCFFinanceAnalyzer()
+    _worker_cache = PCFFigureCache()
+
+
+def _render_panel(store, name, dpi):
+    """Rend un panneau dans un processus du pool (via le cache disque) ; renvoie l'image et sa durée"""
+    t0 = time.perf_counter()
+    image = _worker_cache.render_panel(_worker_analyzer, store, name, dpi=dpi)
+    return image, time.perf_counter() - t0
+
+
+class PCFPipeline:
+    """Exécution en pipeline du traitement nocturne
+
+    Les étages (génération de l'ensemble, écriture disque, agrégation, export du
+    jeu de référence, rendu des panneaux, insights) tournent en parallèle et
+    communiquent par des files bornées : un étage rapide attend le plus lent au
+    lieu d'accumuler des blocs en mémoire. La durée totale tend vers celle de
+    l'étage le plus lent plutôt que vers la somme des étages.
+    """
+
+    def __init__(self, analyzer=None, n_runs=1000, chunk_size=100, queue_size=2,
+                 render_workers=None, dpi=150, seed=None, output_dir='.'):
+        self.analyzer = analyzer or PCFFinanceAnalyzer()
+        self.n_runs = n_runs
+        self.chunk_size = chunk_size
+        self.queue_size = queue_size
+        self.render_workers = render_workers or max(1, min(len(self.analyzer.panels), (os.cpu_count() or 2) - 1))
+        self.dpi = dpi
+        self.seed = seed
+        self.output_dir = output_dir
+
+        self.timings = defaultdict(float)
+        self.errors = []
+
+    def _path(self, name):
+        return os.path.join(self.output_dir, name)
+
+    def _queue(self):
+        return queue.Queue(maxsize=self.queue_size)
+
+    def _timed(self, name, func, *args):
+        t0 = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            self.timings[name] += time.perf_counter() - t0
+
+    def _stage(self, name, func, inbox, outboxes=()):
+        """Lance un étage consommant une file ; après une erreur il vide sa file pour ne pas bloquer l'amont"""
+        def work():
+            failed = False
+            while True:
+                item = inbox.get()
+                if item is _DONE:
+                    break
+                if failed:
+                    continue
+                try:
+                    result = self._timed(name, func, item)
+                except Exception as exc:
+                    self.errors.append((name, exc))
+                    failed = True
+                    continue
+                for outbox in outboxes:
+                    outbox.put(result)
+            for outbox in outboxes:
+                outbox.put(_DONE)
+
+        thread = threading.Thread(target=work, name=f"pcf-{name}", daemon=True)
+        thread.start()
+        return thread
+
+    def _source(self, name, iterator, outboxes):
+        """Lance l'étage producteur (génération par blocs)"""
+        def work():
+            try:
+                while True:
+                    try:
+                        item = self._timed(name, next, iterator)
+                    except StopIteration:
+                        break
+                    for outbox in outboxes:
+                        outbox.put(item)
+            except Exception as exc:
+                self.errors.append((name, exc))
+            finally:
+                for outbox in outboxes:
+                    outbox.put(_DONE)
+
+        thread = threading.Thread(target=work, name=f"pcf-{name}", daemon=True)
+        thread.start()
+        return thread
+
+    @staticmethod
+    def _export_csv(df, path):
+        df.to_csv(path, index=False)
+
+    def _ensemble_writer(self, path):
+        """Écriture incrémentale des blocs dans un .npy projeté en mémoire"""
+        shape = (self.n_runs, len(self.analyzer.years), len(self.analyzer.series_columns))
+        array = np.lib.format.open_memmap(path, mode='w+', dtype=np.float64, shape=shape)
+        offset = [0]
+
+        def write(chunk):
+            array[offset[0]:offset[0] + len(chunk)] = chunk
+            offset[0] += len(chunk)
+            if offset[0] == self.n_runs:
+                array.flush()
+
+        return write
+
+    def run(self):
+        """Exécute le pipeline et renvoie les chemins produits et les durées par étage"""
+        analyzer = self.analyzer
+        suffix = f"{analyzer.start_year}_{analyzer.end_year}"
+        outputs = {
+            'donnees': self._path(f'PCF_financial_data_{suffix}.csv'),
+            'ensemble': self._path(f'PCF_ensemble_{suffix}.npy'),
+            'ensemble_meta': self._path(f'PCF_ensemble_{suffix}.json'),
+            'bandes': self._path(f'PCF_ensemble_bands_{suffix}.csv'),
+            'insights': self._path('PCF_insights.json'),
+            'tuiles': self._path('PCF_tiles'),
+        }
+        t0 = time.perf_counter()
+
+        # Jeu de référence généré avant l'ensemble (séquence aléatoire reproductible)
+        if self.seed is not None:
+            np.random.seed(self.seed)
+        df = self._timed('generation_reference', analyzer.generate_financial_data, False)
+        store = analyzer.store
+
+        with ThreadPoolExecutor(max_workers=2) as threads, \
+                ProcessPoolExecutor(max_workers=self.render_workers, initializer=_init_worker) as renderers:
+            # Export, insights et rendu du jeu de référence pendant que l'ensemble tourne
+            export = threads.submit(self._timed, 'export_csv', self._export_csv, df, outputs['donnees'])
+            pending_insights = threads.submit(self._timed, 'insights', analyzer.compute_financial_insights, df)
+            recent = store.slice(1945)
+            panels = {name: renderers.submit(_render_panel, recent, name, self.dpi) for name in analyzer.panels}
+
+            # Ensemble : génération → (écriture disque, agrégation) par files bornées
+            accumulator = PCFEnsembleAccumulator.for_analyzer(analyzer)
+            to_disk, to_stats = self._queue(), self._queue()
+            threads_ensemble = [
+                self._source('generation_ensemble',
+                             analyzer.iter_ensemble(self.n_runs, chunk_size=self.chunk_size),
+                             (to_disk, to_stats)),
+                self._stage('ecriture_ensemble', self._ensemble_writer(outputs['ensemble']), to_disk),
+                self._stage('agregation', accumulator.update, to_stats),
+            ]
+
+            for name, future in panels.items():
+                outputs[f'panneau_{name}'] = self._path(f'PCF_panel_{name}.png')
+                image, seconds = future.result()
+                self.timings['rendu_panneaux'] += seconds
+                with open(outputs[f'panneau_{name}'], 'wb') as f:
+                    f.write(image)
+            for thread in threads_ensemble:
+                thread.join()
+            export.result()
+            insights = pending_insights.result()
+
+        if self.errors:
+            name, exc = self.errors[0]
+            raise RuntimeError(f"Échec de l'étage {name}: {exc}") from exc
+
+        with open(outputs['ensemble_meta'], 'w', encoding='utf-8') as f:
+            json.dump({'annees': analyzer.years.tolist(), 'colonnes': analyzer.series_columns,
+                       'runs': self.n_runs}, f)
+        bands = accumulator.mean_frame()
+        for level in accumulator.quantile_levels:
+            quantile = accumulator.quantile_frame(level)
+            for col in ('Revenus_Total', 'Depenses_Total', 'Adherents', 'Fonds_Propres'):
+                bands[f'{col}_P{round(level * 100):02d}'] = quantile[col]
+        bands.to_csv(outputs['bandes'], index=False)
+        tiles = PCFTileExporter(analyzer, output_dir=outputs['tuiles'])
+        self._timed('tuiles', tiles.export, df, accumulator)
+        with open(outputs['insights'], 'w', encoding='utf-8') as f:
+            json.dump({key: float(value) for key, value in insights.items()}, f, indent=2)
+
+        self.timings['total'] = time.perf_counter() - t0
+        return outputs, dict(self.timings)
+
+
+def main():
+    """Traitement nocturne en pipeline : données, ensemble, panneaux et insights"""
+    pipeline = PCFPipeline(n_runs=2000, seed=0)
+
+    print(f"🚀 Pipeline: référence + ensemble de {pipeline.n_runs} simulations "
+          f"(blocs de {pipeline.chunk_size}, files de {pipeline.queue_size})...")
+    outputs, timings = pipeline.run()
+
+    for name, path in outputs.items():
+        print(f"💾 {name}: {path}")
+
+    total = timings.pop('total')
+    print("\n⏱️ Durées par étage (cumulées):")
+    for name, seconds in sorted(timings.items(), key=lambda item: -item[1]):
+        print(f"   {name}: {seconds:.2f} s")
+    print(f"   Total (bout en bout): {total:.2f} s, somme des étages: {sum(timings.values()):.2f} s")
+
+
+if __name__ == "__main__":
+    main()
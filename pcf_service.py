@@ -0,0 +1,253 @@
+import asyncio
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urlsplit, parse_qs
+
+import matplotlib
+matplotlib.use('Agg')
+import numpy as np
+
+from Pcommun import PCFFinanceAnalyzer
+from pcf_figcache import PCFFigureCache
+
+_worker_analyzer = None
+_worker_cache = None
+
+
+def _init_worker():
+    """Initialise un analyseur par processus de rendu (import payé une seule fois)"""
+    global _worker_analyzer, _worker_cache
+    _worker_analyzer = PCFFinanceAnalyzer()
+    _worker_cache = PCFFigureCache()
+
+
+def _render_panel(df, name, dpi):
+    """Rend un panneau dans un processus du pool (via le cache disque)"""
+    return _worker_cache.render_panel(_worker_analyzer, df, name, dpi=dpi)
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class PCFService:
+    """Service HTTP/JSON local gardant analyseur, données et rendus en mémoire"""
+
+    REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+               500: 'Internal Server Error'}
+
+    def __init__(self, host='127.0.0.1', port=8050, seed=None, render_workers=None):
+        self.host = host
+        self.port = port
+        self.seed = seed
+        self.render_workers = render_workers or max(1, (os.cpu_count() or 2) - 1)
+
+        self.analyzer = PCFFinanceAnalyzer()
+        self.executor = None
+        self.df = None
+        self.store = None
+        self._insights = None
+        self._panel_cache = {}
+        self._panel_pending = {}
+        self.generation = 0  # Incrémenté à chaque régénération (rendus en cours périmés)
+
+        self.routes = {
+            ('GET', '/health'): self.handle_health,
+            ('GET', '/columns'): self.handle_columns,
+            ('GET', '/data'): self.handle_data,
+            ('GET', '/insights'): self.handle_insights,
+            ('GET', '/panels'): self.handle_panels,
+            ('POST', '/regenerate'): self.handle_regenerate,
+        }
+
+    def regenerate(self, seed=None):
+        """(Re)génère le jeu de données et invalide les caches"""
+        if seed is not None:
+            np.random.seed(seed)
+        self.df = self.analyzer.generate_financial_data(verbose=False)
+        self.store = self.analyzer.store
+        self._insights = None
+        self.generation += 1
+        self._panel_cache.clear()
+        self._panel_pending.clear()
+
+    # Gestionnaires d'endpoints
+
+    async def handle_health(self, query):
+        return 200, 'application/json', {'status': 'ok', 'annees': len(self.df)}
+
+    async def handle_columns(self, query):
+        return 200, 'application/json', {'colonnes': list(self.df.columns)}
+
+    def _year_range(self, query, default_start):
+        """Lit start/end dans la requête"""
+        try:
+            start = int(query.get('start', [default_start])[0])
+            end = int(query.get('end', [self.analyzer.end_year])[0])
+        except ValueError:
+            raise HTTPError(400, "start/end doivent être des années entières")
+        return start, end
+
+    async def handle_data(self, query):
+        start, end = self._year_range(query, self.analyzer.start_year)
+        columns = query.get('columns', [None])[0]
+        columns = ['Annee'] + columns.split(',') if columns else list(self.df.columns)
+
+        unknown = [col for col in columns if col not in self.df.columns]
+        if unknown:
+            raise HTTPError(400, f"Colonnes inconnues: {', '.join(unknown)}")
+
+        subset = self.store.slice(start, end)
+        return 200, 'application/json', subset.to_frame(columns).to_dict(orient='list')
+
+    async def handle_insights(self, query):
+        if self._insights is None:
+            insights = self.analyzer.compute_financial_insights(self.df)
+            self._insights = {key: float(value) for key, value in insights.items()}
+        return 200, 'application/json', self._insights
+
+    async def handle_panels(self, query):
+        return 200, 'application/json', {'panneaux': list(self.analyzer.panels)}
+
+    async def handle_panel(self, name, query):
+        if name not in self.analyzer.panels:
+            raise HTTPError(404, f"Panneau inconnu: {name}")
+        start, end = self._year_range(query, 1945)
+        try:
+            dpi = int(query.get('dpi', [100])[0])
+        except ValueError:
+            raise HTTPError(400, "dpi doit être un entier")
+
+        key = (name, start, end, dpi)
+        if key in self._panel_cache:
+            return 200, 'image/png', self._panel_cache[key]
+
+        # Mutualiser les rendus concurrents d'un même panneau
+        generation = self.generation
+        if key not in self._panel_pending:
+            subset = self.store.slice(start, end)
+            loop = asyncio.get_running_loop()
+            self._panel_pending[key] = loop.run_in_executor(self.executor, _render_panel, subset, name, dpi)
+        pending = self._panel_pending[key]
+        try:
+            image = await pending
+        finally:
+            if self._panel_pending.get(key) is pending:
+                del self._panel_pending[key]
+
+        # Un rendu des données d'avant une régénération n'entre pas dans le cache
+        if generation == self.generation:
+            self._panel_cache[key] = image
+        return 200, 'image/png', image
+
+    async def handle_regenerate(self, query):
+        seed = query.get('seed', [None])[0]
+        self.regenerate(int(seed) if seed is not None else None)
+        return 200, 'application/json', {'status': 'regenere', 'annees': len(self.df)}
+
+    # Protocole HTTP minimal (HTTP/1.1, keep-alive)
+
+    async def dispatch(self, method, target):
+        """Route une requête vers son gestionnaire"""
+        url = urlsplit(target)
+        query = parse_qs(url.query)
+
+        if url.path.startswith('/panels/') and url.path.endswith('.png'):
+            if method != 'GET':
+                raise HTTPError(405, "Méthode non autorisée")
+            return await self.handle_panel(url.path[len('/panels/'):-len('.png')], query)
+
+        handler = self.routes.get((method, url.path))
+        if handler is None:
+            if any(path == url.path for _, path in self.routes):
+                raise HTTPError(405, "Méthode non autorisée")
+            raise HTTPError(404, f"Endpoint inconnu: {url.path}")
+        return await handler(query)
+
+    async def handle_connection(self, reader, writer):
+        """Traite les requêtes successives d'une connexion"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                try:
+                    try:
+                        length = int(headers.get('content-length', 0) or 0)
+                        if length < 0:
+                            raise ValueError(length)
+                    except ValueError:
+                        headers['connection'] = 'close'  # Corps de longueur inconnue : fermer après la réponse
+                        raise
+                    if length:
+                        await reader.readexactly(length)
+
+                    method, target, _ = request_line.decode('latin-1').split(' ', 2)
+                    status, content_type, body = await self.dispatch(method.upper(), target)
+                except HTTPError as error:
+                    status, content_type, body = error.status, 'application/json', {'erreur': error.message}
+                except ValueError:
+                    status, content_type, body = 400, 'application/json', {'erreur': "Requête invalide"}
+                except asyncio.IncompleteReadError:
+                    raise
+                except Exception as error:
+                    status, content_type, body = 500, 'application/json', {'erreur': str(error)}
+
+                if content_type == 'application/json':
+                    body = json.dumps(body, ensure_ascii=False).encode('utf-8')
+                    content_type = 'application/json; charset=utf-8'
+
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                writer.write((f"HTTP/1.1 {status} {self.REASONS.get(status, '')}\r\n"
+                              f"Content-Type: {content_type}\r\n"
+                              f"Content-Length: {len(body)}\r\n"
+                              f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n").encode('latin-1'))
+                writer.write(body)
+                await writer.drain()
+
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self):
+        """Démarre le service et le garde actif"""
+        self.regenerate(self.seed)
+        self.executor = ProcessPoolExecutor(max_workers=self.render_workers, initializer=_init_worker)
+        server = await asyncio.start_server(self.handle_connection, self.host, self.port)
+
+        print(f"🌐 Service PCF en écoute sur http://{self.host}:{self.port}")
+        print(f"🖼️ Panneaux disponibles: {', '.join(self.analyzer.panels)}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.executor.shutdown(cancel_futures=True)
+
+
+def main():
+    """Lance le service HTTP/JSON local de l'analyse du PCF"""
+    service = PCFService(port=int(os.environ.get('PCF_SERVICE_PORT', 8050)))
+    try:
+        asyncio.run(service.serve())
+    except KeyboardInterrupt:
+        print("\n🛑 Service arrêté")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+import numpy as np
+import pandas as pd
+
+from Pcommun import PCFFinanceAnalyzer
+
+
+class P2QuantileSketch:
+    """Estimateurs P² (Jain & Chlamtac) vectorisés sur toutes les cellules (année, série)"""
+
+    def __init__(self, probabilities, shape):
+        self.probabilities = np.asarray(probabilities, dtype=np.float64)
+        self.shape = tuple(shape)
+        self.count = 0
+
+        n_cells = int(np.prod(self.shape))
+        n_probs = len(self.probabilities)
+        p = self.probabilities[:, None]
+
+        # Hauteurs, positions réelles et positions désirées des 5 marqueurs
+        self._heights = np.empty((n_probs, 5, n_cells))
+        self._positions = np.tile(np.arange(1.0, 6.0)[None, :, None], (n_probs, 1, n_cells))
+        self._desired = np.hstack([np.ones_like(p), 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5 * np.ones_like(p)])
+        self._increments = np.hstack([np.zeros_like(p), p / 2, p, (1 + p) / 2, np.ones_like(p)])
+        self._buffer = []
+
+    def update(self, chunk):
+        """Intègre un bloc d'observations (runs, *shape)"""
+        for observation in chunk.reshape(len(chunk), -1):
+            if self.count < 5:
+                self._buffer.append(observation)
+                self.count += 1
+                if self.count == 5:
+                    initial = np.sort(np.stack(self._buffer), axis=0)
+                    self._heights[:] = initial[None, :, :]
+                    self._buffer = []
+                continue
+
+            self._update_one(observation)
+            self.count += 1
+
+    def _update_one(self, x):
+        """Mise à jour P² pour une observation par cellule"""
+        q, n = self._heights, self._positions
+
+        # Ajuster les marqueurs extrêmes et trouver la cellule k de chaque observation
+        np.minimum(q[:, 0], x, out=q[:, 0])
+        np.maximum(q[:, 4], x, out=q[:, 4])
+        k = (x[None, None, :] >= q[:, 1:4]).sum(axis=1)
+
+        # Incrémenter les positions des marqueurs au-dessus de k
+        n += (np.arange(5)[None, :, None] > k[:, None, :])
+        self._desired += self._increments
+        desired = self._desired[:, :, None]
+
+        for i in range(1, 4):
+            d = desired[:, i] - n[:, i]
+            move = (((d >= 1) & (n[:, i + 1] - n[:, i] > 1)) |
+                    ((d <= -1) & (n[:, i - 1] - n[:, i] < -1)))
+            if not move.any():
+                continue
+            d = np.sign(d)
+
+            # Prédiction parabolique, repli linéaire si elle sort de l'intervalle
+            qi, qm, qp = q[:, i], q[:, i - 1], q[:, i + 1]
+            ni, nm, np_ = n[:, i], n[:, i - 1], n[:, i + 1]
+            parabolic = qi + d / (np_ - nm) * ((ni - nm + d) * (qp - qi) / (np_ - ni) +
+                                               (np_ - ni - d) * (qi - qm) / (ni - nm))
+            neighbor = np.where(d > 0, qp, qm)
+            neighbor_pos = np.where(d > 0, np_, nm)
+            linear = qi + d * (neighbor - qi) / (neighbor_pos - ni)
+            adjusted = np.where((qm < parabolic) & (parabolic < qp), parabolic, linear)
+
+            q[:, i] = np.where(move, adjusted, qi)
+            n[:, i] = np.where(move, ni + d, ni)
+
+    def quantiles(self):
+        """Quantiles estimés (probabilités, *shape)"""
+        if self.count == 0:
+            return np.full((len(self.probabilities),) + self.shape, np.nan)
+        if self.count < 5:
+            exact = np.percentile(np.stack(self._buffer), self.probabilities * 100, axis=0)
+            return exact.reshape((len(self.probabilities),) + self.shape)
+        return self._heights[:, 2].reshape((len(self.probabilities),) + self.shape)
+
+
+class PCFEnsembleAccumulator:
+    """Statistiques d'ensemble en flux, à mémoire indépendante du nombre de runs"""
+
+    def __init__(self, years, columns, quantiles=(0.05, 0.5, 0.95)):
+        self.years = np.asarray(years)
+        self.columns = list(columns)
+        self.quantile_levels = tuple(quantiles)
+        shape = (len(self.years), len(self.columns))
+
+        self.count = 0
+        self._mean = np.zeros(shape)
+        self._m2 = np.zeros(shape)
+        self._min = np.full(shape, np.inf)
+        self._max = np.full(shape, -np.inf)
+        self._sketch = P2QuantileSketch(self.quantile_levels, shape)
+
+    @classmethod
+    def for_analyzer(cls, analyzer, quantiles=(0.05, 0.5, 0.95)):
+        """Crée un accumulateur aligné sur les années et séries de l'analyseur"""
+        return cls(analyzer.years, analyzer.series_columns, quantiles)
+
+    def update(self, chunk):
+        """Intègre un bloc (runs, années, séries) par fusion de Welford/Chan"""
+        chunk = np.asarray(chunk, dtype=np.float64)
+        n_b = len(chunk)
+        if n_b == 0:
+            return self
+
+        mean_b = chunk.mean(axis=0)
+        m2_b = ((chunk - mean_b) ** 2).sum(axis=0)
+        n_a = self.count
+        n = n_a + n_b
+
+        delta = mean_b - self._mean
+        self._mean += delta * n_b / n
+        self._m2 += m2_b + delta ** 2 * n_a * n_b / n
+        self.count = n
+
+        np.minimum(self._min, chunk.min(axis=0), out=self._min)
+        np.maximum(self._max, chunk.max(axis=0), out=self._max)
+        self._sketch.update(chunk)
+        return self
+
+    def merge(self, other):
+        """Fusionne les moments d'un autre accumulateur (quantiles non fusionnables)"""
+        if other.count == 0:
+            return self
+        n_a, n_b = self.count, other.count
+        n = n_a + n_b
+        delta = other._mean - self._mean
+        self._mean += delta * n_b / n
+        self._m2 += other._m2 + delta ** 2 * n_a * n_b / n
+        self.count = n
+        np.minimum(self._min, other._min, out=self._min)
+        np.maximum(self._max, other._max, out=self._max)
+        return self
+
+    @property
+    def mean(self):
+        return self._mean
+
+    @property
+    def variance(self):
+        if self.count < 2:
+            return np.full_like(self._m2, np.nan)
+        return self._m2 / (self.count - 1)
+
+    @property
+    def std(self):
+        return np.sqrt(self.variance)
+
+    def quantile(self, level):
+        """Quantile estimé (années, séries) pour un niveau suivi"""
+        index = self.quantile_levels.index(level)
+        return self._sketch.quantiles()[index]
+
+    def _to_frame(self, values):
+        """Convertit un tableau (années, séries) au format de generate_financial_data"""
+        df = pd.DataFrame(values, columns=self.columns)
+        df.insert(0, 'Annee', self.years)
+        return df
+
+    def mean_frame(self):
+        """Moyenne d'ensemble, utilisable par les graphiques et insights existants"""
+        return self._to_frame(self._mean)
+
+    def std_frame(self):
+        """Écart-type d'ensemble"""
+        return self._to_frame(self.std)
+
+    def quantile_frame(self, level):
+        """Quantile d'ensemble"""
+        return self._to_frame(self.quantile(level))
+
+
+def run_streaming_study(analyzer, n_runs, chunk_size=100, quantiles=(0.05, 0.5, 0.95), seed=None):
+    """Génère un ensemble par blocs et l'agrège sans conserver les réalisations"""
+    accumulator = PCFEnsembleAccumulator.for_analyzer(analyzer, quantiles)
+    for chunk in analyzer.iter_ensemble(n_runs, chunk_size=chunk_size, seed=seed):
+        accumulator.update(chunk)
+    return accumulator
+
+
+def main():
+    """Étude d'ensemble en flux des finances du PCF"""
+    analyzer = PCFFinanceAnalyzer()
+    n_runs = 1000
+
+    print(f"🎲 Étude d'ensemble en flux: {n_runs} simulations...")
+    accumulator = run_streaming_study(analyzer, n_runs)
+
+    output_file = 'PCF_ensemble_mean_1920_2025.csv'
+    accumulator.mean_frame().to_csv(output_file, index=False)
+    print(f"💾 Moyenne d'ensemble sauvegardée: {output_file}")
+
+    print("\n👀 Bandes 5%-95% des revenus (2000-2025):")
+    low = accumulator.quantile_frame(0.05)
+    high = accumulator.quantile_frame(0.95)
+    bands = pd.DataFrame({'Annee': analyzer.years,
+                          'Revenus_P05': low['Revenus_Total'],
+                          'Revenus_Moyenne': accumulator.mean_frame()['Revenus_Total'],
+                          'Revenus_P95': high['Revenus_Total']})
+    print(bands[bands['Annee'] >= 2000].head())
+
+    analyzer._generate_financial_insights(accumulator.mean_frame())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+
+
+class PCFYearStore:
+    """Stockage colonnaire contigu indexé par année
+
+    Les années sont consécutives : une plage d'années correspond directement à
+    un intervalle de lignes. Les tranches sont des vues (sans copie) et la
+    lecture d'une valeur pour une année se fait en temps constant. Les valeurs
+    peuvent porter des axes en tête (runs, ...) : l'axe des années est l'avant-dernier.
+    """
+
+    def __init__(self, years, values, columns):
+        years = np.asarray(years)
+        if len(years) > 1 and (np.diff(years) != 1).any():
+            raise ValueError("Les années du stockage doivent être consécutives")
+        if values.shape[-2:] != (len(years), len(columns)):
+            raise ValueError(f"Forme {values.shape} incompatible avec {len(years)} années "
+                             f"et {len(columns)} colonnes")
+
+        self.years = years
+        self.values = values
+        self.columns = list(columns)
+        self._column_index = {col: j for j, col in enumerate(self.columns)}
+        self.start_year = int(years[0]) if len(years) else None
+        self.end_year = int(years[-1]) if len(years) else None
+
+    @classmethod
+    def from_frame(cls, df):
+        """Construit le stockage depuis un DataFrame (une seule copie, en bloc contigu)"""
+        if isinstance(df, cls):
+            return df
+        columns = [col for col in df.columns if col != 'Annee']
+        return cls(df['Annee'].to_numpy(), np.ascontiguousarray(df[columns].to_numpy(dtype=np.float64)),
+                   columns)
+
+    def __len__(self):
+        return len(self.years)
+
+    def __contains__(self, year):
+        return len(self.years) > 0 and self.start_year <= year <= self.end_year
+
+    def __getitem__(self, column):
+        """Colonne (vue) ; 'Annee' renvoie l'axe des années"""
+        if column == 'Annee':
+            return self.years
+        return self.values[..., self._column_index[column]]
+
+    def row(self, year):
+        """Indice de ligne d'une année (O(1))"""
+        if year not in self:
+            raise KeyError(f"Année hors du stockage: {year}")
+        return int(year) - self.start_year
+
+    def at(self, year, column):
+        """Valeur d'une colonne pour une année (O(1))"""
+        return self.values[..., self.row(year), self._column_index[column]]
+
+    def slice(self, start=None, end=None):
+        """Plage d'années [start, end] sous forme de vue (sans copie)"""
+        if not len(self.years):
+            return self
+        lo = 0 if start is None else min(max(int(start) - self.start_year, 0), len(self.years))
+        hi = len(self.years) if end is None else min(max(int(end) - self.start_year + 1, lo), len(self.years))
+        return PCFYearStore(self.years[lo:hi], self.values[..., lo:hi, :], self.columns)
+
+    def to_frame(self, columns=None):
+        """Export en DataFrame (copie), pour une trajectoire à deux dimensions"""
+        if self.values.ndim != 2:
+            raise ValueError("to_frame attend une seule trajectoire (années, colonnes)")
+        columns = [col for col in (columns or self.columns) if col != 'Annee']
+        df = pd.DataFrame(self.values[:, [self._column_index[col] for col in columns]], columns=columns)
+        df.insert(0, 'Annee', self.years)
+        return df
@@ -0,0 +1,164 @@
+import numpy as np
+import pandas as pd
+
+from Pcommun import PCFFinanceAnalyzer
+
+# Composantes des flux financiers (M€)
+REVENUS = ['Cotisations_Adherents', 'Financement_Public', 'Revenus_Presse',
+           'Revenus_Municipaux', 'Dons_Sympathisants', 'Revenus_Formations']
+DEPENSES = ['Depenses_Personnel', 'Depenses_Campagnes', 'Depenses_Communication',
+            'Depenses_Fonctionnement', 'Depenses_Presse', 'Depenses_Formation', 'Depenses_International']
+
+# Élasticités des flux aux séries structurelles (choc de 10 % sur la source → 10 % x élasticité)
+DEFAULT_ELASTICITIES = {
+    'Adherents': {'Cotisations_Adherents': 1.0, 'Dons_Sympathisants': 0.5},
+    'Elus_Locaux': {'Revenus_Municipaux': 1.0},
+    'Elus_Nationaux': {'Financement_Public': 0.5},
+}
+
+
+class PCFStressTest:
+    """Tests de résistance : chocs propagés au solde et aux fonds propres
+
+    Une matrice de chocs multiplicatifs (scénarios, années, séries touchées) est
+    propagée en une passe groupée : élasticités vers les flux, écart de revenus
+    et de dépenses par année, solde en part du budget, puis fonds propres par
+    somme cumulée des écarts. Les scénarios sont traités par blocs.
+    """
+
+    def __init__(self, analyzer=None, absorption=0.0, elasticities=None, chunk_size=2000):
+        self.analyzer = analyzer or PCFFinanceAnalyzer()
+        self.absorption = absorption    # Part des pertes de revenus compensée par des économies
+        self.elasticities = DEFAULT_ELASTICITIES if elasticities is None else elasticities
+        self.chunk_size = chunk_size
+        self.years = self.analyzer.years
+        self._index = {col: j for j, col in enumerate(self.analyzer.series_columns)}
+
+    def flow_factors(self, shocks, series):
+        """Facteurs (scénarios, années, flux) sur les revenus et dépenses, élasticités comprises"""
+        flows = REVENUS + DEPENSES
+        unsupported = [source for source in series if source not in flows and source not in self.elasticities]
+        if unsupported:
+            raise ValueError(f"Séries choquées sans effet sur les flux (ni flux ni élasticité): "
+                             f"{', '.join(unsupported)}")
+        log_factors = np.zeros(shocks.shape[:2] + (len(flows),))
+        log_shocks = np.log(shocks)
+        for k, source in enumerate(series):
+            if source in flows:
+                log_factors[..., flows.index(source)] += log_shocks[..., k]
+            for target, elasticity in self.elasticities.get(source, {}).items():
+                log_factors[..., flows.index(target)] += elasticity * log_shocks[..., k]
+        return np.exp(log_factors)
+
+    def _propagate_chunk(self, base, shocks, series):
+        flows = [self._index[col] for col in REVENUS + DEPENSES]
+        n_rev = len(REVENUS)
+        delta = base[..., flows] * (self.flow_factors(shocks, series) - 1)   # (scénarios, années, flux)
+
+        delta_revenue = delta[..., :n_rev].sum(axis=-1)
+        delta_expenses = delta[..., n_rev:].sum(axis=-1) + self.absorption * np.minimum(delta_revenue, 0)
+        net = delta_revenue - delta_expenses
+
+        revenue = base[..., self._index['Revenus_Total']]
+        solde = base[..., self._index['Solde_Financier']] + net / revenue
+        funds = base[..., self._index['Fonds_Propres']] + np.cumsum(net, axis=-1)
+        return solde, funds
+
+    def propagate(self, base, shocks, series):
+        """Trajectoires choquées du solde et des fonds propres (scénarios, années)
+
+        base : jeu de données de référence (DataFrame) ou tableau (années, séries)
+        ou (scénarios, années, séries) ; shocks : facteurs (scénarios, années, séries touchées).
+        """
+        if isinstance(base, pd.DataFrame):
+            base = base[self.analyzer.series_columns].to_numpy(dtype=np.float64)
+        shocks = np.asarray(shocks, dtype=np.float64)
+        if shocks.shape[-1] != len(series):
+            raise ValueError(f"{shocks.shape[-1]} séries choquées pour {len(series)} noms")
+
+        results = [self._propagate_chunk(base if base.ndim == 2 else base[start:start + self.chunk_size],
+                                         shocks[start:start + self.chunk_size], series)
+                   for start in range(0, len(shocks), self.chunk_size)]
+        return (np.concatenate([solde for solde, _ in results]),
+                np.concatenate([funds for _, funds in results]))
+
+    def metrics(self, solde, funds, levels=(0.95, 0.99)):
+        """Mesures de queue : fonds négatifs, pire creux, solde minimal"""
+        running_max = np.maximum.accumulate(funds, axis=-1)
+        drawdown = ((running_max - funds) / np.where(running_max > 0, running_max, np.nan)).max(axis=-1)
+        negative = funds < 0
+        first_negative = np.where(negative.any(axis=-1), self.years[negative.argmax(axis=-1)], 0)
+
+        report = {
+            'probabilite_fonds_negatifs': negative.any(axis=-1).mean(),
+            'probabilite_fonds_negatifs_final': negative[..., -1].mean(),
+            'creux_maximal_pire': np.nanmax(drawdown),
+            'fonds_minimaux_pire': funds.min(),
+            'solde_minimal_pire': solde.min(),
+            'premiere_annee_negative_mediane': (np.median(first_negative[first_negative > 0])
+                                                if (first_negative > 0).any() else np.nan),
+        }
+        for level in levels:
+            report[f'creux_maximal_q{round(level * 100)}'] = np.nanquantile(drawdown, level)
+            report[f'fonds_finaux_q{round((1 - level) * 100)}'] = np.quantile(funds[..., -1], 1 - level)
+        return report
+
+    def random_scenarios(self, n_scenarios, start_year=2002, seed=None):
+        """Scénarios aléatoires : perte du financement public après une législative,
+        crise de la presse, chute des adhésions (combinés ou non)"""
+        rng = np.random.RandomState(seed)
+        series = ['Financement_Public', 'Revenus_Presse', 'Adherents']
+        years = self.years[None, :]
+        shocks = np.ones((n_scenarios, len(self.years), len(series)))
+
+        # Financement public : mauvais résultat à une législative, perte sur la mandature
+        legislative = np.array([year for year in self.analyzer.elections['legislatives'] if year >= start_year])
+        onset = rng.choice(legislative, n_scenarios)[:, None]
+        active = rng.random_sample((n_scenarios, 1)) < 0.6
+        window = active & (years > onset) & (years <= onset + 5)
+        shocks[..., 0] = np.where(window, rng.uniform(0.4, 0.9, (n_scenarios, 1)), 1.0)
+
+        # Presse : effondrement durable des ventes de L'Humanité
+        onset = rng.randint(start_year, self.analyzer.end_year + 1, (n_scenarios, 1))
+        active = rng.random_sample((n_scenarios, 1)) < 0.4
+        shocks[..., 1] = np.where(active & (years >= onset), rng.uniform(0.2, 0.7, (n_scenarios, 1)), 1.0)
+
+        # Adhérents : chute progressive sur trois ans puis plateau
+        onset = rng.randint(start_year, self.analyzer.end_year + 1, (n_scenarios, 1))
+        active = rng.random_sample((n_scenarios, 1)) < 0.5
+        depth = rng.uniform(0.6, 0.95, (n_scenarios, 1))
+        ramp = np.clip((years - onset + 1) / 3, 0, 1)
+        shocks[..., 2] = np.where(active, 1 - (1 - depth) * ramp, 1.0)
+
+        return shocks, series
+
+
+def main():
+    """Tests de résistance des finances du PCF"""
+    stress = PCFStressTest()
+    df = stress.analyzer.generate_financial_data()
+    n_scenarios = 10000
+
+    shocks, series = stress.random_scenarios(n_scenarios, seed=0)
+    print(f"🧨 Propagation de {n_scenarios} scénarios de choc ({', '.join(series)})...")
+    solde, funds = stress.propagate(df, shocks, series)
+    report = stress.metrics(solde, funds)
+
+    output_file = 'PCF_stress_test.csv'
+    pd.DataFrame({'Annee': stress.years,
+                  'Fonds_Propres_Reference': df['Fonds_Propres'],
+                  'Fonds_Propres_Q05': np.quantile(funds, 0.05, axis=0),
+                  'Fonds_Propres_Mediane': np.median(funds, axis=0),
+                  'Solde_Q05': np.quantile(solde, 0.05, axis=0)}).to_csv(output_file, index=False)
+    print(f"💾 Trajectoires de stress sauvegardées: {output_file}")
+
+    print("\n📉 Mesures de queue:")
+    print(f"   Probabilité de fonds propres négatifs: {report['probabilite_fonds_negatifs']:.1%}")
+    print(f"   Creux maximal (pire scénario): {report['creux_maximal_pire']:.1%}")
+    print(f"   Creux maximal (quantile 99%): {report['creux_maximal_q99']:.1%}")
+    print(f"   Fonds propres finaux (quantile 1%): {report['fonds_finaux_q1']:.2f} M€")
+    print(f"   Solde minimal: {report['solde_minimal_pire'] * 100:.1f}% du budget")
+
+
+if __name__ == "__main__":
+    main()
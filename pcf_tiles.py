@@ -0,0 +1,191 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from pcf_store import PCFYearStore
+
+TILE_VERSION = 1    # Version du schéma des tuiles (un changement réécrit tout)
+
+# Mise à l'échelle appliquée par les panneaux (mêmes unités que les graphiques)
+PANEL_SCALES = {
+    'Adherents': 1 / 1000, 'Sections_Locales': 1 / 10, 'Elus_Locaux': 1 / 1000,
+    'Taux_Execution_Budget': 100, 'Dependance_Financement_Public': 100, 'Solde_Financier': 100,
+}
+
+# Panneaux empilés : les sommets cumulés sont précalculés pour les front-ends
+STACKED_PANELS = ('structure_revenus', 'structure_depenses')
+
+
+class PCFTileExporter:
+    """Export de tuiles pré-agrégées pour les tableaux de bord
+
+    Chaque panneau est découpé en tuiles compactes : séries annuelles par blocs
+    d'années, agrégats par décennie, régime et cycle électoral, et bandes
+    d'ensemble. Un manifeste versionné garde l'empreinte de chaque tuile ; seules
+    les tuiles dont le contenu (donc la plage d'années sous-jacente) a changé
+    sont réécrites.
+    """
+
+    LEVELS = ('decennie', 'regime', 'cycle_electoral')
+
+    def __init__(self, analyzer, output_dir='PCF_tiles', block_years=10, fmt='json', start_year=1945):
+        if fmt not in ('json', 'bin'):
+            raise ValueError(f"Format de tuile inconnu: {fmt}")
+        self.analyzer = analyzer
+        self.output_dir = output_dir
+        self.block_years = block_years
+        self.fmt = fmt
+        self.start_year = start_year
+        self.manifest_path = os.path.join(output_dir, 'manifest.json')
+
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_path, encoding='utf-8') as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            manifest = {}
+        if manifest.get('version') != TILE_VERSION or manifest.get('format') != self.fmt:
+            manifest = {'version': TILE_VERSION, 'format': self.fmt, 'tuiles': {}}
+        return manifest
+
+    def _panel_series(self, name, values, columns):
+        """Séries d'un panneau (clés, colonnes) aux unités affichées, avec empilement si besoin"""
+        panel_columns = self.analyzer.panel_columns[name]
+        index = {col: j for j, col in enumerate(columns)}
+        scales = np.array([PANEL_SCALES.get(col, 1.0) for col in panel_columns])
+        series = values[:, [index[col] for col in panel_columns]] * scales
+        labels = list(panel_columns)
+        if name in STACKED_PANELS:
+            series = np.concatenate([series, np.cumsum(series, axis=1)], axis=1)
+            labels += [f'{col}_cumul' for col in panel_columns]
+        return labels, series
+
+    def _blocks(self, years):
+        """Débuts des blocs d'années [début, fin[ alignés sur block_years"""
+        keys = years // self.block_years
+        return np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+
+    def tiles(self, df, accumulator=None):
+        """Toutes les tuiles : identifiant → (métadonnées, clés, séries, tableau)"""
+        store = PCFYearStore.from_frame(df).slice(self.start_year)
+        values = np.asarray(store.values, dtype=np.float64)
+        years = store.years
+        starts = self._blocks(years)
+        ends = np.r_[starts[1:], len(years)]
+
+        # Bandes d'ensemble alignées sur la même plage d'années
+        bands = None
+        if accumulator is not None:
+            rows = np.searchsorted(accumulator.years, years)
+            bands = {'moyenne': accumulator.mean[rows]}
+            bands.update({f'p{round(level * 100):02d}': accumulator.quantile(level)[rows]
+                          for level in accumulator.quantile_levels})
+
+        cube = self.analyzer.aggregate_cube(store)
+        tiles = {}
+        for name in self.analyzer.panels:
+            labels, series = self._panel_series(name, values, store.columns)
+            for lo, hi in zip(starts, ends):
+                meta = {'panneau': name, 'niveau': 'annee', 'annees': [int(years[lo]), int(years[hi - 1])]}
+                tiles[f'{name}/annee/{years[lo]}'] = (meta, years[lo:hi], labels, series[lo:hi])
+                if bands is not None:
+                    band_labels, band_series = [], []
+                    for stat, band in bands.items():
+                        stat_labels, stat_series = self._panel_series(name, band[lo:hi], store.columns)
+                        band_labels += [f'{label}_{stat}' for label in stat_labels]
+                        band_series.append(stat_series)
+                    meta = dict(meta, niveau='bandes')
+                    tiles[f'{name}/bandes/{years[lo]}'] = (meta, years[lo:hi], band_labels,
+                                                           np.concatenate(band_series, axis=1))
+
+            for level in self.LEVELS:
+                groups = cube.levels[level]
+                labels, series = self._panel_series(name, groups['moyenne'], cube.columns)
+                meta = {'panneau': name, 'niveau': level, 'annees': [int(years[0]), int(years[-1])]}
+                tiles[f'{name}/{level}'] = (meta, groups['cles'], labels, series)
+        return tiles
+
+    @staticmethod
+    def _digest(keys, labels, series):
+        digest = hashlib.sha1(repr(labels).encode())
+        digest.update(np.ascontiguousarray(keys, dtype=np.int64).tobytes())
+        digest.update(np.ascontiguousarray(series, dtype=np.float32).tobytes())
+        return digest.hexdigest()
+
+    def _write(self, tile_id, revision, meta, keys, labels, series):
+        """Écrit une tuile (JSON compact ou binaire float32) de façon atomique"""
+        base = os.path.join(self.output_dir, *tile_id.split('/'))
+        os.makedirs(os.path.dirname(base), exist_ok=True)
+        series = np.asarray(series, dtype=np.float32)
+        if self.fmt == 'json':
+            path = f'{base}.json'
+            payload = dict(meta, version=TILE_VERSION, revision=revision, cles=np.asarray(keys).tolist(),
+                           series={label: np.round(series[:, j].astype(np.float64), 4).tolist()
+                                   for j, label in enumerate(labels)})
+            data = json.dumps(payload, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+        else:
+            path = f'{base}.bin'
+            # Clés (int32) puis séries (float32) en colonnes ; la disposition est dans le manifeste
+            data = (np.asarray(keys, dtype='<i4').tobytes() +
+                    np.ascontiguousarray(series.T, dtype='<f4').tobytes())
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        return os.path.relpath(path, self.output_dir), len(data)
+
+    def export(self, df, accumulator=None):
+        """Écrit les tuiles modifiées et le manifeste ; renvoie (réécrites, inchangées)"""
+        manifest = self._load_manifest()
+        entries = manifest['tuiles']
+        written, unchanged = [], []
+
+        for tile_id, (meta, keys, labels, series) in self.tiles(df, accumulator).items():
+            digest = self._digest(keys, labels, series)
+            entry = entries.get(tile_id)
+            if entry and entry['empreinte'] == digest and os.path.exists(
+                    os.path.join(self.output_dir, entry['fichier'])):
+                unchanged.append(tile_id)
+                continue
+            revision = entry['revision'] + 1 if entry else 1
+            path, size = self._write(tile_id, revision, meta, keys, labels, series)
+            entries[tile_id] = dict(meta, fichier=path, empreinte=digest, revision=revision,
+                                    octets=size, series=labels, lignes=len(keys))
+            written.append(tile_id)
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        tmp_path = f"{self.manifest_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, self.manifest_path)
+        return written, unchanged
+
+
+def main():
+    """Export des tuiles des tableaux de bord du PCF"""
+    from Pcommun import PCFFinanceAnalyzer
+    from pcf_stats import run_streaming_study
+
+    analyzer = PCFFinanceAnalyzer()
+    np.random.seed(0)
+    df = analyzer.generate_financial_data()
+    accumulator = run_streaming_study(analyzer, 200, seed=0)
+    exporter = PCFTileExporter(analyzer)
+
+    written, unchanged = exporter.export(df, accumulator)
+    size = sum(os.path.getsize(os.path.join(exporter.output_dir, path))
+               for path in (entry['fichier'] for entry in exporter._load_manifest()['tuiles'].values()))
+    print(f"🧩 {len(written)} tuiles écrites, {len(unchanged)} inchangées ({size / 1024:.0f} Ko au total)")
+    print(f"💾 Manifeste: {exporter.manifest_path}")
+
+    # Révision des dernières années : seuls les blocs concernés sont réécrits
+    revised = df.copy()
+    revised.loc[revised['Annee'] >= 2024, 'Revenus_Total'] *= 1.02
+    written, unchanged = exporter.export(revised, accumulator)
+    print(f"🔄 Révision 2024-{analyzer.end_year}: {len(written)} tuiles réécrites, {len(unchanged)} inchangées")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+import numpy as np
+import pandas as pd
+
+from Pcommun import PCFFinanceAnalyzer
+from pcf_stress import DEPENSES, REVENUS
+
+
+class PCFTreasurySimulator:
+    """Trésorerie quotidienne sous les comptes annuels
+
+    Les flux annuels (Revenus_Total et Depenses_Total, ventilés selon la structure
+    des composantes) sont répartis jour par jour par des profils de saisonnalité
+    compilés une fois en matrice (jours, flux) dont chaque année somme à 1. Le
+    solde de trésorerie est une somme cumulée remise à la réserve d'ouverture de
+    chaque année ; les ensembles sont traités par blocs de runs.
+    """
+
+    # Profils de saisonnalité par flux
+    DEFAULT_PROFILES = {
+        'Cotisations_Adherents': {'type': 'mensuel', 'jour': 5},
+        'Financement_Public': {'type': 'tranches', 'tranches': [(4, 15, 0.75), (10, 15, 0.25)]},
+        'Revenus_Presse': {'type': 'uniforme'},
+        'Revenus_Municipaux': {'type': 'mensuel', 'jour': 10},
+        'Dons_Sympathisants': {'type': 'saisonnier', 'mois': {11: 1.5, 12: 3.0}},  # Fin d'année fiscale
+        'Revenus_Formations': {'type': 'saisonnier', 'mois': {7: 0.2, 8: 0.2}},
+        'Depenses_Personnel': {'type': 'mensuel', 'jour': 28},
+        'Depenses_Campagnes': {'type': 'campagne', 'scrutins': 'majeures', 'echeance': (6, 15),
+                               'duree': 90, 'part': 0.8},
+        'Depenses_Communication': {'type': 'uniforme'},
+        'Depenses_Fonctionnement': {'type': 'uniforme'},
+        'Depenses_Presse': {'type': 'mensuel', 'jour': 1},
+        'Depenses_Formation': {'type': 'saisonnier', 'mois': {7: 0.2, 8: 0.2}},
+        'Depenses_International': {'type': 'uniforme'},
+    }
+
+    def __init__(self, analyzer=None, profiles=None, liquid_share=0.25, chunk_size=25):
+        self.analyzer = analyzer or PCFFinanceAnalyzer()
+        self.profiles = dict(self.DEFAULT_PROFILES, **(profiles or {}))
+        self.liquid_share = liquid_share    # Part des fonds propres disponible en trésorerie
+        self.chunk_size = chunk_size
+        self.flows = REVENUS + DEPENSES
+
+        # Axe des jours et rattachement aux années
+        self.dates = pd.date_range(f'{self.analyzer.start_year}-01-01', f'{self.analyzer.end_year}-12-31', freq='D')
+        self.years = self.analyzer.years
+        self.day_year = np.asarray(self.dates.year) - self.analyzer.start_year
+        self.year_starts = np.flatnonzero(np.r_[True, np.diff(self.day_year) != 0])
+        self.weights = np.stack([self._profile(self.profiles[flow]) for flow in self.flows], axis=1)
+
+    def _normalize(self, w):
+        """Normalise des poids journaliers pour que chaque année somme à 1"""
+        totals = np.add.reduceat(w, self.year_starts)
+        return w / np.where(totals > 0, totals, 1.0)[self.day_year]
+
+    def _profile(self, profile):
+        """Compile un profil en poids journaliers (jours,)"""
+        month, day = np.asarray(self.dates.month), np.asarray(self.dates.day)
+        kind = profile['type']
+        if kind == 'uniforme':
+            w = np.ones(len(self.dates))
+        elif kind == 'mensuel':
+            w = (day == profile['jour']).astype(np.float64)
+        elif kind == 'tranches':
+            w = sum(share * ((month == m) & (day == d)) for m, d, share in profile['tranches'])
+        elif kind == 'saisonnier':
+            monthly = np.ones(12)
+            for m, weight in profile['mois'].items():
+                monthly[m - 1] = weight
+            w = monthly[month - 1]
+        elif kind == 'campagne':
+            # Rampe avant l'échéance les années de scrutin, répartition uniforme sinon
+            election = self.analyzer.elections.masks(self.years)[profile['scrutins']][self.day_year]
+            m, d = profile['echeance']
+            deadline = pd.to_datetime(pd.DataFrame({'year': self.dates.year, 'month': m, 'day': d})).to_numpy()
+            delta = (deadline - self.dates.to_numpy()).astype('timedelta64[D]').astype(np.int64)
+            ramp = np.where((delta >= 0) & (delta < profile['duree']), profile['duree'] - delta, 0.0)
+            uniform = self._normalize(np.ones(len(self.dates)))
+            w = np.where(election, profile['part'] * self._normalize(ramp) + (1 - profile['part']) * uniform,
+                         uniform)
+        else:
+            raise ValueError(f"Type de profil inconnu: {kind}")
+        return self._normalize(np.asarray(w, dtype=np.float64))
+
+    def annual_flows(self, values):
+        """Flux annuels (..., années, flux) : totaux ventilés selon la structure des composantes"""
+        index = {col: j for j, col in enumerate(self.analyzer.series_columns)}
+        components = values[..., [index[col] for col in self.flows]]
+        n_rev = len(REVENUS)
+        revenue_share = components[..., :n_rev] / components[..., :n_rev].sum(axis=-1, keepdims=True)
+        expense_share = components[..., n_rev:] / components[..., n_rev:].sum(axis=-1, keepdims=True)
+        return np.concatenate([revenue_share * values[..., [index['Revenus_Total']]],
+                               expense_share * values[..., [index['Depenses_Total']]]], axis=-1)
+
+    def daily(self, values):
+        """Encaissements, décaissements et trésorerie (runs, jours) pour des runs (runs, années, séries)"""
+        flows = self.annual_flows(values)
+        n_rev = len(REVENUS)
+        inflow = np.zeros((len(values), len(self.dates)))
+        outflow = np.zeros_like(inflow)
+        for f in range(len(self.flows)):
+            daily = flows[:, self.day_year, f] * self.weights[:, f]
+            if f < n_rev:
+                inflow += daily
+            else:
+                outflow += daily
+
+        # Réserve d'ouverture : part des fonds propres de l'année précédente
+        funds = values[..., self.analyzer.series_columns.index('Fonds_Propres')]
+        opening = self.liquid_share * np.concatenate([funds[:, :1], funds[:, :-1]], axis=1)
+
+        cumulative = np.cumsum(inflow - outflow, axis=1)
+        before_year = np.concatenate([np.zeros((len(values), 1)), cumulative[:, self.year_starts[1:] - 1]], axis=1)
+        cash = opening[:, self.day_year] + cumulative - before_year[:, self.day_year]
+        return inflow, outflow, cash
+
+    def yearly_minimum(self, cash):
+        """Trésorerie minimale, jour du minimum et jours à découvert par année (runs, années)"""
+        minimum = np.minimum.reduceat(cash, self.year_starts, axis=1)
+        is_min = cash == minimum[:, self.day_year]
+        day_of_min = np.maximum.reduceat(np.where(is_min, np.arange(len(self.dates)), -1), self.year_starts, axis=1)
+        overdrawn = np.add.reduceat(cash < 0, self.year_starts, axis=1)
+        return minimum, day_of_min - self.year_starts, overdrawn
+
+    def simulate(self, df):
+        """Trésorerie quotidienne d'un jeu de données annuel"""
+        values = df[self.analyzer.series_columns].to_numpy(dtype=np.float64)[None]
+        inflow, outflow, cash = self.daily(values)
+        return pd.DataFrame({'Date': self.dates, 'Encaissements': inflow[0],
+                             'Decaissements': outflow[0], 'Tresorerie': cash[0]})
+
+    def run_ensemble(self, n_runs, seed=None):
+        """Minima de trésorerie d'un ensemble, par blocs (seuls les résumés annuels sont conservés)"""
+        minima, days, overdrawn = [], [], []
+        for chunk in self.analyzer.iter_ensemble(n_runs, chunk_size=self.chunk_size, seed=seed):
+            for result, store in zip(self.yearly_minimum(self.daily(chunk)[2]), (minima, days, overdrawn)):
+                store.append(result)
+        return np.concatenate(minima), np.concatenate(days), np.concatenate(overdrawn)
+
+    def summary(self, minima, days, overdrawn):
+        """Tableau annuel des tensions de trésorerie sur l'ensemble"""
+        return pd.DataFrame({
+            'Annee': self.years,
+            'Probabilite_Decouvert': (minima < 0).mean(axis=0),
+            'Tresorerie_Min_Mediane': np.median(minima, axis=0),
+            'Tresorerie_Min_Q05': np.quantile(minima, 0.05, axis=0),
+            'Jour_Minimum_Median': np.median(days, axis=0),
+            'Jours_Decouvert_Moyens': overdrawn.mean(axis=0),
+        })
+
+
+def main():
+    """Simulation de la trésorerie quotidienne du PCF"""
+    import time
+
+    treasury = PCFTreasurySimulator()
+    df = treasury.analyzer.generate_financial_data()
+    daily = treasury.simulate(df)
+
+    output_file = 'PCF_tresorerie_quotidienne.csv'
+    daily.to_csv(output_file, index=False)
+    print(f"💾 Trésorerie quotidienne ({len(daily)} jours) sauvegardée: {output_file}")
+    worst = daily.loc[daily['Tresorerie'].idxmin()]
+    print(f"📉 Point bas: {worst['Tresorerie']:.2f} M€ le {worst['Date']:%d/%m/%Y}")
+
+    n_runs = 500
+    t0 = time.perf_counter()
+    summary = treasury.summary(*treasury.run_ensemble(n_runs))
+    print(f"\n🎲 Ensemble de {n_runs} runs en {time.perf_counter() - t0:.1f} s")
+    summary.to_csv('PCF_tresorerie_ensemble.csv', index=False)
+    print("👀 Années les plus tendues:")
+    print(summary.nlargest(5, 'Probabilite_Decouvert').round(2).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+import time
+import zlib
+
+import numpy as np
+import pandas as pd
+
+from Pcommun import PCFFinanceAnalyzer
+from pcf_store import PCFYearStore
+
+
+class PCFWhatIf:
+    """Scénarios « et si » recalculant uniquement les colonnes, années et panneaux touchés
+
+    Le bruit corrélé de toutes les séries est tiré une seule fois par graine et
+    chaque colonne y lit le sien : la resimuler après une modification reproduit
+    exactement le même bruit, et les colonnes non touchées sont conservées telles
+    quelles.
+    """
+
+    def __init__(self, analyzer=None, seed=0, dpi=100, plot_start_year=1945):
+        self.analyzer = analyzer or PCFFinanceAnalyzer()
+        self.seed = seed
+        self.dpi = dpi
+        self.plot_start_year = plot_start_year
+
+        self.dates = pd.date_range(start=f'{self.analyzer.start_year}-01-01',
+                                   end=f'{self.analyzer.end_year}-12-31', freq='Y')
+        self.years = self.analyzer.years
+
+        # Séries brutes (avant événements) et jeu de données courant
+        self._noise_cache = None
+        self._raw = {column: self._simulate(column) for column in self.analyzer.simulators}
+        self.df = pd.DataFrame({'Annee': self.years})
+        for column, values in self._raw.items():
+            self.df[column] = values * self._event_factors(column)
+
+        self._insights = None
+        self.panel_images = {}
+        self._dirty_panels = set(self.analyzer.panels)
+
+    def _noise_block(self):
+        """Bruit corrélé de toutes les séries, tiré une seule fois par (graine, dates)"""
+        noise_model = self.analyzer.noise_model()
+        if noise_model is None:
+            return None  # Sigmas vectoriels : tirages par série
+        key = (self.seed, self.dates[0], self.dates[-1], len(self.dates))
+        if self._noise_cache is None or self._noise_cache[:2] != (key, noise_model):
+            rng = np.random.RandomState(self.seed)
+            self._noise_cache = (key, noise_model, noise_model.draw_columns((len(self.dates),), rng))
+        return self._noise_cache[2]
+
+    def _simulate(self, column):
+        """Simule une colonne : son bruit est servi par le tirage corrélé commun (reproductible)"""
+        self.analyzer._noise_block = self._noise_block()
+        # Graine propre à la colonne pour les tirages par série, sans toucher l'état global
+        state = np.random.get_state()
+        np.random.seed((zlib.crc32(column.encode()) + self.seed) % 2**32)
+        try:
+            return np.asarray(self.analyzer.simulators[column](self.dates), dtype=np.float64)
+        finally:
+            np.random.set_state(state)
+            self.analyzer._noise_block = None
+
+    def _event_factors(self, column):
+        """Produit des facteurs d'événements appliqués à une colonne, par année"""
+        factors = np.ones(len(self.years))
+        for event in self.analyzer.events.values():
+            if column in event["facteurs"]:
+                factors[self.analyzer.event_mask(event, self.years)] *= event["facteurs"][column]
+        return factors
+
+    def _refresh(self, columns, start, end, mask=None):
+        """Recalcule les tranches (colonnes, années) touchées et invalide les sorties dépendantes"""
+        if mask is None:
+            mask = (self.years >= start) & (self.years <= end)
+        for column in columns:
+            values = self._raw[column][mask] * self._event_factors(column)[mask]
+            self.df.loc[mask, column] = values
+
+        self._insights = None
+        touched = {name for name, inputs in self.analyzer.panel_columns.items()
+                   if set(inputs) & set(columns) and end >= self.plot_start_year}
+        self._dirty_panels |= touched
+
+        return {'colonnes': sorted(columns), 'annees': (start, end), 'panneaux': sorted(touched)}
+
+    def edit_event(self, name, annees=None, facteurs=None):
+        """Modifie (ou crée) un événement et recalcule les seules colonnes et années concernées"""
+        events = self.analyzer.events
+        if name not in events and annees is None:
+            raise ValueError(f"Période (annees) requise pour créer l'événement {name}")
+        old = events.get(name, {"annees": annees, "facteurs": {}})
+        new = dict(old, annees=annees or old["annees"],
+                   facteurs=facteurs if facteurs is not None else old["facteurs"])
+        events[name] = new
+
+        # Années touchées avant et après (période restreinte aux scrutins le cas échéant)
+        columns = set(old["facteurs"]) | set(new["facteurs"])
+        mask = self.analyzer.event_mask(old, self.years) | self.analyzer.event_mask(new, self.years)
+        affected = self.years[mask] if mask.any() else np.array(new["annees"])
+        return self._refresh(columns, affected[0], affected[-1], mask)
+
+    def edit_regime_rate(self, column, regime_start, rate):
+        """Modifie le taux d'un régime et resimule la colonne sur la seule durée du régime"""
+        rates = self.analyzer.regime_rates[column]
+        if regime_start not in rates:
+            raise KeyError(f"Régime inconnu pour {column}: {regime_start}")
+        rates[regime_start] = rate
+
+        starts = sorted(rates)
+        position = starts.index(regime_start)
+        start = self.analyzer.start_year if position == 0 else regime_start + 1
+        end = starts[position + 1] if position + 1 < len(starts) else self.analyzer.end_year
+
+        self._raw[column] = self._simulate(column)
+        return self._refresh({column}, start, end)
+
+    def edit_config(self, key, value):
+        """Modifie un paramètre de configuration et resimule les colonnes qui le lisent"""
+        self.analyzer.config[key] = value
+        columns = set(self.analyzer.config_dependencies.get(key, ()))
+        for column in columns:
+            self._raw[column] = self._simulate(column)
+        return self._refresh(columns, self.analyzer.start_year, self.analyzer.end_year)
+
+    def insights(self):
+        """Insights chiffrés, recalculés seulement après une modification"""
+        if self._insights is None:
+            self._insights = self.analyzer.compute_financial_insights(self.df)
+        return self._insights
+
+    def render_panels(self):
+        """Rend les seuls panneaux dont les entrées ont changé"""
+        df_recent = PCFYearStore.from_frame(self.df).slice(self.plot_start_year)
+        for name in self.analyzer.panels:
+            if name in self._dirty_panels:
+                self.panel_images[name] = self.analyzer.render_panel(df_recent, name, dpi=self.dpi)
+        self._dirty_panels.clear()
+        return self.panel_images
+
+
+def main():
+    """Exploration « et si » : modification de l'accord NUPES"""
+    scenario = PCFWhatIf()
+    scenario.render_panels()
+    baseline = scenario.insights()['evolution_revenus']
+
+    t0 = time.perf_counter()
+    change = scenario.edit_event("NUPES", facteurs={'Elus_Nationaux': 1.5, 'Depenses_Campagnes': 1.6,
+                                                    'Revenus_Total': 1.3})
+    insights = scenario.insights()
+    t1 = time.perf_counter()
+    scenario.render_panels()
+    t2 = time.perf_counter()
+
+    print(f"🔁 Colonnes recalculées: {', '.join(change['colonnes'])} ({change['annees'][0]}-{change['annees'][1]})")
+    print(f"🖼️ Panneaux re-rendus: {', '.join(change['panneaux'])}")
+    print(f"📈 Évolution des revenus: {baseline:.1f}% → {insights['evolution_revenus']:.1f}%")
+    print(f"⏱️ Recalcul des données et insights en {t1 - t0:.3f} s, "
+          f"rendu de {len(change['panneaux'])} panneau(x) en {t2 - t1:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
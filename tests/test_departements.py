@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from Pcommun import PCFFinanceAnalyzer
+from pcf_departements import PCFDepartementModel
+
+
+@pytest.fixture(scope='module')
+def panel():
+    analyzer = PCFFinanceAnalyzer()
+    np.random.seed(0)
+    df = analyzer.generate_financial_data(False)
+    return PCFDepartementModel(analyzer).simulate(df)
+
+
+@pytest.mark.parametrize('level, n_keys', [('departement', 101), ('region', 14), ('national', 1)])
+def test_frame_all_years(panel, level, n_keys):
+    df = panel.frame(level)
+    assert len(df) == n_keys * len(panel.years)
+    assert list(df.columns[:2]) == [level.capitalize(), 'Annee']
+    np.testing.assert_allclose(df.groupby('Annee')[panel.columns].sum().to_numpy(), panel.national())
+
+
+@pytest.mark.parametrize('level, n_keys', [('departement', 101), ('region', 14), ('national', 1)])
+def test_frame_one_year(panel, level, n_keys):
+    df = panel.frame(level, year=2000)
+    assert len(df) == n_keys
+    row = int(np.flatnonzero(panel.years == 2000)[0])
+    np.testing.assert_allclose(df[panel.columns].sum().to_numpy(), panel.national()[row])
+
+
+def test_frame_unknown_level(panel):
+    with pytest.raises(ValueError):
+        panel.frame('commune')
+
+
+def test_frame_year_out_of_range(panel):
+    with pytest.raises(KeyError):
+        panel.frame('national', year=1800)
@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from pcf_elections import PCFElectionCalendar
+
+
+def test_csv_round_trip(tmp_path):
+    calendar = PCFElectionCalendar.default()
+    path = tmp_path / 'calendrier.csv'
+    calendar.to_frame().to_csv(path, index=False)
+    pd.testing.assert_frame_equal(PCFElectionCalendar.from_csv(path).to_frame(), calendar.to_frame())
+
+
+def test_csv_string_flags(tmp_path):
+    path = tmp_path / 'calendrier.csv'
+    path.write_text("Annee,Type,Majeur\n"
+                    "1936,legislatives,True\n1945,legislatives,1\n1951,legislatives,oui\n"
+                    "1956,legislatives,False\n1958,legislatives,0\n1962,legislatives,non\n"
+                    "1967,legislatives,\n", encoding='utf-8')
+    calendar = PCFElectionCalendar.from_csv(path)
+    assert calendar['majeures'] == [1936, 1945, 1951]
+    np.testing.assert_array_equal(calendar.to_frame()['Majeur'], [True] * 3 + [False] * 4)
+
+
+def test_csv_invalid_flag(tmp_path):
+    path = tmp_path / 'calendrier.csv'
+    path.write_text("Annee,Type,Majeur\n1936,legislatives,peut-etre\n", encoding='utf-8')
+    with pytest.raises(ValueError):
+        PCFElectionCalendar.from_csv(path)